@@ -1,45 +1,156 @@
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Dict, Optional, Tuple
 
 from MultiProdigy.bus.message_bus import MessageBus
 from MultiProdigy.observability.tracer import tracer  # Already importing the tracer
-from MultiProdigy.schemas.message import Message
+from MultiProdigy.runtime.event_loop import RuntimeLoop, runtime_loop
+from MultiProdigy.schemas.agent_config import AgentConfig
+from MultiProdigy.schemas.message import Attachment, Message
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # The failure was already traced and printed; the task stays failed for whoever
+    # awaits it, but asyncio must not also report "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
 
 
 class BaseAgent(ABC):
+    # Event loop that runs coroutine handlers; a runtime may assign its own per agent
+    loop: RuntimeLoop = runtime_loop
+    # AgentConfig set by from_config (or the subclass); agents built directly may lack one
+    config: AgentConfig
+
     def __init__(self, name: str, bus: MessageBus):
         self.name = name
         self.bus = bus
 
-    def send(self, content: str, to: str) -> None:
+    @classmethod
+    def from_config(cls, config, bus: MessageBus, **params: Any) -> "BaseAgent":
+        """Build the agent from an AgentConfig plus constructor ``params`` (used by Runtime)."""
+        agent = cls(config.name, bus, **params)
+        if getattr(agent, "config", None) is None:
+            agent.config = config
+        return agent
+
+    def warm_up(self) -> Optional[Awaitable]:
+        """Startup hook run before traffic arrives: load models, open sessions, fill caches.
+
+        May be ``async def``; Runtime warms agents up concurrently.
+        """
+        return None
+
+    def send(
+        self,
+        content: str,
+        to: str,
+        attachments: Tuple[Attachment, ...] = (),
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
         """Helper to publish a Message to another agent."""
-        msg = Message(sender=self.name, receiver=to, content=content)
+        # Log the message event; attachments are traced by digest only
+        extra: Dict[str, Any] = {}
+        if attachments:
+            extra["attachments"] = [a.digest for a in attachments]
+        message_id = tracer.log_message_event(
+            sender=self.name, receiver=to, content=content, **extra
+        )
+
+        # Fields come from this agent, so skip re-validating them on every hop
+        metadata = {**(metadata or {}), "message_id": message_id}
+        msg = Message.trusted(
+            sender=self.name,
+            receiver=to,
+            content=content,
+            metadata=metadata,
+            attachments=tuple(attachments),
+        )
 
-        # Log the message event
-        message_id = tracer.log_message_event(sender=self.name, receiver=to, content=content)
-        msg.metadata["message_id"] = message_id
+        self.bus.publish(msg, internal=True)
 
-        self.bus.publish(msg)
+    def reply(self, message: Message, content: str, **metadata: Any) -> None:
+        """Answer ``message``'s sender, echoing its ``task_id`` so dispatchers can match it."""
+        task_id = message.metadata.get("task_id")
+        if task_id is not None:
+            metadata.setdefault("task_id", task_id)
+        self.send(content, message.sender, metadata=metadata)
 
-    def handle_message(self, message: Message) -> None:
-        """Handle incoming message with tracing"""
+    def handle_message(self, message: Message) -> Optional[Awaitable]:
+        """Handle incoming message with tracing.
+
+        Coroutine handlers are scheduled rather than awaited here; the returned
+        task/future completes (and the trace ends) once the handler finishes.
+        """
+        trace_metadata = {
+            "sender": message.sender,
+            "message_id": message.metadata.get("message_id"),
+            "content_length": len(message.content),
+        }
+        if message.attachments:
+            trace_metadata["attachments"] = [a.digest for a in message.attachments]
         trace_id = tracer.start_trace(
-            agent_name=self.name,
-            event_type="message_received",
-            metadata={
-                "sender": message.sender,
-                "message_id": message.metadata.get("message_id"),
-                "content_length": len(message.content),
-            },
+            agent_name=self.name, event_type="message_received", metadata=trace_metadata
         )
 
         try:
-            self.on_message(message)
-            tracer.end_trace(trace_id, result={"status": "processed"})
+            result = self.on_message(message)
+        except Exception as e:
+            tracer.end_trace(trace_id, error=str(e))
+            raise
+
+        if inspect.isawaitable(result):
+            return self._schedule(self._run_async(result, trace_id))
+        tracer.end_trace(trace_id, result={"status": "processed"})
+        return None
+
+    async def _run_async(self, awaitable: Awaitable, trace_id: str) -> None:
+        """Await a coroutine handler, closing its trace when the work is done."""
+        try:
+            await awaitable
         except Exception as e:
             tracer.end_trace(trace_id, error=str(e))
+            print(f"[{self.name}] async handler failed: {e}")
             raise
+        tracer.end_trace(trace_id, result={"status": "processed"})
+
+    def _schedule(self, coro):
+        """Run a coroutine on the current event loop if there is one, else the runtime loop."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None:
+            task = running.create_task(coro)
+            task.add_done_callback(_retrieve_exception)
+            return task
+        return self.loop.submit(coro)
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """State to checkpoint, or None for stateless agents.
+
+        Return a dict of picklable entries; only entries that changed since the
+        last checkpoint are written, so prefer many small entries to one big one.
+        """
+        return None
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Reload state produced by ``snapshot`` (called before any message arrives).
+
+        Peers may not be registered yet, so do not send here; resume work in ``start``.
+        """
+        pass
+
+    def start(self) -> None:
+        """Hook run once every agent is registered and restored; may send messages."""
+        pass
+
+    def inbox_limit(self) -> Optional[int]:
+        """Most messages the bus hands this agent at once (``config.max_tasks``; None: no cap)."""
+        return getattr(getattr(self, "config", None), "max_tasks", None)
 
     @abstractmethod
-    def on_message(self, message: Message) -> None:
-        """Called by the bus when a message arrives."""
+    def on_message(self, message: Message) -> Optional[Awaitable]:
+        """Called by the bus when a message arrives. May be ``async def``."""
         ...
@@ -6,7 +6,10 @@ class EchoAgent(BaseAgent):
     def on_message(self, message: Message) -> None:
         print(f"[{self.name}] Received: {message.content}")
         # reply back:
-        reply = message.copy_with_new_content(f"Echo: {message.content}")
-        reply.sender = self.name
-        reply.receiver = message.sender
-        self.bus.publish(reply)
+        reply = Message.trusted(
+            sender=self.name,
+            receiver=message.sender,
+            content=f"Echo: {message.content}",
+            metadata=message.metadata,
+        )
+        self.bus.publish(reply, internal=True)
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from MultiProdigy.agents.agent_base import BaseAgent
+from MultiProdigy.llm.base import BaseLLMClient, LLMResponse
+from MultiProdigy.llm.context import ContextManager
+from MultiProdigy.llm.factory import LLMFactory
+from MultiProdigy.schemas.message import Message
+
+
+class LLMAgent(BaseAgent):
+    """Agent that answers messages with one long-lived LLM client.
+
+    ``on_message`` is a coroutine, so calls run on the runtime event loop (never a
+    fresh ``asyncio.run`` per message) and the client's HTTP session is reused.
+    At most ``max_concurrency`` requests are in flight; the rest wait on a
+    semaphore. With a ``context`` manager, each conversation (``conversation_id``
+    metadata, else the sender) keeps a token-bounded history, updated by one call
+    at a time.
+
+    Failed calls are answered with ``task_status="failed"`` so a TaskManagerAgent
+    can retry them. Subclasses customise ``build_messages`` and ``format_reply``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bus,
+        client: Optional[BaseLLMClient] = None,
+        provider: str = "mock",
+        model: str = "mock-model",
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 4,
+        context: Optional[ContextManager] = None,
+        **client_kwargs,
+    ):
+        super().__init__(name, bus)
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.client = client or LLMFactory.create_client(provider, model, **client_kwargs)
+        self.system_prompt = system_prompt
+        self.max_concurrency = max_concurrency
+        self.context = context
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # conversation -> (lock, handlers using it); dropped once nobody waits
+        self._conversations: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Semaphores and locks belong to one loop; agents normally live on the runtime loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+            self._conversations = {}
+        return self._semaphore
+
+    def build_messages(self, message: Message) -> List[Dict[str, str]]:
+        """Chat payload for a single-turn request (used without a context manager)."""
+        messages = []
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        messages.append({"role": "user", "content": message.content})
+        return messages
+
+    def format_reply(self, response: LLMResponse, message: Message) -> str:
+        """Text sent back to the sender."""
+        return response.content
+
+    async def complete(self, message: Message) -> LLMResponse:
+        """Call the LLM for ``message`` within the concurrency limit.
+
+        With a context manager, calls of one conversation run one at a time so its
+        turns are recorded in order; other conversations proceed concurrently.
+        """
+        slots = self._slots()
+        if self.context is None:
+            async with slots:
+                return await self.client.chat(self.build_messages(message))
+        conversation = str(message.metadata.get("conversation_id") or message.sender)
+        lock, users = self._conversations.get(conversation, (None, 0))
+        lock = lock or asyncio.Lock()
+        self._conversations[conversation] = (lock, users + 1)
+        try:
+            # Queue on the conversation before taking a slot, so waiting holds none
+            async with lock, slots:
+                return await self.context.chat(self.client, conversation, message.content)
+        finally:
+            lock, users = self._conversations[conversation]
+            if users == 1:
+                del self._conversations[conversation]
+            else:
+                self._conversations[conversation] = (lock, users - 1)
+
+    async def on_message(self, message: Message) -> None:
+        print(f"[{self.name}] Received: {message.content}")
+        try:
+            response = await self.complete(message)
+        except Exception as e:
+            print(f"[{self.name}] LLM call failed: {e}")
+            self.reply(message, f"❌ {self.name} error: {e}", task_status="failed")
+            return
+        if response.metadata.get("error"):
+            self.reply(message, response.content, task_status="failed")
+            return
+        self.reply(message, self.format_reply(response, message))
+
+    async def close(self) -> None:
+        """Close the client's network session."""
+        await self.client.close()
@@ -1,13 +1,58 @@
 from MultiProdigy.agents.agent_base import BaseAgent
+from MultiProdigy.memory.store import MemoryStore
 from MultiProdigy.schemas.message import Message
 
 
 class MemoryAgent(BaseAgent):
-    def __init__(self, name: str, runtime):
+    """Stores incoming messages and answers recall queries.
+
+    Messages with ``metadata["memory_action"] == "recall"`` are treated as search
+    queries and answered with the best matching memories; everything else is stored.
+    With a ``semantic`` memory, recall is by embedding similarity instead of keywords.
+    Answers are sent to the sender over the bus; ``handle_message`` returns no reply.
+    """
+
+    def __init__(self, name: str, runtime, store=None, top_k: int = 5, semantic=None):
         super().__init__(name, runtime)
-        self.memory = []
+        # May be shared with other agents: every call is scoped by this agent's name
+        self.memory = store if store is not None else MemoryStore()
+        self.semantic = semantic
+        self.top_k = top_k
+
+    def snapshot(self):
+        # Persistent stores (SQLiteMemoryStore) need no checkpoint
+        snapshot = getattr(self.memory, "snapshot", None)
+        return snapshot() if snapshot is not None else None
+
+    def restore(self, state) -> None:
+        self.memory.restore(state)
 
-    def handle_message(self, message: Message) -> Message:
+    def on_message(self, message: Message):
         print(f"[MemoryAgent] Received: {message.content}")
-        self.memory.append(message.content)
-        return message.copy_with_new_content("Memory stored.")
+        if self.semantic is not None:
+            # Embedding calls are async; BaseAgent schedules the returned coroutine
+            return self._on_message_semantic(message)
+        conversation_id = message.metadata.get("conversation_id")
+        if message.metadata.get("memory_action") == "recall":
+            results = self.memory.search(
+                message.content, k=self.top_k, conversation_id=conversation_id, agent=self.name
+            )
+            self.reply(message, "\n".join(record.text for record, _ in results))
+            return
+
+        self.memory.add(
+            message.content,
+            importance=float(message.metadata.get("importance", 1.0)),
+            conversation_id=conversation_id,
+            agent=self.name,
+        )
+        self.reply(message, "Memory stored.")
+
+    async def _on_message_semantic(self, message: Message) -> None:
+        if message.metadata.get("memory_action") == "recall":
+            results = await self.semantic.search(message.content, k=self.top_k)
+            self.reply(message, "\n".join(text for text, _ in results))
+            return
+
+        await self.semantic.add([message.content], metadata=[dict(message.metadata)])
+        self.reply(message, "Memory stored.")
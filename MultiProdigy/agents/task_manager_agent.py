@@ -1,14 +1,625 @@
+import itertools
+import threading
+import time
+from collections import deque
+from functools import partial
+from string import Template
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
 from MultiProdigy.agents.agent_base import BaseAgent
+from MultiProdigy.runtime.scheduler import AgentScheduler
 from MultiProdigy.schemas.agent_config import AgentConfig
+from MultiProdigy.schemas.message import Message
+from MultiProdigy.schemas.task_graph import TaskGraph
+
+
+class Task:
+    """One unit of work tracked by the TaskManagerAgent."""
+
+    __slots__ = (
+        "id",
+        "content",
+        "requester",
+        "metadata",
+        "attempts",
+        "submitted",
+        "started",
+        "worker",
+        "agent",
+        "on_done",
+        "timer",
+    )
+
+    def __init__(self, task_id: str, content: str, requester: Optional[str], metadata: Dict):
+        self.id = task_id
+        self.content = content
+        self.requester = requester
+        self.metadata = metadata
+        self.attempts = 0
+        self.submitted = time.perf_counter()
+        self.started = 0.0
+        self.worker: Optional[str] = None
+        # Fixed target agent (bypasses the pool) and completion hook, if any
+        self.agent: Optional[str] = None
+        self.on_done: Optional[Callable[["Task", str, bool], None]] = None
+        # Pending dispatch timeout (a ScheduledTask) while a worker holds the task
+        self.timer: Any = None
+
+
+class _Worker:
+    __slots__ = ("name", "in_flight", "backlog", "completed", "failed")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.in_flight = 0
+        # Tasks pinned to this worker (work-stealing strategy only)
+        self.backlog: deque = deque()
+        self.completed = 0
+        self.failed = 0
+
+
+class GraphRun:
+    """Progress and per-node timings of one TaskGraph execution."""
+
+    def __init__(self, run_id: str, graph: TaskGraph, requester: Optional[str]):
+        self.id = run_id
+        self.graph = graph
+        self.requester = requester
+        self.nodes = {node.id: node for node in graph.nodes}
+        self.pending = {node.id: len(set(node.depends_on)) for node in graph.nodes}
+        self.dependents: Dict[str, List[str]] = {node.id: [] for node in graph.nodes}
+        for node in graph.nodes:
+            for dep in set(node.depends_on):
+                self.dependents[dep].append(node.id)
+        self.results: Dict[str, str] = {}
+        # node id -> perf_counter stamps: ready (inputs done), started, finished
+        self.stamps: Dict[str, Dict[str, float]] = {}
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the graph completes or fails."""
+        return self._done.wait(timeout)
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Per-node seconds since the run started, plus queue wait and run time."""
+        result = {}
+        for node_id, stamp in self.stamps.items():
+            entry = {key: value - self.started for key, value in stamp.items()}
+            if "finished" in stamp:
+                entry["wait"] = stamp["started"] - stamp["ready"]
+                entry["run"] = stamp["finished"] - stamp["started"]
+            result[node_id] = entry
+        return result
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """The dependency chain that determined the makespan, and its length in seconds.
+
+        Walks back from the last node to finish, each time to the input that
+        finished last (the one the node actually waited for).
+        """
+        finished = {n: s["finished"] for n, s in self.stamps.items() if "finished" in s}
+        if not finished:
+            return [], 0.0
+        node_id = max(finished, key=finished.__getitem__)
+        path = [node_id]
+        while True:
+            deps = [dep for dep in self.nodes[node_id].depends_on if dep in finished]
+            if not deps:
+                break
+            node_id = max(deps, key=finished.__getitem__)
+            path.append(node_id)
+        path.reverse()
+        return path, finished[path[-1]] - self.stamps[path[0]]["ready"]
+
+    def sink_results(self) -> Dict[str, str]:
+        """Results of the nodes nothing else depends on, in graph order."""
+        return {
+            node.id: self.results[node.id]
+            for node in self.graph.nodes
+            if not self.dependents[node.id] and node.id in self.results
+        }
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
 
 
 class TaskManagerAgent(BaseAgent):
-    def __init__(self, config: AgentConfig, bus):
+    """Dispatches tasks over the bus to a pool of worker agents.
+
+    Any message from a non-worker is a new task (or, with a ``task_graph`` entry in
+    its metadata, a whole TaskGraph; see ``submit_graph``). Tasks are sent to workers with a
+    ``task_id`` in the metadata; a worker answers with ``reply`` (or any message
+    carrying the same ``task_id``) and the result is forwarded to the requester.
+    A reply with ``task_status="failed"`` (or a worker raising) retries the task
+    after ``config.retry_delay`` seconds, up to ``max_retries`` times. Delayed
+    retries share one timer thread (``scheduler``, built on first use if not given).
+    With ``task_timeout`` a worker that has not answered within that many seconds
+    is treated as having failed the task. A worker may be a replica group; replies
+    from any of its replicas count.
+
+    Each worker holds at most ``config.max_tasks`` tasks at once (no cap when
+    unset); the manager's own inbox is not capped. ``least_loaded`` hands queued
+    tasks to the worker with the fewest in flight; ``work_stealing`` pins tasks to
+    workers round-robin and lets idle workers steal from the back of the longest
+    backlog.
+    """
+
+    STRATEGIES = ("least_loaded", "work_stealing")
+
+    def __init__(
+        self,
+        config: AgentConfig,
+        bus,
+        workers: Iterable[str] = (),
+        strategy: str = "least_loaded",
+        max_retries: int = 3,
+        scheduler: Optional[AgentScheduler] = None,
+        task_timeout: Optional[float] = None,
+    ):
         super().__init__(name=config.name, bus=bus)
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown dispatch strategy: {strategy}")
+        if task_timeout is not None and task_timeout <= 0:
+            raise ValueError("task_timeout must be positive")
         self.config = config
+        self.strategy = strategy
+        self.max_retries = max_retries
+        self.task_timeout = task_timeout
+        self.workers: Dict[str, _Worker] = {}
+        self.queue: deque = deque()
+        self.tasks: Dict[str, Task] = {}
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.latencies: deque = deque(maxlen=10_000)
+        self.wait_times: deque = deque(maxlen=10_000)
+        self.graphs: Dict[str, GraphRun] = {}
+        self._ids = itertools.count(1)
+        self._graph_ids = itertools.count(1)
+        self._round_robin = 0
+        self._lock = threading.RLock()
+        self._pumping = False
+        # Restored tasks for fixed agents, sent by start()
+        self._held: List[Task] = []
+        self.scheduler = scheduler
+        self._owns_scheduler = scheduler is None
+        for worker in workers:
+            self.add_worker(worker)
+
+    @classmethod
+    def from_config(cls, config: AgentConfig, bus, **params) -> "TaskManagerAgent":
+        return cls(config, bus, **params)
+
+    def inbox_limit(self) -> Optional[int]:
+        # max_tasks caps each worker; capping the manager's own inbox too would queue
+        # worker replies behind new tasks and throttle dispatch
+        return None
+
+    def add_worker(self, name: str) -> None:
+        """Add an agent (by bus name) to the worker pool."""
+        with self._lock:
+            self.workers.setdefault(name, _Worker(name))
+        self._pump()
+
+    def remove_worker(self, name: str) -> None:
+        """Drop a worker; its queued and in-flight tasks are requeued."""
+        with self._lock:
+            worker = self.workers.pop(name, None)
+            if worker is None:
+                return
+            orphans = list(worker.backlog)
+            for task in self.tasks.values():
+                if task.worker == name:
+                    task.worker = None
+                    orphans.append(task)
+            for task in orphans:
+                self._enqueue(task, front=True)
+        self._pump()
+
+    def submit(
+        self,
+        content: str,
+        requester: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+        agent: Optional[str] = None,
+        on_done: Optional[Callable[[Task, str, bool], None]] = None,
+    ) -> str:
+        """Queue a task and return its id.
+
+        With ``agent`` the task is sent straight to that agent instead of the pool.
+        ``on_done(task, result, failed)`` replaces forwarding the result to ``requester``.
+        """
+        task = Task(f"{self.name}-{next(self._ids)}", content, requester, dict(metadata or {}))
+        task.agent = agent
+        task.on_done = on_done
+        with self._lock:
+            self.submitted += 1
+            self.tasks[task.id] = task
+        self._requeue(task, front=False)
+        return task.id
+
+    def submit_graph(self, graph: TaskGraph, requester: Optional[str] = None) -> GraphRun:
+        """Run a task DAG: every node starts as soon as all of its inputs are done.
+
+        Independent branches run concurrently on the pool (or their own agents). When
+        the graph finishes, the results of its sink nodes are sent to ``requester``.
+        """
+        run = GraphRun(f"{self.name}-graph-{next(self._graph_ids)}", graph, requester)
+        with self._lock:
+            self.graphs[run.id] = run
+        for node_id in [node_id for node_id, count in run.pending.items() if count == 0]:
+            self._start_node(run, node_id)
+        return run
+
+    def on_message(self, message: Message) -> None:
+        task_id = message.metadata.get("task_id")
+        is_ours = isinstance(task_id, str) and task_id.startswith(f"{self.name}-")
+        if message.sender in self.workers or is_ours:
+            if task_id is None:
+                print(f"[{self.name}] Ignoring untagged message from worker {message.sender}")
+                return
+            self._complete(task_id, message)
+            return
+        graph = message.metadata.get("task_graph")
+        if graph is not None:
+            self.submit_graph(TaskGraph.model_validate(graph), requester=message.sender)
+            return
+        metadata = {
+            key: value
+            for key, value in message.metadata.items()
+            if key not in ("message_id", "task_id")
+        }
+        self.submit(message.content, requester=message.sender, metadata=metadata)
+
+    def _enqueue(self, task: Task, front: bool = False) -> None:
+        if self.strategy == "work_stealing" and self.workers:
+            names = list(self.workers)
+            worker = self.workers[names[self._round_robin % len(names)]]
+            self._round_robin += 1
+            worker.backlog.appendleft(task) if front else worker.backlog.append(task)
+        else:
+            self.queue.appendleft(task) if front else self.queue.append(task)
+
+    def _assign(self) -> List[Tuple[_Worker, Task]]:
+        """Pick (worker, task) pairs for every free slot. Caller holds the lock."""
+        cap = self.config.max_tasks or float("inf")
+        assignments = []
+        if self.strategy == "work_stealing":
+            # Tasks queued before any worker existed get pinned now
+            while self.queue and self.workers:
+                self._enqueue(self.queue.popleft())
+            for worker in self.workers.values():
+                while worker.in_flight < cap:
+                    if worker.backlog:
+                        task = worker.backlog.popleft()
+                    else:
+                        victim = max(self.workers.values(), key=lambda w: len(w.backlog))
+                        if not victim.backlog:
+                            break
+                        task = victim.backlog.pop()
+                    assignments.append(self._claim(worker, task))
+            return assignments
+
+        while self.queue:
+            least = min(self.workers.values(), key=lambda w: w.in_flight, default=None)
+            if least is None or least.in_flight >= cap:
+                break
+            assignments.append(self._claim(least, self.queue.popleft()))
+        return assignments
+
+    def _claim(self, worker: _Worker, task: Task) -> Tuple[_Worker, Task]:
+        worker.in_flight += 1
+        task.worker = worker.name
+        task.attempts += 1
+        task.started = time.perf_counter()
+        return worker, task
+
+    def _pump(self) -> None:
+        """Dispatch until no worker has a free slot or nothing is queued.
+
+        Workers may reply synchronously from inside ``_deliver``; those nested calls
+        leave the dispatching to the outermost loop instead of recursing.
+        """
+        with self._lock:
+            if self._pumping:
+                return
+            self._pumping = True
+        try:
+            while True:
+                with self._lock:
+                    assignments = self._assign()
+                    if not assignments:
+                        self._pumping = False
+                        return
+                for _, task in assignments:
+                    self._deliver(task)
+        except BaseException:
+            with self._lock:
+                self._pumping = False
+            raise
+
+    def _deliver(self, task: Task) -> None:
+        target = task.worker
+        attempt = task.attempts
+        try:
+            # The bus only logs unknown receivers; fail the task so its slot is freed
+            if target is None or not self.bus.has_route(target):
+                raise LookupError(f"no agent named {target}")
+            self.send(task.content, target, metadata={**task.metadata, "task_id": task.id})
+        except Exception as e:
+            print(f"[{self.name}] Worker {target} failed task {task.id}: {e}")
+            self._settle(task.id, failed=True)
+            return
+        if self.task_timeout is not None:
+            self._arm_timeout(task, attempt)
+
+    def _arm_timeout(self, task: Task, attempt: int) -> None:
+        timeout = self.task_timeout
+        with self._lock:
+            if timeout is None or task.worker is None or task.attempts != attempt:
+                return  # already answered (workers may reply synchronously)
+            if self.scheduler is None:
+                self.scheduler = AgentScheduler(max_workers=1)
+            task.timer = self.scheduler.call_later(
+                timeout, self._expire, args=(task.id, attempt), name=f"timeout {task.id}"
+            )
+
+    def _expire(self, task_id: str, attempt: int) -> None:
+        with self._lock:
+            task = self.tasks.get(task_id)
+            worker = None if task is None else task.worker
+        if worker is not None:
+            print(f"[{self.name}] Worker {worker} timed out on task {task_id}")
+            self._settle(task_id, failed=True, attempt=attempt)
+
+    def _complete(self, task_id: str, message: Message) -> None:
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.worker is None:
+                return  # stale reply for a task that was already settled
+            if task.worker != message.sender and task.worker != self._group_of(message.sender):
+                return  # stale reply from the worker the task was reassigned away from
+        task = self._settle(task_id, failed=message.metadata.get("task_status") == "failed")
+        if task is None:
+            return
+        if task.on_done is not None:
+            task.on_done(task, message.content, False)
+        elif task.requester is not None:
+            self.send(message.content, task.requester, metadata={"task_id": task.id})
+
+    def _group_of(self, sender: str) -> Optional[str]:
+        """The replica group ``sender`` serves on the bus, if any."""
+        for group, pool in getattr(self.bus, "replica_groups", {}).items():
+            if sender in pool:
+                return group
+        return None
+
+    def _settle(self, task_id: str, failed: bool, attempt: Optional[int] = None) -> Optional[Task]:
+        """Free the worker's slot; return the task if it finished successfully.
+
+        With ``attempt``, only that dispatch of the task is settled (used by timeouts).
+        """
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.worker is None:
+                return None
+            if attempt is not None and task.attempts != attempt:
+                return None
+            if task.timer is not None:
+                task.timer.cancel()
+                task.timer = None
+            worker = self.workers.get(task.worker)
+            task.worker = None
+            if worker is not None:
+                worker.in_flight -= 1
+                if failed:
+                    worker.failed += 1
+                else:
+                    worker.completed += 1
+            if not failed:
+                del self.tasks[task_id]
+                now = time.perf_counter()
+                self.completed += 1
+                self.latencies.append(now - task.submitted)
+                self.wait_times.append(task.started - task.submitted)
+        if failed:
+            self._retry(task)
+        self._pump()
+        return None if failed else task
+
+    def _retry(self, task: Task) -> None:
+        if task.attempts > self.max_retries:
+            with self._lock:
+                self.tasks.pop(task.id, None)
+                self.failed += 1
+            print(f"[{self.name}] Task {task.id} failed after {task.attempts} attempts")
+            if task.on_done is not None:
+                task.on_done(task, f"Task failed: {task.content}", True)
+            elif task.requester is not None:
+                self.send(
+                    f"Task failed: {task.content}",
+                    task.requester,
+                    metadata={"task_id": task.id, "task_status": "failed"},
+                )
+            return
+        with self._lock:
+            self.retried += 1
+            if self.config.retry_delay and self.scheduler is None:
+                self.scheduler = AgentScheduler(max_workers=1)
+            scheduler = self.scheduler
+        if self.config.retry_delay and scheduler is not None:
+            scheduler.call_later(
+                self.config.retry_delay, self._requeue, args=(task,), name=f"retry {task.id}"
+            )
+        else:
+            self._requeue(task)
+
+    def _requeue(self, task: Task, front: bool = True) -> None:
+        if task.agent is None:
+            with self._lock:
+                self._enqueue(task, front=front)
+            self._pump()
+            return
+        # Targeted tasks skip the pool; the bus applies the agent's own max_tasks
+        with self._lock:
+            task.worker = task.agent
+            task.attempts += 1
+            task.started = time.perf_counter()
+        self._deliver(task)
+
+    def _start_node(self, run: GraphRun, node_id: str) -> None:
+        node = run.nodes[node_id]
+        with self._lock:
+            run.stamps[node_id] = {"ready": time.perf_counter()}
+            content = Template(node.content).safe_substitute(run.results)
+        self.submit(
+            content,
+            metadata={"graph_id": run.id, "node": node_id},
+            agent=node.agent,
+            on_done=partial(self._node_done, run, node_id),
+        )
+
+    def _node_done(self, run: GraphRun, node_id: str, task: Task, result: str, failed: bool):
+        now = time.perf_counter()
+        with self._lock:
+            if run.status != "running":
+                return
+            run.stamps[node_id].update(started=task.started, finished=now)
+            ready = []
+            if failed:
+                run.status, run.error = "failed", f"node '{node_id}' failed"
+            else:
+                run.results[node_id] = result
+                for child in run.dependents[node_id]:
+                    run.pending[child] -= 1
+                    if run.pending[child] == 0:
+                        ready.append(child)
+                if len(run.results) == len(run.nodes):
+                    run.status = "completed"
+            finished = run.status != "running"
+            if finished:
+                run.finished = now
+                self.graphs.pop(run.id, None)
+        for child in ready:
+            self._start_node(run, child)
+        if finished:
+            self._finish_graph(run)
+
+    def _finish_graph(self, run: GraphRun) -> None:
+        path, length = run.critical_path()
+        finished = run.finished if run.finished is not None else time.perf_counter()
+        print(
+            f"[{self.name}] Graph {run.id} {run.status} in {finished - run.started:.3f}s;"
+            f" critical path {' -> '.join(path)} ({length:.3f}s)"
+        )
+        run._done.set()
+        if run.requester is None:
+            return
+        if run.status == "completed":
+            sinks = run.sink_results()
+            if len(sinks) == 1:
+                content = next(iter(sinks.values()))
+            else:
+                content = "\n\n".join(f"[{node_id}]\n{text}" for node_id, text in sinks.items())
+        else:
+            content = f"Task graph failed: {run.error}"
+        self.send(
+            content,
+            run.requester,
+            metadata={"graph_id": run.id, "graph_status": run.status, "critical_path": path},
+        )
+
+    def snapshot(self) -> Dict[Any, Any]:
+        """Unfinished tasks and counters (graph runs are not checkpointed)."""
+        with self._lock:
+            state: Dict[Any, Any] = {
+                ("task", task.id): (
+                    task.content,
+                    task.requester,
+                    task.metadata,
+                    task.attempts,
+                    task.agent,
+                )
+                for task in self.tasks.values()
+                if task.on_done is None
+            }
+            state["counters"] = (self.submitted, self.completed, self.failed, self.retried)
+            return state
+
+    def restore(self, state: Dict[Any, Any]) -> None:
+        """Queue checkpointed tasks (in-flight ones included) without dispatching them.
+
+        Pool tasks go out once a worker is free (``start`` or ``add_worker``);
+        tasks for a fixed agent wait for ``start``.
+        """
+        with self._lock:
+            self.submitted, self.completed, self.failed, self.retried = state["counters"]
+            self._ids = itertools.count(self.submitted + 1)
+            keys = [k for k in state if isinstance(k, tuple)]
+            for key in sorted(keys, key=lambda k: int(k[1].rsplit("-", 1)[1])):
+                content, requester, metadata, attempts, agent = state[key]
+                task = Task(key[1], content, requester, metadata)
+                task.attempts = attempts
+                task.agent = agent
+                self.tasks[task.id] = task
+                if agent is None:
+                    self._enqueue(task)
+                else:
+                    self._held.append(task)
+
+    def start(self) -> None:
+        """Dispatch the tasks reloaded by ``restore``."""
+        with self._lock:
+            held, self._held = self._held, []
+        for task in held:
+            self._requeue(task, front=False)
+        self._pump()
+
+    def close(self) -> None:
+        """Stop the retry and timeout timer if this agent created it."""
+        if self._owns_scheduler and self.scheduler is not None:
+            self.scheduler.stop(wait=False)
+
+    def pending_work(self) -> int:
+        """Tasks submitted and not yet completed or failed (checked while draining)."""
+        with self._lock:
+            return len(self.tasks)
 
-    def on_message(self, message):
-        print(f"[{self.name}] Received message: {message}")
+    def stats(self) -> Dict[str, Any]:
+        """Throughput, latency percentiles (seconds) and per-worker load."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            waits = sorted(self.wait_times)
+            queued = len(self.queue) + sum(len(w.backlog) for w in self.workers.values())
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "retried": self.retried,
+                "queued": queued,
+                "in_flight": sum(w.in_flight for w in self.workers.values()),
+                "latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+                "latency_p50": _percentile(latencies, 0.5),
+                "latency_p95": _percentile(latencies, 0.95),
+                "wait_avg": sum(waits) / len(waits) if waits else 0.0,
+                "workers": {
+                    name: {
+                        "in_flight": w.in_flight,
+                        "queued": len(w.backlog),
+                        "completed": w.completed,
+                        "failed": w.failed,
+                    }
+                    for name, w in self.workers.items()
+                },
+            }
 
     def run(self):
         print(f"[{self.name}] Agent running with config: {self.config}")
@@ -1,6 +1,8 @@
+import inspect
 from collections import deque
 from typing import TYPE_CHECKING
 
+from MultiProdigy.runtime.event_loop import runtime_loop
 from MultiProdigy.schemas.message import Message
 
 if TYPE_CHECKING:
@@ -19,8 +21,12 @@ class MessageBus:
         self.agents[agent.name] = agent
         print(f"[bus] registered agent {agent.name}")
 
-    def publish(self, message: Message) -> None:
-        """Enqueue a Message for delivery."""
+    def has_route(self, name: str) -> bool:
+        """True if a message to ``name`` would be delivered."""
+        return name in self.agents
+
+    def publish(self, message: Message, internal: bool = False) -> None:
+        """Enqueue a Message for delivery (``internal`` is accepted for API parity)."""
         print(f"[bus] publishing ▶ {message.sender} → {message.receiver}: {message.content}")
         self.queue.append(message)
         self._dispatch()
@@ -37,4 +43,7 @@ class MessageBus:
                 continue
 
             print(f"[bus] delivering to {msg.receiver}")
-            recipient.on_message(msg)
+            result = recipient.on_message(msg)
+            if inspect.iscoroutine(result):
+                # async handlers run on the shared runtime loop instead of being dropped
+                runtime_loop.submit(result)
@@ -0,0 +1,440 @@
+"""
+TCP transport that joins several MessageBus instances into one cluster
+
+Each node listens on a TCP port and connects to a static list of seed addresses.
+On connecting, nodes exchange a HELLO carrying their node id, listen address, the
+agents (and replica groups) they host and the peers they know, so a node that only
+knows one seed still meets the whole cluster. Agent lists are re-advertised when
+they change.
+
+A connection is a pipelined byte stream of frames, each starting with a u32 length:
+
+- message frames are MessageEncoder frames as-is (first payload byte is the codec
+  version), one encoder/decoder pair per connection, so agent names cross once;
+- control frames carry ``CONTROL`` as first payload byte, then JSON.
+
+Senders never wait for the remote side: frames queued in one event loop turn are
+written with a single socket write. Messages are encoded when written, so the ones
+still queued on a connection that is closed as a duplicate go out on the survivor.
+
+Every forward increments the ``cluster_hops`` metadata entry; a message that has
+already crossed ``max_hops`` connections (e.g. bouncing between stale routes) is
+dropped.
+
+With a ``token`` (required for nodes listening beyond loopback) both sides prove
+they know it before the HELLO, without sending it: the accepting node sends only a
+random nonce, the dialling node answers with its own nonce and an HMAC of both,
+and the accepting node replies with its own HMAC before anything else goes out.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import secrets
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from MultiProdigy.bus.codec import MessageDecoder, MessageEncoder
+from MultiProdigy.runtime.event_loop import RuntimeLoop, runtime_loop
+from MultiProdigy.schemas.message import Message
+
+CONTROL = 0xFF
+_U32 = struct.Struct("<I")
+# Metadata entry counting the connections a message has crossed
+HOPS = "cluster_hops"
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # a hostname: assume it is reachable from outside
+
+
+def parse_address(address: str):
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class _Peer:
+    """One TCP connection to another node."""
+
+    def __init__(self, reader, writer, outgoing: bool):
+        self.reader = reader
+        self.writer = writer
+        self.outgoing = outgoing
+        self.node_id: Optional[str] = None
+        self.address: Optional[str] = None
+        self.encoder = MessageEncoder()
+        self.decoder = MessageDecoder()
+        # Control frames (bytes) and Messages; the stateful encoder runs at flush time
+        self.buffer: List[Union[bytes, Message]] = []
+        self.flush_scheduled = False
+        self.closed = False
+        # Connection that replaced this one as a duplicate; late messages go there
+        self.successor: Optional["_Peer"] = None
+        # Agent list this peer last heard from us
+        self.advertised: Set[str] = set()
+        # Token handshake: (accepting side's nonce, dialling side's nonce) once known
+        self.authenticated = False
+        self.nonces: Tuple[Optional[str], Optional[str]] = (None, None)
+
+    def queue(self, item: Union[bytes, Message]) -> None:
+        # Runs on the event loop: batch every frame of this loop turn into one write
+        if self.closed:
+            if self.successor is not None and isinstance(item, Message):
+                self.successor.queue(item)
+            return
+        self.buffer.append(item)
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self) -> None:
+        self.flush_scheduled = False
+        if self.buffer and not self.closed:
+            frames = []
+            for item in self.buffer:
+                if isinstance(item, bytes):
+                    frames.append(item)
+                    continue
+                try:
+                    frames.append(self.encoder.encode(item))
+                except Exception as e:
+                    print(f"[Cluster] Could not encode message for {item.receiver}: {e}")
+            self.writer.write(b"".join(frames))
+        self.buffer.clear()
+
+    def hand_over(self, successor: "_Peer") -> None:
+        """Close this connection; its unsent messages go out on ``successor``."""
+        pending = [item for item in self.buffer if isinstance(item, Message)]
+        self.buffer.clear()
+        self.successor = successor
+        self.close()
+        for message in pending:
+            successor.queue(message)
+
+    def close(self) -> None:
+        self.closed = True
+        self.writer.close()
+
+
+class ClusterNode:
+    """Connects a local MessageBus to other nodes so agents are reachable by name anywhere.
+
+    Once started, the bus forwards messages for agents it does not host to the
+    node that advertised them. Incoming messages are delivered to the local bus on
+    one thread, in arrival order, so slow handlers never stall the network loop.
+
+    ``token`` is a secret shared by every node of the cluster and never sent; it is
+    required when ``host`` is not a loopback address. Messages are dropped after ``max_hops``
+    forwards.
+    """
+
+    def __init__(
+        self,
+        bus,
+        node_id: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seeds: Iterable[str] = (),
+        advertise_interval: float = 0.5,
+        reconnect_interval: float = 1.0,
+        loop: RuntimeLoop = runtime_loop,
+        token: Optional[str] = None,
+        max_hops: int = 8,
+    ):
+        if token is None and not is_loopback(host):
+            raise ValueError(f"Listening on {host} needs a cluster token")
+        self.bus = bus
+        self.node_id = node_id
+        self.host = host
+        self.port = port
+        self.seeds = list(seeds)
+        self.advertise_interval = advertise_interval
+        self.reconnect_interval = reconnect_interval
+        self.runtime_loop = loop
+        self.token = token
+        self.max_hops = max_hops
+        self.address: Optional[str] = None
+        self.peers: Dict[str, _Peer] = {}
+        # Agent name -> node id hosting it
+        self.routes: Dict[str, str] = {}
+        self.forwarded = 0
+        self.received = 0
+        self.dropped = 0
+        self._remote_agents: Dict[str, Set[str]] = {}
+        self._connecting: Set[str] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: List[asyncio.Task] = []
+        self._inbound = ThreadPoolExecutor(1, thread_name_prefix=f"cluster-{node_id}")
+        self._routes_changed = threading.Condition()
+        self._withdrawn = False
+        self.running = False
+
+    # Public API (any thread)
+
+    def start(self) -> str:
+        """Listen, join the seeds and hook into the bus; returns this node's address."""
+        address = self.runtime_loop.submit(self._start()).result()
+        self.bus.remote = self
+        print(f"[Cluster] Node {self.node_id} listening on {address}")
+        return address
+
+    def stop(self) -> None:
+        """Leave the cluster: close every connection and unhook the bus."""
+        if not self.running:
+            return
+        if getattr(self.bus, "remote", None) is self:
+            self.bus.remote = None
+        self.runtime_loop.submit(self._stop()).result()
+        self._inbound.shutdown(wait=True)
+        print(f"[Cluster] Node {self.node_id} stopped")
+
+    def forward(self, message: Message) -> bool:
+        """Send a message to the node hosting its receiver; False if none does.
+
+        A message that already crossed ``max_hops`` connections is dropped (True).
+        """
+        node_id = self.routes.get(message.receiver)
+        peer = self.peers.get(node_id) if node_id is not None else None
+        if peer is None or peer.closed:
+            return False
+        hops = message.metadata.get(HOPS, 0)
+        if hops >= self.max_hops:
+            self.dropped += 1
+            print(f"[Cluster] {self.node_id} dropped message to {message.receiver}: {hops} hops")
+            return True
+        message = message.with_metadata(**{HOPS: hops + 1})
+        # Loop callbacks run in call order, which keeps the encoder in stream order
+        self.runtime_loop.loop.call_soon_threadsafe(peer.queue, message)
+        self.forwarded += 1
+        return True
+
+    def advertise(self) -> None:
+        """Push this node's agent list to every peer now (otherwise done periodically)."""
+        self.runtime_loop.loop.call_soon_threadsafe(self._advertise_if_changed, True)
+
+    def withdraw(self) -> None:
+        """Advertise no agents, so peers stop routing new work here (before draining).
+
+        Connections stay open: replies and in-flight messages still flow both ways.
+        """
+        self._withdrawn = True
+        self.advertise()
+
+    def wait_for_agent(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Block until some node advertises ``name`` (or it is local)."""
+        with self._routes_changed:
+            return self._routes_changed.wait_for(
+                lambda: name in self.routes or name in self.bus.agents, timeout
+            )
+
+    # Event loop side
+
+    def _local_agents(self) -> Set[str]:
+        if self._withdrawn:
+            return set()
+        return set(self.bus.agents) | set(self.bus.replica_groups)
+
+    async def _start(self) -> str:
+        server = await asyncio.start_server(self._accept, self.host, self.port)
+        port = server.sockets[0].getsockname()[1]
+        self._server = server
+        self.address = address = f"{self.host}:{port}"
+        self.running = True
+        self._tasks.append(asyncio.create_task(self._advertise_loop()))
+        for seed in self.seeds:
+            self._tasks.append(asyncio.create_task(self._keep_connected(seed)))
+        return address
+
+    async def _stop(self) -> None:
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        for peer in list(self.peers.values()):
+            peer.flush()
+            peer.close()
+        if server is not None:
+            await server.wait_closed()
+
+    async def _keep_connected(self, address: str) -> None:
+        # Seeds are reconnected whenever their connection drops
+        while self.running:
+            if address != self.address and not self._connected_to(address):
+                await self._connect(address)
+            await asyncio.sleep(self.reconnect_interval)
+
+    def _connected_to(self, address: str) -> bool:
+        return address in self._connecting or any(
+            peer.address == address and not peer.closed for peer in self.peers.values()
+        )
+
+    async def _connect(self, address: str) -> None:
+        self._connecting.add(address)
+        try:
+            reader, writer = await asyncio.open_connection(*parse_address(address))
+        except OSError as e:
+            print(f"[Cluster] {self.node_id} could not reach {address}: {e}")
+            return
+        finally:
+            self._connecting.discard(address)
+        peer = _Peer(reader, writer, outgoing=True)
+        peer.address = address
+        self._tasks.append(asyncio.create_task(self._serve(peer)))
+
+    async def _accept(self, reader, writer) -> None:
+        await self._serve(_Peer(reader, writer, outgoing=False))
+
+    def _send_control(self, peer: _Peer, kind: str, **fields) -> None:
+        body = json.dumps({"type": kind, **fields}).encode("utf-8")
+        peer.queue(_U32.pack(len(body) + 1) + bytes((CONTROL,)) + body)
+
+    def _send_hello(self, peer: _Peer) -> None:
+        peer.advertised = self._local_agents()
+        self._send_control(
+            peer,
+            "hello",
+            node=self.node_id,
+            address=self.address,
+            agents=sorted(peer.advertised),
+            peers=[p.address for p in self.peers.values() if p.address],
+        )
+
+    def _proof(self, role: str, nonces: Tuple[Optional[str], Optional[str]]) -> str:
+        message = f"{role}:{nonces[0]}:{nonces[1]}".encode("utf-8")
+        return hmac.new(str(self.token).encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+    def _authenticate(self, peer: _Peer, data: dict) -> bool:
+        """One step of the token handshake; False refuses the connection."""
+        kind = data.get("type")
+        accepting, dialling = peer.nonces
+        if peer.outgoing and kind == "challenge" and dialling is None:
+            peer.nonces = (str(data.get("nonce")), secrets.token_hex(16))
+            proof = self._proof("dial", peer.nonces)
+            self._send_control(peer, "auth", nonce=peer.nonces[1], proof=proof)
+            return True
+        if kind == "auth" and accepting is not None:
+            if not peer.outgoing:
+                peer.nonces = (accepting, str(data.get("nonce")))
+            expected = self._proof("dial" if not peer.outgoing else "accept", peer.nonces)
+            given = str(data.get("proof")).encode("utf-8")
+            if hmac.compare_digest(given, expected.encode("utf-8")):
+                peer.authenticated = True
+                if not peer.outgoing:
+                    self._send_control(peer, "auth", proof=self._proof("accept", peer.nonces))
+                self._send_hello(peer)
+                return True
+        print(f"[Cluster] {self.node_id} refused {peer.address or 'a peer'}: bad cluster token")
+        return False
+
+    async def _serve(self, peer: _Peer) -> None:
+        if self.token is None:
+            peer.authenticated = True
+            self._send_hello(peer)
+        elif not peer.outgoing:
+            # Only a nonce goes out until the dialling node has proved the token
+            peer.nonces = (secrets.token_hex(16), None)
+            self._send_control(peer, "challenge", nonce=peer.nonces[0])
+        try:
+            while True:
+                header = await peer.reader.readexactly(_U32.size)
+                (length,) = _U32.unpack(header)
+                payload = await peer.reader.readexactly(length)
+                if payload[0] == CONTROL:
+                    if not self._on_control(peer, json.loads(payload[1:])):
+                        break
+                    continue
+                if peer.node_id is None:
+                    break  # nothing is accepted before an authenticated HELLO
+                # Decode here, in stream order; deliver off the loop
+                message = peer.decoder.decode(header + payload).to_message()
+                self.received += 1
+                self._inbound.submit(self._deliver, message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Cluster] {self.node_id} dropped connection to {peer.node_id}: {e}")
+        finally:
+            self._drop(peer)
+
+    def _deliver(self, message: Message) -> None:
+        try:
+            # Peers only forward what their own agents sent
+            self.bus.publish(message, internal=True)
+        except Exception as e:
+            print(f"[Cluster] {self.node_id} failed to deliver to {message.receiver}: {e}")
+
+    def _on_control(self, peer: _Peer, data: dict) -> bool:
+        if not peer.authenticated:
+            return self._authenticate(peer, data)
+        if data["type"] == "hello":
+            node_id = data["node"]
+            if node_id == self.node_id:
+                return False  # connected to ourselves through a seed
+            existing = self.peers.get(node_id)
+            if existing is not None and not existing.closed:
+                # Two nodes dialled each other: both keep the lower id's connection
+                initiator = self.node_id if peer.outgoing else node_id
+                if initiator != min(self.node_id, node_id):
+                    return False
+                existing.hand_over(peer)
+            peer.node_id = node_id
+            peer.address = data.get("address") or peer.address
+            self.peers[node_id] = peer
+            self._set_routes(node_id, data["agents"])
+            # Our agents may have changed since our HELLO went out on this connection
+            self._advertise_to(peer)
+            for address in data.get("peers", ()):
+                if address and address != self.address and not self._connected_to(address):
+                    self._tasks.append(asyncio.create_task(self._connect(address)))
+            print(f"[Cluster] {self.node_id} joined {node_id} at {peer.address}")
+        elif data["type"] == "agents" and peer.node_id is not None:
+            self._set_routes(peer.node_id, data["agents"])
+        return True
+
+    def _set_routes(self, node_id: str, agents: Iterable[str]) -> None:
+        with self._routes_changed:
+            for name in self._remote_agents.pop(node_id, ()):
+                if self.routes.get(name) == node_id:
+                    del self.routes[name]
+            self._remote_agents[node_id] = set(agents)
+            for name in agents:
+                self.routes[name] = node_id
+            self._routes_changed.notify_all()
+
+    def _drop(self, peer: _Peer) -> None:
+        if not peer.closed:
+            peer.close()
+        if peer.node_id is not None and self.peers.get(peer.node_id) is peer:
+            del self.peers[peer.node_id]
+            self._set_routes(peer.node_id, ())
+            print(f"[Cluster] {self.node_id} lost {peer.node_id}")
+
+    async def _advertise_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.advertise_interval)
+            self._advertise_if_changed()
+
+    def _advertise_if_changed(self, force: bool = False) -> None:
+        agents = self._local_agents()
+        for peer in list(self.peers.values()):
+            self._advertise_to(peer, agents, force)
+
+    def _advertise_to(self, peer: _Peer, agents: Optional[Set[str]] = None, force=False) -> None:
+        agents = self._local_agents() if agents is None else agents
+        if agents != peer.advertised or force:
+            peer.advertised = agents
+            self._send_control(peer, "agents", agents=sorted(agents))
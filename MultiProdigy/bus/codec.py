@@ -0,0 +1,270 @@
+"""
+Compact binary wire codec for Message
+
+Frame layout (version 1, little endian)::
+
+    u32  frame length (bytes after this field)
+    u8   version
+    u8   flags            bit 0: content is zlib-compressed
+    ref  sender
+    ref  receiver
+    u32  metadata length, then metadata as JSON (0 = empty)
+    u32  content length, then content bytes (UTF-8, or zlib when flagged)
+    [u32 attachments length, then attachment references as JSON]   when flag bit 1 is set
+
+A ``ref`` is a u32 index into a string table shared by one encoder/decoder pair.
+When the index equals the current table size the string is new: a u16 length and the
+UTF-8 bytes follow, and both sides append it to their table. ``LITERAL_REF`` marks a
+string sent inline without interning (once the table is full). Agent names therefore
+cross the wire once per connection instead of on every message. Decoders are stateful:
+frames must be decoded once each, in the order they were encoded.
+"""
+
+import struct
+import sys
+import zlib
+from typing import Dict, List, Optional, Sequence, Union
+
+from pydantic_core import from_json, to_json
+
+from MultiProdigy.schemas.message import Message
+from MultiProdigy.support.error import MessageValidationError
+
+VERSION = 1
+FLAG_COMPRESSED = 0x01
+FLAG_ATTACHMENTS = 0x02
+LITERAL_REF = 0xFFFFFFFF
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_HEADER = struct.Struct("<BB")
+# length, version, flags, sender ref, receiver ref, metadata length
+_INTERNED_HEADER = struct.Struct("<IBBIII")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class DecodedMessage:
+    """A decoded frame whose content still points into the received buffer."""
+
+    __slots__ = ("sender", "receiver", "metadata", "content", "attachments")
+
+    def __init__(
+        self,
+        sender: str,
+        receiver: str,
+        metadata: dict,
+        content: memoryview,
+        attachments: Sequence[dict] = (),
+    ):
+        self.sender = sender
+        self.receiver = receiver
+        self.metadata = metadata
+        self.content = content
+        self.attachments = attachments
+
+    def text(self) -> str:
+        """Decode the content as UTF-8."""
+        try:
+            return str(self.content, "utf-8")
+        except UnicodeDecodeError as e:
+            raise MessageValidationError(f"Message content is not valid UTF-8: {e}") from e
+
+    def to_message(self) -> Message:
+        """Build a validated Message (frames come from outside the process)."""
+        content = self.text()
+        try:
+            return Message.model_validate(
+                {
+                    "sender": self.sender,
+                    "receiver": self.receiver,
+                    "content": content,
+                    "metadata": self.metadata,
+                    "attachments": self.attachments,
+                }
+            )
+        except ValueError as e:  # pydantic's ValidationError
+            raise MessageValidationError(f"Invalid message in frame: {e}") from e
+
+
+class MessageEncoder:
+    """Encodes Messages into length-prefixed frames for one connection or log."""
+
+    def __init__(
+        self,
+        compress_threshold: Optional[int] = 4096,
+        compress_level: int = 1,
+        max_table_size: int = 65536,
+    ):
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.max_table_size = max_table_size
+        self._table: Dict[str, int] = {}
+
+    def _write_ref(self, out: bytearray, value: str) -> None:
+        index = self._table.get(value)
+        if index is not None:
+            out += _U32.pack(index)
+            return
+        raw = value.encode("utf-8")
+        if len(self._table) < self.max_table_size:
+            index = len(self._table)
+            self._table[value] = index
+            out += _U32.pack(index)
+        else:
+            out += _U32.pack(LITERAL_REF)
+        out += _U16.pack(len(raw))
+        out += raw
+
+    def encode(self, message: Message) -> bytes:
+        """Encode one message into a frame, length prefix included."""
+        flags = 0
+        content = message.content.encode("utf-8")
+        if self.compress_threshold is not None and len(content) >= self.compress_threshold:
+            compressed = zlib.compress(content, self.compress_level)
+            if len(compressed) < len(content):
+                content = compressed
+                flags |= FLAG_COMPRESSED
+        metadata = to_json(message.metadata.to_dict()) if message.metadata else b""
+        trailer = b""
+        if message.attachments:
+            flags |= FLAG_ATTACHMENTS
+            refs = to_json([a.model_dump() for a in message.attachments])
+            trailer = _U32.pack(len(refs)) + refs
+
+        sender_ref = self._table.get(message.sender)
+        receiver_ref = self._table.get(message.receiver)
+        if sender_ref is not None and receiver_ref is not None:
+            # Hot path: both names already interned, the header is one fixed struct
+            length = (
+                _INTERNED_HEADER.size
+                - _U32.size
+                + len(metadata)
+                + _U32.size
+                + len(content)
+                + len(trailer)
+            )
+            header = _INTERNED_HEADER.pack(
+                length, VERSION, flags, sender_ref, receiver_ref, len(metadata)
+            )
+            return b"".join((header, metadata, _U32.pack(len(content)), content, trailer))
+
+        out = bytearray(_U32.size)
+        out += _HEADER.pack(VERSION, flags)
+        self._write_ref(out, message.sender)
+        self._write_ref(out, message.receiver)
+        out += _U32.pack(len(metadata))
+        out += metadata
+        out += _U32.pack(len(content))
+        out += content
+        out += trailer
+        _U32.pack_into(out, 0, len(out) - _U32.size)
+        return bytes(out)
+
+
+class MessageDecoder:
+    """Decodes frames produced by the matching MessageEncoder."""
+
+    def __init__(self, max_content_size: int = 64 * 1024 * 1024):
+        # Bound on decompressed content, so a small frame cannot inflate without limit
+        self.max_content_size = max_content_size
+        self._table: List[str] = []
+        self._pending = bytearray()
+
+    def _read_ref(self, view: memoryview, pos: int):
+        (index,) = _U32.unpack_from(view, pos)
+        pos += _U32.size
+        if index < len(self._table):
+            return self._table[index], pos
+        if index != len(self._table) and index != LITERAL_REF:
+            raise MessageValidationError(f"Unknown string reference {index} in frame")
+        (length,) = _U16.unpack_from(view, pos)
+        pos += _U16.size
+        value = str(view[pos : pos + length], "utf-8")
+        if index != LITERAL_REF:
+            # Interned, so the bus routes decoded messages with identity-equal keys
+            value = sys.intern(value)
+            self._table.append(value)
+        return value, pos + length
+
+    def decode(self, frame: Buffer) -> DecodedMessage:
+        """Decode one frame (length prefix included) without copying the content."""
+        view = memoryview(frame)
+        try:
+            (length,) = _U32.unpack_from(view, 0)
+            if len(view) < _U32.size + length:
+                raise MessageValidationError("Truncated message frame")
+            version, flags = _HEADER.unpack_from(view, _U32.size)
+            if version != VERSION:
+                raise MessageValidationError(f"Unsupported codec version {version}")
+            table = self._table
+            if len(view) >= _INTERNED_HEADER.size:
+                _, _, _, sender_ref, receiver_ref, meta_len = _INTERNED_HEADER.unpack_from(view, 0)
+            else:
+                sender_ref = receiver_ref = LITERAL_REF
+            if sender_ref < len(table) and receiver_ref < len(table):
+                sender, receiver = table[sender_ref], table[receiver_ref]
+                pos = _INTERNED_HEADER.size
+            else:
+                pos = _U32.size + _HEADER.size
+                sender, pos = self._read_ref(view, pos)
+                receiver, pos = self._read_ref(view, pos)
+                (meta_len,) = _U32.unpack_from(view, pos)
+                pos += _U32.size
+            metadata = from_json(bytes(view[pos : pos + meta_len])) if meta_len else {}
+            pos += meta_len
+            (content_len,) = _U32.unpack_from(view, pos)
+            pos += _U32.size
+            content = view[pos : pos + content_len]
+            attachments = ()
+            if flags & FLAG_ATTACHMENTS:
+                pos += content_len
+                (refs_len,) = _U32.unpack_from(view, pos)
+                pos += _U32.size
+                attachments = from_json(bytes(view[pos : pos + refs_len]))
+            if not isinstance(metadata, dict) or not isinstance(attachments, (list, tuple)):
+                raise MessageValidationError("Malformed metadata or attachments in frame")
+        except (struct.error, ValueError) as e:  # ValueError covers bad JSON and UTF-8
+            raise MessageValidationError(f"Malformed message frame: {e}") from e
+
+        if flags & FLAG_COMPRESSED:
+            content = memoryview(self._decompress(content))
+        return DecodedMessage(sender, receiver, metadata, content, attachments)
+
+    def _decompress(self, data: memoryview) -> bytes:
+        inflater = zlib.decompressobj()
+        try:
+            content = inflater.decompress(data, self.max_content_size + 1)
+        except zlib.error as e:
+            raise MessageValidationError(f"Corrupt compressed content: {e}") from e
+        if len(content) > self.max_content_size or inflater.unconsumed_tail:
+            raise MessageValidationError(
+                f"Decompressed content exceeds {self.max_content_size} bytes"
+            )
+        return content
+
+    def feed(self, data: Buffer) -> List[DecodedMessage]:
+        """Buffer stream bytes and return every frame that is now complete."""
+        self._pending += data
+        decoded = []
+        offset = 0
+        while len(self._pending) - offset >= _U32.size:
+            (length,) = _U32.unpack_from(self._pending, offset)
+            end = offset + _U32.size + length
+            if end > len(self._pending):
+                break
+            # One copy out of the shared buffer; content views point into it
+            decoded.append(self.decode(bytes(self._pending[offset:end])))
+            offset = end
+        del self._pending[:offset]
+        return decoded
+
+
+def encode_message(message: Message, compress_threshold: Optional[int] = 4096) -> bytes:
+    """Encode a single self-contained frame."""
+    return MessageEncoder(compress_threshold=compress_threshold).encode(message)
+
+
+def decode_message(frame: Buffer) -> Message:
+    """Decode a single self-contained frame into a Message."""
+    return MessageDecoder().decode(frame).to_message()
@@ -1,19 +1,259 @@
+import sys
+from typing import Optional
+
+from MultiProdigy.bus.routing import ReplicaPool
+from MultiProdigy.runtime.concurrency import ConcurrencyLimiter
+from MultiProdigy.storage.blob_store import default_blob_store
+from MultiProdigy.support.error import IngressClosedError
+
+
 class MessageBus:
     def __init__(self):
         self.agents = {}
+        # Interned agent name -> compact integer id; ids index self._by_id and self._names
+        self.agent_ids = {}
+        self._by_id = []
+        self._names = []
+        # Ids of unregistered agents, handed back if the name registers again
+        self._retired_ids = {}
+        # Per-agent in-flight caps (agent id -> ConcurrencyLimiter or None)
+        self._limiters = []
+        # Logical agent name -> ReplicaPool of the replica names serving it
+        self.replica_groups = {}
+        # Receiver name -> agent id, or the ReplicaPool of a group: one lookup per publish
+        self._routes = {}
+        # False while shutting down: only internal publishes (agents, hosts, peers) pass
+        self.ingress_open = True
+        # ClusterNode forwarding messages for agents hosted on other nodes
+        self.remote = None
+        # Store holding attachment blobs; each delivery keeps a reference until handled.
+        # None uses default_blob_store(), created on the first attachment
+        self.blob_store = None
+
+    def _assign_id(self, agent) -> int:
+        """Intern the agent's name and give it a compact id (stable across re-registers)."""
+        name = sys.intern(agent.name)
+        if name in self.replica_groups:
+            # Both would claim the same route; unregistering one would drop the other's
+            raise ValueError(f"'{name}' is already registered as a replica group")
+        agent.name = name
+        agent_id = self.agent_ids.get(name)
+        if agent_id is None:
+            agent_id = self._retired_ids.pop(name, None)
+        if agent_id is None:
+            agent_id = len(self._by_id)
+            self._by_id.append(agent)
+            self._names.append(name)
+            self._limiters.append(None)
+        else:
+            self._by_id[agent_id] = agent
+        self.agent_ids[name] = agent_id
+        self._routes[name] = agent_id
+        self.agents[name] = agent
+        # Agents get their in-flight cap (AgentConfig.max_tasks unless they override it)
+        inbox_limit = getattr(agent, "inbox_limit", None)
+        if inbox_limit is not None:
+            max_tasks = inbox_limit()
+        else:
+            max_tasks = getattr(getattr(agent, "config", None), "max_tasks", None)
+        limiter = ConcurrencyLimiter(max_tasks) if isinstance(max_tasks, int) else None
+        self._limiters[agent_id] = limiter
+        return agent_id
 
     def register(self, agent):
         """Register an agent so it can receive messages."""
-        self.agents[agent.name] = agent
+        self._assign_id(agent)
         print(f"[Bus] Agent registered: {agent.name}")
 
-    def publish(self, message):
-        """Deliver a message to the correct agent."""
-        receiver = message.receiver
-        if receiver in self.agents:
-            self.agents[receiver].handle_message(message)
+    def register_lazy(self, name: str, factory, idle_timeout=None, config=None, store=None):
+        """Register an agent that is only built (by ``factory(name, bus)``) when first used.
+
+        See LazyAgent for buffering during construction and idle eviction.
+        """
+        from MultiProdigy.runtime.lazy import LazyAgent
+
+        agent = LazyAgent(
+            name, self, factory, idle_timeout=idle_timeout, config=config, store=store
+        )
+        self._assign_id(agent)
+        print(f"[Bus] Lazy agent registered: {agent.name}")
+        return agent
+
+    def register_replica(self, agent, group: str, strategy: Optional[str] = None):
+        """Register an agent as one replica of the logical agent ``group``.
+
+        Messages addressed to ``group`` are spread over its replicas by the pool's
+        ``strategy`` (see ReplicaPool), fixed by the first replica registered. The
+        default, consistent hashing on the routing key, keeps one conversation on
+        the same replica.
+        """
+        if group in self.agents:
+            raise ValueError(f"'{group}' is already registered as a single agent")
+        pool = self.replica_groups.get(group)
+        if pool is None:
+            pool = ReplicaPool(strategy or "consistent_hash")
+            group = sys.intern(group)
+            self.replica_groups[group] = pool
+            self._routes[group] = pool
+        elif strategy is not None and strategy != pool.strategy:
+            raise ValueError(f"'{group}' already balances with {pool.strategy}")
+        self._assign_id(agent)
+        pool.add(agent.name)
+        print(f"[Bus] Replica registered: {agent.name} -> {group}")
+
+    def unregister(self, agent_name: str):
+        """Remove an agent (or replica) from the bus, along with its id and concurrency cap."""
+        self.agents.pop(agent_name, None)
+        agent_id = self.agent_ids.pop(agent_name, None)
+        if agent_id is not None:
+            self._by_id[agent_id] = None
+            self._limiters[agent_id] = None
+            self._retired_ids[agent_name] = agent_id
+            del self._routes[agent_name]
+        for group, pool in list(self.replica_groups.items()):
+            pool.remove(agent_name)
+            if not pool:
+                del self.replica_groups[group]
+                del self._routes[group]
+
+    def set_concurrency_limit(self, agent_name: str, max_tasks):
+        """Cap in-flight messages for an agent (``None`` removes the cap)."""
+        agent_id = self.agent_ids[agent_name]
+        self._limiters[agent_id] = ConcurrencyLimiter(max_tasks) if max_tasks else None
+
+    def close_ingress(self):
+        """Refuse messages not published with ``internal=True`` (used while draining)."""
+        self.ingress_open = False
+
+    def open_ingress(self):
+        self.ingress_open = True
+
+    def has_route(self, name: str) -> bool:
+        """True if ``publish`` can deliver to ``name`` (agent, replica group or remote agent)."""
+        return name in self._routes or (self.remote is not None and name in self.remote.routes)
+
+    def pending(self) -> int:
+        """Messages queued or in flight across all agents with a concurrency cap."""
+        return sum(
+            limiter.in_flight + len(limiter.queue)
+            for limiter in self._limiters
+            if limiter is not None
+        )
+
+    def cancel_pending(self) -> int:
+        """Drop queued messages and cancel in-flight async handlers; returns how many."""
+        return sum(
+            limiter.cancel(on_drop=self._release_attachments)
+            for limiter in self._limiters
+            if limiter is not None
+        )
+
+    def utilisation(self):
+        """Per-agent load for every agent with a concurrency cap."""
+        return {
+            self._names[agent_id]: limiter.stats()
+            for agent_id, limiter in enumerate(self._limiters)
+            if limiter is not None
+        }
+
+    def replica_metrics(self, group: str):
+        """Per-replica load for a logical agent name."""
+        return self.replica_groups[group].metrics()
+
+    def agent_id(self, name: str):
+        """Return the integer id assigned to ``name`` at registration, or None."""
+        return self.agent_ids.get(name)
+
+    def agent_name(self, agent_id: int) -> str:
+        """Map an integer id back to the agent name."""
+        return self._names[agent_id]
+
+    def resolve_id(self, message):
+        """Return the id of the agent that should handle the message, or None.
+
+        For replica groups this makes the balancing decision (e.g. advances round robin).
+        """
+        route = self._routes.get(message.receiver)
+        if route is None or type(route) is int:
+            return route
+        return self.agent_ids.get(route.choose(message))
+
+    def resolve(self, message):
+        """Return the name of the agent that should handle the message.
+
+        Returns None when no local agent or replica group has that name.
+        """
+        agent_id = self.resolve_id(message)
+        return None if agent_id is None else self._names[agent_id]
+
+    def publish(self, message, internal=False):
+        """Deliver a message to the correct agent.
+
+        ``internal`` marks a message sent by an agent of this runtime (set by
+        ``BaseAgent.send``, process hosts and cluster peers); the sender name is
+        not trusted for that, so only internal messages pass while ingress is closed.
+        """
+        if not self.ingress_open and not internal:
+            raise IngressClosedError(f"Bus is draining; refused message from {message.sender}")
+        # The one string-keyed lookup per message (messages address agents by name).
+        # Names are interned and str caches its hash, so replies (addressed to
+        # message.sender) and decoded frames match by identity without rehashing;
+        # everything after it is indexed by integer id
+        route = self._routes.get(message.receiver)
+        pool = None
+        if route is None or type(route) is int:
+            agent_id = route
+        else:
+            pool = route
+            agent_id = self.agent_ids.get(pool.choose(message))
+        agent = None if agent_id is None else self._by_id[agent_id]
+        if agent is None:
+            if self.remote is not None and self.remote.forward(message):
+                return
+            print(f"[Bus] No agent found with name: {message.receiver}")
+            return
+        handler = agent.handle_message
+        if pool is not None:
+            handler = pool.track(agent.name, handler)
+        if message.attachments:
+            handler = self._pin_attachments(handler, message)
+        limiter = self._limiters[agent_id]
+        if limiter is not None:
+            limiter.submit(handler, message)
         else:
-            print(f"[Bus] No agent found with name: {receiver}")
+            handler(message)
+
+    def _pin_attachments(self, handler, message):
+        """Retain the message's blobs now; return ``handler`` wrapped to release them.
+
+        A queued or running delivery therefore keeps its attachments out of ``gc``.
+        Agents that hold on to a message after handling it call ``retain`` themselves.
+        """
+        store = self.blob_store or default_blob_store()
+        for attachment in message.attachments:
+            store.retain(attachment.digest)
+
+        def release(_=None):
+            self._release_attachments(message)
+
+        def pinned(message):
+            try:
+                result = handler(message)
+            except BaseException:
+                release()
+                raise
+            if hasattr(result, "add_done_callback"):
+                result.add_done_callback(release)
+            else:
+                release()
+            return result
+
+        return pinned
+
+    def _release_attachments(self, message) -> None:
+        store = self.blob_store or default_blob_store()
+        for attachment in message.attachments:
+            store.release(attachment.digest)
 
     def send(self, message):
         """Alias for publish to maintain compatibility"""
@@ -0,0 +1,213 @@
+import bisect
+import hashlib
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from MultiProdigy.schemas.message import Message
+
+# Metadata keys checked, in order, when picking the sticky routing key of a message
+ROUTING_KEY_FIELDS = ("routing_key", "conversation_id", "user_id")
+
+
+def routing_key(message: Message) -> str:
+    """Return the key that pins a message to one replica (falls back to the sender)."""
+    for field in ROUTING_KEY_FIELDS:
+        value = message.metadata.get(field)
+        if value is not None:
+            return str(value)
+    return message.sender
+
+
+class ConsistentHashRing:
+    """Consistent-hash ring mapping routing keys to replica names.
+
+    Each replica is placed on the ring ``vnodes`` times so keys spread evenly.
+    Adding or removing a replica only moves the keys that land on its points.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 128):
+        if vnodes <= 0:
+            raise ValueError("vnodes must be positive")
+        self.vnodes = vnodes
+        self.nodes: Set[str] = set()
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, node: str) -> None:
+        """Place a replica on the ring."""
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            point = self._hash(f"{node}#{i}")
+            # 64-bit collisions are practically impossible; keep the first owner if one happens
+            if point in self._owners:
+                continue
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node: str) -> None:
+        """Take a replica off the ring; its keys move to the next replicas clockwise."""
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        self._points = [p for p in self._points if self._owners[p] != node]
+        self._owners = {p: self._owners[p] for p in self._points}
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the replica that owns ``key``, or None when the ring is empty."""
+        if not self._points:
+            return None
+        idx = bisect.bisect(self._points, self._hash(key))
+        if idx == len(self._points):
+            idx = 0
+        return self._owners[self._points[idx]]
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+class ReplicaStats:
+    """Load counters for one replica."""
+
+    __slots__ = ("dispatched", "outstanding", "completed", "errors", "busy_seconds")
+
+    def __init__(self):
+        self.dispatched = 0
+        self.outstanding = 0
+        self.completed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+
+class ReplicaPool:
+    """The replicas serving one logical agent name, and how messages are spread.
+
+    ``consistent_hash`` pins each routing key to one replica (sticky sessions);
+    ``round_robin`` cycles through replicas; ``least_outstanding`` picks the replica
+    with the fewest unfinished messages; ``power_of_two`` samples two replicas and
+    takes the less loaded one, which balances nearly as well without a full scan.
+    A message is outstanding from routing until its handler (or the task/future it
+    returns) finishes, so time spent queued behind a concurrency cap counts as load.
+    Latency is measured from the handler's start, so it excludes that queueing.
+    """
+
+    STRATEGIES = ("consistent_hash", "round_robin", "least_outstanding", "power_of_two")
+
+    def __init__(self, strategy: str = "consistent_hash", vnodes: int = 128):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.strategy = strategy
+        self.members: List[str] = []
+        self.stats: Dict[str, ReplicaStats] = {}
+        self.ring = ConsistentHashRing(vnodes=vnodes) if strategy == "consistent_hash" else None
+        self._next = 0
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+    def add(self, name: str) -> None:
+        """Add a replica to the pool."""
+        with self._lock:
+            if name in self.stats:
+                return
+            self.members.append(name)
+            self.stats[name] = ReplicaStats()
+            if self.ring is not None:
+                self.ring.add(name)
+
+    def remove(self, name: str) -> None:
+        """Take a replica out of rotation."""
+        with self._lock:
+            if self.stats.pop(name, None) is None:
+                return
+            self.members.remove(name)
+            if self.ring is not None:
+                self.ring.remove(name)
+
+    def choose(self, message: Message) -> Optional[str]:
+        """Pick the replica for ``message`` (advances round-robin state)."""
+        with self._lock:
+            members = self.members
+            if not members:
+                return None
+            if self.ring is not None:  # consistent_hash
+                return self.ring.get(routing_key(message))
+            if self.strategy == "round_robin":
+                self._next = (self._next + 1) % len(members)
+                return members[self._next]
+            if self.strategy == "power_of_two" and len(members) > 2:
+                candidates = self._random.sample(members, 2)
+            else:
+                candidates = members
+            return min(
+                candidates, key=lambda n: (self.stats[n].outstanding, self.stats[n].dispatched)
+            )
+
+    def track(self, name: str, handler: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Count a message as outstanding on ``name``; return ``handler`` wrapped to settle it."""
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                return handler
+            stats.dispatched += 1
+            stats.outstanding += 1
+
+        def tracked(message):
+            # Latency starts here, not at routing: time queued behind max_tasks is excluded
+            started = time.perf_counter()
+            try:
+                result = handler(message)
+            except Exception:
+                self._settle(stats, started, error=True)
+                raise
+            if hasattr(result, "add_done_callback"):
+                result.add_done_callback(
+                    lambda done: self._settle(
+                        stats, started, error=not done.cancelled() and done.exception() is not None
+                    )
+                )
+            else:
+                self._settle(stats, started, error=False)
+            return result
+
+        return tracked
+
+    def _settle(self, stats: ReplicaStats, started: float, error: bool) -> None:
+        with self._lock:
+            stats.outstanding -= 1
+            stats.completed += 1
+            stats.errors += error
+            stats.busy_seconds += time.perf_counter() - started
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-replica load: dispatched, outstanding, completed, errors, share, mean latency."""
+        with self._lock:
+            total = sum(stats.dispatched for stats in self.stats.values())
+            return {
+                name: {
+                    "dispatched": stats.dispatched,
+                    "outstanding": stats.outstanding,
+                    "completed": stats.completed,
+                    "errors": stats.errors,
+                    "share": stats.dispatched / total if total else 0.0,
+                    "avg_latency": stats.busy_seconds / stats.completed if stats.completed else 0.0,
+                }
+                for name, stats in self.stats.items()
+            }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.stats
+
+    def __len__(self) -> int:
+        return len(self.members)
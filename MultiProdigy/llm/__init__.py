@@ -19,6 +19,7 @@ Example Usage:
 
 from .api_client import APILLMClient
 from .base import BaseLLMClient, LLMConfig, LLMProvider, LLMResponse
+from .context import ContextManager, estimate_tokens
 
 # Main exports - new unified system
 from .factory import LLMFactory, create_llm_client, get_supported_providers
@@ -37,6 +38,8 @@ __all__ = [
     "OllamaClient",
     "HuggingFaceClient",
     "MockClient",
+    "ContextManager",
+    "estimate_tokens",
     "create_llm_client",
     "get_supported_providers",
     # Legacy compatibility removed - use LLMFactory instead
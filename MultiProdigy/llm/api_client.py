@@ -6,11 +6,17 @@ This replaces individual provider files with a single, consistent implementation
 import asyncio
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
 import aiohttp
 
-from MultiProdigy.llm.base import BaseLLMClient, LLMConfig, LLMProvider, LLMResponse
+from MultiProdigy.llm.base import (
+    BaseLLMClient,
+    LLMConfig,
+    LLMProvider,
+    LLMResponse,
+    LoopSessions,
+)
 
 
 class APILLMClient(BaseLLMClient):
@@ -18,7 +24,7 @@ class APILLMClient(BaseLLMClient):
 
     def __init__(self, config: LLMConfig):
         super().__init__(config)
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.sessions = LoopSessions(self._new_session)
         self._setup_provider_config()
 
     def _setup_provider_config(self):
@@ -50,12 +56,13 @@ class APILLMClient(BaseLLMClient):
         self.base_url = self.config.base_url or self.provider_config.get("base_url")
         self.headers = self.provider_config.get("headers", {})
 
+    def _new_session(self) -> aiohttp.ClientSession:
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        return aiohttp.ClientSession(headers=self.headers, timeout=timeout)
+
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session"""
-        if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=self.config.timeout)
-            self.session = aiohttp.ClientSession(headers=self.headers, timeout=timeout)
-        return self.session
+        """HTTP session for the running event loop"""
+        return self.sessions.get()
 
     async def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate text using the configured provider"""
@@ -204,9 +211,8 @@ class APILLMClient(BaseLLMClient):
                 raise Exception(f"Embedding API error {response.status}: {error_text}")
 
     async def close(self):
-        """Close the HTTP session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Close the HTTP sessions"""
+        await self.sessions.close()
 
     async def __aenter__(self):
         return self
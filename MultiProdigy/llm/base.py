@@ -1,8 +1,11 @@
+import asyncio
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from MultiProdigy.plugins import registry
 
 
 class LLMProvider(str, Enum):
@@ -16,10 +19,14 @@ class LLMProvider(str, Enum):
     MOCK = "mock"
 
 
+_BUILTIN_PROVIDERS = tuple(provider.value for provider in LLMProvider)
+
+
 class LLMConfig(BaseModel):
     """Pydantic configuration for LLM clients"""
 
-    provider: LLMProvider
+    # Built-in provider, or the name of an "llm_providers" plugin
+    provider: Union[LLMProvider, str]
     model: str
     api_key: Optional[str] = None
     base_url: Optional[str] = None
@@ -30,6 +37,17 @@ class LLMConfig(BaseModel):
 
     model_config = {"use_enum_values": True}
 
+    @field_validator("provider")
+    @classmethod
+    def _check_provider(cls, value: Union[LLMProvider, str]) -> Union[LLMProvider, str]:
+        name = getattr(value, "value", value)
+        if name not in _BUILTIN_PROVIDERS and ("llm_providers", name) not in registry.plugins:
+            raise ValueError(
+                f"Unsupported provider: {name} (built-in: {', '.join(_BUILTIN_PROVIDERS)};"
+                " or register an 'llm_providers' plugin)"
+            )
+        return value
+
 
 class LLMResponse(BaseModel):
     """Standardized LLM response format"""
@@ -63,6 +81,10 @@ class BaseLLMClient(ABC):
         """Generate embeddings (optional, not all providers support this)"""
         raise NotImplementedError(f"Embeddings not supported by {self.provider}")
 
+    async def close(self) -> None:
+        """Release network sessions or other resources held by the client"""
+        pass
+
     def get_config(self) -> LLMConfig:
         """Get the current configuration"""
         return self.config
@@ -72,3 +94,37 @@ class BaseLLMClient(ABC):
         for key, value in kwargs.items():
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
+
+
+class LoopSessions:
+    """One HTTP session per event loop, built by ``factory`` on first use in that loop.
+
+    aiohttp sessions are bound to the loop that created them, so a client used from
+    the runtime loop and from ``asyncio.run`` gets a session in each.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self._sessions: Dict[asyncio.AbstractEventLoop, Any] = {}
+
+    def get(self) -> Any:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Sessions of loops that are gone cannot be used (or closed) any more
+            for owner in [owner for owner in self._sessions if owner.is_closed()]:
+                del self._sessions[owner]
+            session = self._sessions[loop] = self.factory()
+        return session
+
+    async def close(self) -> None:
+        """Close every session: this loop's here, others on their own loops."""
+        loop = asyncio.get_running_loop()
+        sessions, self._sessions = self._sessions, {}
+        for owner, session in sessions.items():
+            if session.closed or owner.is_closed():
+                continue
+            if owner is loop:
+                await session.close()
+            else:
+                asyncio.run_coroutine_threadsafe(session.close(), owner)
@@ -0,0 +1,184 @@
+"""
+Token-budgeted conversation history for LLM agents.
+
+Keeps per-conversation turns and builds chat payloads that never exceed a token
+budget: the newest turns that fit are sent verbatim, and (with a summarizer
+client) older turns are folded into a cached running summary instead of dropped.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from MultiProdigy.llm.base import BaseLLMClient, LLMResponse
+
+# Fixed per-message cost for role markers and separators in chat formats
+MESSAGE_OVERHEAD = 4
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation so far in a few sentences, keeping names, facts, "
+    "decisions and open questions.\n\n{summary}{transcript}\n\nSummary:"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+class _Conversation:
+    __slots__ = ("turns", "tokens", "summary", "summary_tokens")
+
+    def __init__(self):
+        self.turns: Deque[Tuple[Dict[str, str], int]] = deque()
+        self.tokens = 0
+        self.summary = ""
+        self.summary_tokens = 0
+
+
+class ContextManager:
+    """Per-conversation history trimmed to ``max_tokens`` for ``BaseLLMClient.chat``.
+
+    Without a ``summarizer`` the oldest turns are discarded once they can no longer
+    fit. With one, turns that overflow the budget are summarized in a single call
+    (down to ``fold_ratio`` of the budget, so summaries are not regenerated on every
+    turn) and the summary is sent as a system message ahead of the recent turns.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 3000,
+        system_prompt: Optional[str] = None,
+        summarizer: Optional[BaseLLMClient] = None,
+        fold_ratio: float = 0.5,
+        estimator: Callable[[str], int] = estimate_tokens,
+    ):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.max_tokens = max_tokens
+        self.system_prompt = system_prompt
+        self.summarizer = summarizer
+        self.fold_ratio = fold_ratio
+        self.estimate = estimator
+        self._conversations: Dict[str, _Conversation] = {}
+
+    def _cost(self, text: str) -> int:
+        return self.estimate(text) + MESSAGE_OVERHEAD
+
+    def _budget(self, conversation: _Conversation) -> int:
+        budget = self.max_tokens - conversation.summary_tokens
+        if self.system_prompt:
+            budget -= self._cost(self.system_prompt)
+        return budget
+
+    def _fit(self, text: str, tokens: int, keep_tail: bool = True) -> str:
+        """Longest tail (or head) of ``text`` the estimator puts at ``tokens`` or less."""
+        if self.estimate(text) <= tokens:
+            return text
+        low, high = 0, len(text)  # binary search on the kept length
+        while low < high:
+            middle = (low + high + 1) // 2
+            part = text[len(text) - middle :] if keep_tail else text[:middle]
+            if self.estimate(part) <= tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return text[len(text) - low :] if keep_tail else text[:low]
+
+    def add(self, conversation_id: str, role: str, content: str) -> None:
+        """Append a turn to a conversation."""
+        conversation = self._conversations.setdefault(conversation_id, _Conversation())
+        tokens = self._cost(content)
+        conversation.turns.append(({"role": role, "content": content}, tokens))
+        conversation.tokens += tokens
+        if self.summarizer is None:
+            # Turns beyond the budget can never be sent again
+            budget = self._budget(conversation)
+            while len(conversation.turns) > 1 and conversation.tokens > budget:
+                _, dropped = conversation.turns.popleft()
+                conversation.tokens -= dropped
+
+    def build(self, conversation_id: str) -> List[Dict[str, str]]:
+        """Chat messages for a conversation, newest turns first to claim the budget."""
+        conversation = self._conversations.get(conversation_id) or _Conversation()
+        budget = self._budget(conversation)
+        recent: List[Dict[str, str]] = []
+        for message, tokens in reversed(conversation.turns):
+            if tokens > budget:
+                if not recent and budget > MESSAGE_OVERHEAD:
+                    # The latest turn alone is over budget: keep its tail
+                    content = self._fit(message["content"], budget - MESSAGE_OVERHEAD)
+                    recent.append({**message, "content": content})
+                break
+            recent.append(message)
+            budget -= tokens
+        recent.reverse()
+
+        messages: List[Dict[str, str]] = []
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        if conversation.summary:
+            messages.append({"role": "system", "content": conversation.summary})
+        return messages + recent
+
+    async def prepare(self, conversation_id: str) -> List[Dict[str, str]]:
+        """Fold overflowing turns into the summary if needed, then ``build``."""
+        conversation = self._conversations.get(conversation_id)
+        if (
+            conversation is not None
+            and self.summarizer is not None
+            and conversation.tokens > self._budget(conversation)
+        ):
+            await self._fold(conversation)
+        return self.build(conversation_id)
+
+    async def _fold(self, conversation: _Conversation) -> None:
+        summarizer = self.summarizer
+        if summarizer is None:
+            return
+        target = self._budget(conversation) * self.fold_ratio
+        # Turns stay in the conversation until the summary exists: a failed call loses nothing
+        folded: List[Dict[str, str]] = []
+        remaining = conversation.tokens
+        for message, tokens in list(conversation.turns)[:-1]:
+            if remaining <= target:
+                break
+            remaining -= tokens
+            folded.append(message)
+        if not folded:
+            return
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in folded)
+        previous = f"Earlier summary: {conversation.summary}\n\n" if conversation.summary else ""
+        response = await summarizer.generate(
+            SUMMARY_PROMPT.format(summary=previous, transcript=transcript)
+        )
+        # At most half of what the system prompt leaves, so recent turns always fit too
+        reserved = self._cost(self.system_prompt) if self.system_prompt else 0
+        limit = (self.max_tokens - reserved) // 2 - MESSAGE_OVERHEAD
+        summary = f"Summary of earlier conversation: {response.content.strip()}"
+        for message in folded:
+            # A concurrent fold of the same turns may have removed them already
+            if not conversation.turns or conversation.turns[0][0] is not message:
+                break
+            _, tokens = conversation.turns.popleft()
+            conversation.tokens -= tokens
+        summary = self._fit(summary, limit, keep_tail=False) if limit > 0 else ""
+        conversation.summary = summary
+        conversation.summary_tokens = self._cost(summary) if summary else 0
+
+    async def chat(
+        self, client: BaseLLMClient, conversation_id: str, content: str, **kwargs
+    ) -> LLMResponse:
+        """Record a user turn, call ``client.chat`` with the bounded context, record the reply."""
+        self.add(conversation_id, "user", content)
+        response = await client.chat(await self.prepare(conversation_id), **kwargs)
+        self.add(conversation_id, "assistant", response.content)
+        return response
+
+    def history(self, conversation_id: str) -> List[Dict[str, str]]:
+        """Turns currently retained for a conversation (excluding the summary)."""
+        conversation = self._conversations.get(conversation_id)
+        return [] if conversation is None else [message for message, _ in conversation.turns]
+
+    def clear(self, conversation_id: str) -> None:
+        """Forget a conversation and its summary."""
+        self._conversations.pop(conversation_id, None)
@@ -8,6 +8,7 @@ from typing import Any, Dict, Optional
 from MultiProdigy.llm.api_client import APILLMClient
 from MultiProdigy.llm.base import BaseLLMClient, LLMConfig, LLMProvider
 from MultiProdigy.llm.local_client import HuggingFaceClient, MockClient, OllamaClient
+from MultiProdigy.plugins.registry import plugins
 
 
 class LLMFactory:
@@ -36,6 +37,9 @@ class LLMFactory:
             return HuggingFaceClient(config)
         elif config.provider == LLMProvider.MOCK:
             return MockClient(config)
+        elif ("llm_providers", config.provider) in plugins:
+            # Third-party client class (a BaseLLMClient taking the LLMConfig)
+            return plugins.get("llm_providers", config.provider)(config)
         else:
             raise ValueError(f"Unsupported provider: {config.provider}")
 
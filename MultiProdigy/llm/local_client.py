@@ -3,12 +3,18 @@ Local LLM clients for offline models (Ollama, HuggingFace, etc.)
 """
 
 import asyncio
-import shlex
-import subprocess  # nosec B404 - subprocess needed for local LLM integration
-
 from typing import Dict, List
 
-from MultiProdigy.llm.base import BaseLLMClient, LLMConfig, LLMProvider, LLMResponse
+import aiohttp
+
+from MultiProdigy.llm.base import (
+    BaseLLMClient,
+    LLMConfig,
+    LLMProvider,
+    LLMResponse,
+    LoopSessions,
+)
+
 
 class LocalLLMClient(BaseLLMClient):
     """Base class for local/offline LLM clients"""
@@ -23,11 +29,20 @@ class LocalLLMClient(BaseLLMClient):
 
 
 class OllamaClient(LocalLLMClient):
-    """Ollama local LLM client"""
+    """Ollama local LLM client (HTTP API, one reused session per event loop)"""
 
     def __init__(self, config: LLMConfig):
         super().__init__(config)
-        self.base_url = config.base_url or "http://localhost:11434"
+        self.base_url = (config.base_url or "http://localhost:11434").rstrip("/")
+        self.sessions = LoopSessions(self._new_session)
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        return aiohttp.ClientSession(timeout=timeout)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """HTTP session for the running event loop"""
+        return self.sessions.get()
 
     async def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate text using Ollama"""
@@ -36,41 +51,39 @@ class OllamaClient(LocalLLMClient):
 
     async def chat(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
         """Chat with Ollama model"""
+        payload = {
+            "model": self.config.model,
+            "messages": messages,
+            "stream": False,
+            "options": {
+                "temperature": self.config.temperature,
+                "num_predict": self.config.max_tokens,
+                **self.config.extra_params,
+                **kwargs,
+            },
+        }
         try:
-            # Use subprocess for Ollama CLI
-            prompt = messages[-1]["content"]  # Use last message as prompt
-            # Run in thread pool to avoid blocking with shorter timeout
-            loop = asyncio.get_event_loop()
-
-            # Use asyncio.wait_for for better timeout control
-            # nosec B603 - command is constructed safely with shlex.quote
-            result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: subprocess.run(
-                        cmd,
-                        input=prompt.encode(),
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        timeout=min(self.config.timeout, 10),  # Max 10 seconds for demo
-                ),
-                timeout=15,  # Overall timeout of 15 seconds
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/api/chat", json=payload) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Ollama API error {response.status}: {error_text}")
+                data = await response.json()
+
+            content = data.get("message", {}).get("content", "").strip()
+            if not content:
+                content = "Ollama returned empty response"
+            return LLMResponse(
+                content=content,
+                provider=self.config.provider,
+                model=self.config.model,
+                usage={
+                    "prompt_tokens": data.get("prompt_eval_count", 0),
+                    "completion_tokens": data.get("eval_count", 0),
+                },
+                metadata={"local": True, "method": "http"},
             )
 
-            if result.returncode == 0:
-                content = result.stdout.decode().strip()
-                if not content:
-                    content = "Ollama returned empty response"
-                return LLMResponse(
-                    content=content,
-                    provider=self.config.provider,
-                    model=self.config.model,
-                    metadata={"local": True, "method": "cli"},
-                )
-            else:
-                error = result.stderr.decode().strip()
-                raise Exception(f"Ollama CLI error: {error}")
-
         except asyncio.TimeoutError:
             return LLMResponse(
                 content="❌ Ollama timeout - make sure Ollama is installed and running",
@@ -78,12 +91,12 @@ class OllamaClient(LocalLLMClient):
                 model=self.config.model,
                 metadata={"error": True, "error_message": "timeout"},
             )
-        except FileNotFoundError:
+        except aiohttp.ClientConnectionError:
             return LLMResponse(
-                content="❌ Ollama not found - install from https://ollama.ai",
+                content=f"❌ Ollama not reachable at {self.base_url} - make sure it is running",
                 provider=self.config.provider,
                 model=self.config.model,
-                metadata={"error": True, "error_message": "ollama_not_installed"},
+                metadata={"error": True, "error_message": "ollama_not_running"},
             )
         except Exception as e:
             return LLMResponse(
@@ -93,6 +106,10 @@ class OllamaClient(LocalLLMClient):
                 metadata={"error": True, "error_message": str(e)},
             )
 
+    async def close(self):
+        """Close the HTTP sessions"""
+        await self.sessions.close()
+
 
 class HuggingFaceClient(LocalLLMClient):
     """HuggingFace Transformers local client"""
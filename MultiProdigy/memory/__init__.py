@@ -0,0 +1,3 @@
+from .sqlite_store import SQLiteMemoryStore
+from .store import MemoryRecord, MemoryStore
+from .vector import SemanticMemory, VectorMemory
@@ -0,0 +1,211 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from MultiProdigy.memory.store import MemoryRecord, tokenize
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    importance REAL NOT NULL DEFAULT 1.0,
+    conversation_id TEXT,
+    agent TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memories_conversation ON memories (conversation_id);
+CREATE INDEX IF NOT EXISTS memories_agent ON memories (agent);
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5 (
+    text, content='memories', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+_COLUMNS = "m.id, m.text, m.importance, m.conversation_id, m.agent, m.metadata"
+
+
+class SQLiteMemoryStore:
+    """Persistent MemoryStore backed by SQLite with an FTS5 BM25 index.
+
+    The database runs in WAL mode so several processes can read while one writes,
+    and every connection waits on locks instead of failing. ``add`` commits on its
+    own; wrap bursts in ``with store.batch():`` (or use ``add_many``) to write them
+    in a single transaction. Records carry the owning ``agent`` so one database can
+    be shared by many agents and searched per agent or per conversation.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ".multiprodigy/memory.db",
+        agent: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.agent = agent
+        # Autocommit mode: transactions are opened explicitly in batch()
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.RLock()
+        self._depth = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def batch(self):
+        """Group writes into one transaction (nested batches join the outer one)."""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("COMMIT")
+
+    def add(
+        self,
+        text: str,
+        importance: float = 1.0,
+        conversation_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        agent: Optional[str] = None,
+    ) -> MemoryRecord:
+        """Store a memory for ``agent`` (defaults to the store's agent)."""
+        agent = agent if agent is not None else self.agent
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO memories (text, importance, conversation_id, agent, metadata, created)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (text, importance, conversation_id, agent, json.dumps(metadata or {}), time.time()),
+            )
+            record_id = cursor.lastrowid
+        if record_id is None:
+            raise RuntimeError("SQLite did not report the new memory's id")
+        return MemoryRecord(
+            id=record_id,
+            text=text,
+            importance=importance,
+            conversation_id=conversation_id,
+            agent=agent,
+            metadata=metadata or {},
+        )
+
+    def add_many(self, texts: Iterable[str], **fields: Any) -> List[MemoryRecord]:
+        """Store several memories in one transaction."""
+        with self.batch():
+            return [self.add(text, **fields) for text in texts]
+
+    def append(self, text: str) -> None:
+        """List-style alias for ``add``."""
+        self.add(text)
+
+    def get(self, record_id: int) -> Optional[MemoryRecord]:
+        """Return a memory by id."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM memories m WHERE m.id = ?", (record_id,)
+            ).fetchone()
+        return None if row is None else self._record(row)
+
+    def remove(self, record_id: int) -> None:
+        """Delete a memory and its index entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM memories WHERE id = ?", (record_id,))
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        conversation_id: Optional[str] = None,
+        agent: Optional[str] = None,
+    ) -> List[Tuple[MemoryRecord, float]]:
+        """Return the ``k`` best BM25 matches, optionally scoped to a conversation/agent."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        # Quote every term so user text can never be parsed as FTS5 query syntax
+        match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        sql = (
+            f"SELECT {_COLUMNS}, bm25(memories_fts) AS score FROM memories_fts"
+            " JOIN memories m ON m.id = memories_fts.rowid WHERE memories_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if conversation_id is not None:
+            sql += " AND m.conversation_id = ?"
+            params.append(conversation_id)
+        agent = agent if agent is not None else self.agent
+        if agent is not None:
+            sql += " AND m.agent = ?"
+            params.append(agent)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(k)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        # FTS5's bm25() is negated so that smaller is better; flip it back
+        return [(self._record(row[:-1]), -row[-1]) for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _record(row: tuple) -> MemoryRecord:
+        record_id, text, importance, conversation_id, agent, metadata = row
+        return MemoryRecord(
+            id=record_id,
+            text=text,
+            importance=importance,
+            conversation_id=conversation_id,
+            agent=agent,
+            metadata=json.loads(metadata),
+        )
+
+    def _scope(self) -> Tuple[str, tuple]:
+        if self.agent is None:
+            return "", ()
+        return " WHERE agent = ?", (self.agent,)
+
+    def __contains__(self, text: object) -> bool:
+        where, params = self._scope()
+        clause = " AND text = ?" if where else " WHERE text = ?"
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM memories{where}{clause} LIMIT 1", params + (text,)
+            ).fetchone()
+        return row is not None
+
+    def __iter__(self) -> Iterator[str]:
+        where, params = self._scope()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT text FROM memories{where} ORDER BY id", params
+            ).fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        where, params = self._scope()
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM memories{where}", params).fetchone()[0]
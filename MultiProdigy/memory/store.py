@@ -0,0 +1,299 @@
+import heapq
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for indexing and queries."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class MemoryRecord(BaseModel):
+    """One stored memory."""
+
+    id: int
+    text: str
+    importance: float = 1.0
+    conversation_id: Optional[str] = None
+    agent: Optional[str] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class MemoryStore:
+    """Bounded in-memory store with a BM25-ranked inverted index.
+
+    When ``capacity`` is reached the store evicts either the least recently used
+    memory (``policy="lru"``) or the least important one (``policy="importance"``,
+    ties broken by age). Search only visits the postings of the query terms, and
+    of the requested agent or conversation when scoped. Terms are scored rarest
+    first (MaxScore): once the terms left could not lift an unseen record into the
+    top ``k``, they only update records already found.
+    """
+
+    POLICIES = ("lru", "importance")
+
+    def __init__(
+        self, capacity: int = 10_000, policy: str = "lru", k1: float = 1.2, b: float = 0.75
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.k1 = k1
+        self.b = b
+        self.records: "OrderedDict[int, MemoryRecord]" = OrderedDict()
+        # term -> {record id: term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        # ("agent" | "conversation", name) -> postings of that scope's records only
+        self.scoped: Dict[Tuple[str, str], Dict[str, Dict[int, int]]] = {}
+        # term -> (highest tf, shortest record): bounds its BM25 score for MaxScore.
+        # Not tightened on removal; a loose bound only prunes less
+        self.bounds: Dict[str, Tuple[int, int]] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        self._next_id = 0
+        self._importance_heap: List[Tuple[float, int]] = []
+        self._lock = threading.RLock()
+
+    def add(
+        self,
+        text: str,
+        importance: float = 1.0,
+        conversation_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        agent: Optional[str] = None,
+    ) -> MemoryRecord:
+        """Store a memory (owned by ``agent``), evicting one first if the store is full."""
+        with self._lock:
+            while len(self.records) >= self.capacity:
+                self._evict()
+            record = MemoryRecord(
+                id=self._next_id,
+                text=text,
+                importance=importance,
+                conversation_id=conversation_id,
+                agent=agent,
+                metadata=metadata or {},
+            )
+            self._next_id += 1
+            self.records[record.id] = record
+            self._index(record)
+            if self.policy == "importance":
+                heapq.heappush(self._importance_heap, (importance, record.id))
+                if len(self._importance_heap) > 2 * len(self.records) + 64:
+                    self._importance_heap = [
+                        (r.importance, r.id) for r in self.records.values()
+                    ]
+                    heapq.heapify(self._importance_heap)
+            return record
+
+    def append(self, text: str) -> None:
+        """List-style alias for ``add``."""
+        self.add(text)
+
+    def get(self, record_id: int) -> Optional[MemoryRecord]:
+        """Return a memory by id, marking it as recently used."""
+        with self._lock:
+            record = self.records.get(record_id)
+            if record is not None:
+                self.records.move_to_end(record_id)
+            return record
+
+    def remove(self, record_id: int) -> None:
+        """Delete a memory and its index entries."""
+        with self._lock:
+            record = self.records.pop(record_id, None)
+            if record is not None:
+                self._unindex(record)
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        conversation_id: Optional[str] = None,
+        agent: Optional[str] = None,
+    ) -> List[Tuple[MemoryRecord, float]]:
+        """Return the ``k`` best BM25 matches for ``query`` with their scores."""
+        with self._lock:
+            terms = set(tokenize(query))
+            n_docs = len(self.records)
+            if not terms or not n_docs or k <= 0:
+                return []
+            avg_length = self.total_length / n_docs
+            k1, b = self.k1, self.b
+            base, scale = k1 * (1 - b), k1 * b / avg_length
+            lengths = self.doc_lengths
+            records = self.records
+            # Scoped queries walk the scope's postings; idf stays global so scores compare
+            owner = None
+            if conversation_id is not None:
+                index = self.scoped.get(("conversation", conversation_id), {})
+                owner = agent
+            elif agent is not None:
+                index = self.scoped.get(("agent", agent), {})
+            else:
+                index = self.postings
+            plan = []
+            for term in terms:
+                postings = index.get(term)
+                if not postings:
+                    continue
+                df = len(self.postings[term])
+                weight = math.log(1 + (n_docs - df + 0.5) / (df + 0.5)) * (k1 + 1)
+                max_tf, min_length = self.bounds[term]
+                bound = weight * max_tf / (max_tf + base + scale * min_length)
+                plan.append((bound, weight, postings))
+            plan.sort(key=lambda item: item[0], reverse=True)
+
+            remaining = sum(item[0] for item in plan)
+            scores: Dict[int, float] = {}
+            essential = True
+            for bound, weight, postings in plan:
+                if essential and len(scores) >= k:
+                    # An unseen record scores at most `remaining` from here on
+                    essential = remaining >= heapq.nlargest(k, scores.values())[-1]
+                remaining -= bound
+                if essential:
+                    for record_id, tf in postings.items():
+                        if owner is not None and records[record_id].agent != owner:
+                            continue
+                        partial = weight * tf / (tf + base + scale * lengths[record_id])
+                        scores[record_id] = scores.get(record_id, 0.0) + partial
+                elif len(postings) < len(scores):
+                    for record_id, tf in postings.items():
+                        if record_id in scores:
+                            partial = weight * tf / (tf + base + scale * lengths[record_id])
+                            scores[record_id] += partial
+                else:
+                    for record_id in scores:
+                        tf = postings.get(record_id, 0)
+                        if tf:
+                            partial = weight * tf / (tf + base + scale * lengths[record_id])
+                            scores[record_id] += partial
+
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            for record_id, _ in best:
+                self.records.move_to_end(record_id)
+            return [(self.records[record_id], score) for record_id, score in best]
+
+    def snapshot(self) -> Dict[Any, Any]:
+        """Checkpoint entries: one per record plus the id counter."""
+        with self._lock:
+            state: Dict[Any, Any] = {
+                ("record", record.id): (
+                    record.text,
+                    record.importance,
+                    record.conversation_id,
+                    record.agent,
+                    record.metadata,
+                )
+                for record in self.records.values()
+            }
+            # Stored, not derived from the records: evicted ids must never be reused
+            state["next_id"] = self._next_id
+            return state
+
+    def restore(self, state: Dict[Any, Any]) -> None:
+        """Replace the contents with a ``snapshot`` (records come back oldest first)."""
+        with self._lock:
+            self.records.clear()
+            self.postings.clear()
+            self.scoped.clear()
+            self.bounds.clear()
+            self.doc_lengths.clear()
+            self.total_length = 0
+            keys = sorted(key[1] for key in state if isinstance(key, tuple))
+            for record_id in keys:
+                text, importance, conversation_id, agent, metadata = state[("record", record_id)]
+                # Checkpointed fields were validated when first stored
+                record = MemoryRecord.model_construct(
+                    id=record_id,
+                    text=text,
+                    importance=importance,
+                    conversation_id=conversation_id,
+                    agent=agent,
+                    metadata=metadata,
+                )
+                self.records[record_id] = record
+                self._index(record)
+            self._next_id = state.get("next_id", max(self.records, default=-1) + 1)
+            self._importance_heap = [(r.importance, r.id) for r in self.records.values()]
+            heapq.heapify(self._importance_heap)
+
+    def _index(self, record: MemoryRecord) -> None:
+        tokens = tokenize(record.text)
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        length = len(tokens)
+        indexes = [self.postings]
+        for scope in self._scopes(record):
+            indexes.append(self.scoped.setdefault(scope, {}))
+        for term, tf in counts.items():
+            for index in indexes:
+                index.setdefault(term, {})[record.id] = tf
+            max_tf, min_length = self.bounds.get(term, (tf, length))
+            self.bounds[term] = (max(max_tf, tf), min(min_length, length))
+        self.doc_lengths[record.id] = length
+        self.total_length += len(tokens)
+
+    def _unindex(self, record: MemoryRecord) -> None:
+        terms = set(tokenize(record.text))
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(record.id, None)
+                if not postings:
+                    del self.postings[term]
+                    self.bounds.pop(term, None)
+        for scope in self._scopes(record):
+            index = self.scoped.get(scope)
+            if index is None:
+                continue
+            for term in terms:
+                postings = index.get(term)
+                if postings is not None:
+                    postings.pop(record.id, None)
+                    if not postings:
+                        del index[term]
+            if not index:
+                del self.scoped[scope]
+        self.total_length -= self.doc_lengths.pop(record.id, 0)
+
+    @staticmethod
+    def _scopes(record: MemoryRecord) -> List[Tuple[str, str]]:
+        scopes = []
+        if record.agent is not None:
+            scopes.append(("agent", record.agent))
+        if record.conversation_id is not None:
+            scopes.append(("conversation", record.conversation_id))
+        return scopes
+
+    def _evict(self) -> None:
+        if self.policy == "importance":
+            # Heap entries for already-removed records are skipped lazily
+            while self._importance_heap:
+                _, record_id = heapq.heappop(self._importance_heap)
+                if record_id in self.records:
+                    self.remove(record_id)
+                    return
+        record_id = next(iter(self.records))
+        self.remove(record_id)
+
+    def __contains__(self, text: object) -> bool:
+        return any(record.text == text for record in self.records.values())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([record.text for record in self.records.values()])
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from MultiProdigy.llm.base import BaseLLMClient
+
+
+class VectorMemory:
+    """Embedding matrix with batched cosine top-k search.
+
+    Rows are L2-normalised float32 vectors in one contiguous matrix that grows
+    geometrically, so appends are amortised O(1) and a search is a single matrix
+    product followed by ``argpartition``. ``save`` writes a ``.npy`` file (plus a JSON
+    sidecar with texts/metadata) that ``load`` memory-maps, so large memories open
+    instantly and are paged in as searches touch them.
+    """
+
+    def __init__(self, dim: int, initial_capacity: int = 1024):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("VectorMemory requires numpy. Install with: pip install numpy")
+        self.dim = dim
+        self.size = 0
+        self.texts: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self._matrix = np.empty((max(initial_capacity, 1), dim), dtype=np.float32)
+
+    @property
+    def vectors(self) -> "np.ndarray":
+        """View of the stored (normalised) vectors."""
+        return self._matrix[: self.size]
+
+    @staticmethod
+    def _normalise(vectors: "np.ndarray") -> "np.ndarray":
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, needed: int) -> None:
+        capacity = self._matrix.shape[0]
+        # Loaded matrices are read-only memory maps; copy them out on the first append
+        in_memory = self._matrix.flags.writeable and not isinstance(self._matrix, np.memmap)
+        if needed <= capacity and in_memory:
+            return
+        new_capacity = max(needed, capacity * 2)
+        grown = np.empty((new_capacity, self.dim), dtype=np.float32)
+        grown[: self.size] = self._matrix[: self.size]
+        self._matrix = grown
+
+    def add(
+        self,
+        vectors: Sequence[Sequence[float]],
+        texts: Optional[Sequence[str]] = None,
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> List[int]:
+        """Append a batch of vectors; returns their row indices."""
+        batch = np.asarray(vectors, dtype=np.float32)
+        if batch.ndim == 1:
+            batch = batch[None, :]
+        if batch.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {batch.shape[1]}")
+        count = batch.shape[0]
+        self._reserve(self.size + count)
+        self._matrix[self.size : self.size + count] = self._normalise(batch)
+        self.texts.extend(texts if texts is not None else [""] * count)
+        self.metadata.extend(metadata if metadata is not None else [{} for _ in range(count)])
+        start, self.size = self.size, self.size + count
+        return list(range(start, self.size))
+
+    def search(
+        self, queries: Sequence[Sequence[float]], k: int = 5
+    ) -> List[List[Tuple[int, float]]]:
+        """Return the ``k`` most similar rows (index, cosine score) for each query."""
+        batch = np.asarray(queries, dtype=np.float32)
+        if batch.ndim == 1:
+            batch = batch[None, :]
+        if self.size == 0:
+            return [[] for _ in range(batch.shape[0])]
+        k = min(k, self.size)
+        scores = self._normalise(batch) @ self.vectors.T
+        if k < self.size:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(self.size), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [(int(i), float(s)) for i, s in zip(row_idx, row_scores)]
+            for row_idx, row_scores in zip(top, top_scores)
+        ]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write vectors to ``path`` (.npy) and texts/metadata to a JSON sidecar."""
+        path = Path(path).with_suffix(".npy")
+        np.save(path, self.vectors)
+        sidecar = {"dim": self.dim, "texts": self.texts, "metadata": self.metadata}
+        path.with_suffix(".json").write_text(json.dumps(sidecar), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "VectorMemory":
+        """Open a saved memory; with ``mmap`` the vectors are paged in lazily."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("VectorMemory requires numpy. Install with: pip install numpy")
+        path = Path(path).with_suffix(".npy")
+        sidecar = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        memory = cls.__new__(cls)
+        memory.dim = sidecar["dim"]
+        memory.texts = sidecar["texts"]
+        memory.metadata = sidecar["metadata"]
+        # Read-only mapping; the first add copies it into a growable in-memory matrix
+        memory._matrix = np.load(path, mmap_mode="r" if mmap else None)
+        memory.size = memory._matrix.shape[0]
+        return memory
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class SemanticMemory:
+    """VectorMemory fed by an LLM client's ``embed`` for text-in, text-out recall."""
+
+    def __init__(
+        self, embedder: "BaseLLMClient", dim: int, memory: Optional[VectorMemory] = None
+    ):
+        self.embedder = embedder
+        self.memory = memory if memory is not None else VectorMemory(dim)
+
+    async def add(
+        self, texts: Sequence[str], metadata: Optional[Sequence[Dict]] = None
+    ) -> List[int]:
+        """Embed and store a batch of texts."""
+        vectors = await self.embedder.embed(list(texts))
+        return self.memory.add(vectors, texts=list(texts), metadata=metadata)
+
+    async def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return the ``k`` stored texts most similar to ``query``."""
+        (vector,) = await self.embedder.embed([query])
+        hits = self.memory.search([vector], k)[0]
+        return [(self.memory.texts[i], score) for i, score in hits]
@@ -3,7 +3,7 @@ import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 class AgentTracer:
@@ -49,8 +49,15 @@ class AgentTracer:
         self._write_log(trace_data)
         del self.current_traces[trace_id]
 
-    def log_message_event(self, sender: str, receiver: str, content: str, message_id: str = None):
-        """Log a message passing event"""
+    def log_message_event(
+        self,
+        sender: str,
+        receiver: str,
+        content: str,
+        message_id: Optional[str] = None,
+        attachments: Optional[List[str]] = None,
+    ):
+        """Log a message passing event (attachments are logged by digest only)"""
         event_data = {
             "event_type": "message_sent",
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -60,10 +67,22 @@ class AgentTracer:
             "content_length": len(content),
             "content_preview": content[:100] + "..." if len(content) > 100 else content,
         }
+        if attachments:
+            event_data["attachments"] = attachments
 
         self._write_log(event_data)
         return event_data["message_id"]
 
+    def flush(self, reason: str = "interrupted") -> int:
+        """End every open trace with ``reason`` as its error; returns how many.
+
+        Called on shutdown so traces of cancelled work are not left open.
+        """
+        open_traces = list(self.current_traces)
+        for trace_id in open_traces:
+            self.end_trace(trace_id, error=reason)
+        return len(open_traces)
+
     def _write_log(self, data: Dict[str, Any]):
         """Write log entry to file"""
         try:
@@ -0,0 +1,144 @@
+import importlib
+import threading
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any, Dict, List, Optional
+
+# Plugin kind -> entry point group scanned for third-party plugins
+ENTRY_POINT_GROUPS = {
+    "agents": "multiprodigy.agents",
+    "llm_providers": "multiprodigy.llm_providers",
+}
+
+BUILTIN_PLUGINS = {
+    "agents": {
+        "echo": "MultiProdigy.agents.echo_agent:EchoAgent",
+        "memory": "MultiProdigy.agents.memory_agent:MemoryAgent",
+        "llm": "MultiProdigy.agents.llm_agent:LLMAgent",
+        "ollama": "MultiProdigy.agents.ollama_agent:OllamaAgent",
+        "task_manager": "MultiProdigy.agents.task_manager_agent:TaskManagerAgent",
+        "user": "MultiProdigy.agents.user_agent:UserAgent",
+    },
+    "llm_providers": {},
+}
+
+
+def import_object(path: str) -> Any:
+    """Import ``package.module:attr`` (or ``package.module.attr``)."""
+    module_name, sep, attr = path.partition(":")
+    if not sep:
+        module_name, _, attr = path.rpartition(".")
+    if not module_name or not attr:
+        raise ValueError(f"Not an import path: {path}")
+    obj = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class Plugin:
+    """A named plugin whose module is imported on first ``load``."""
+
+    __slots__ = ("kind", "name", "target", "source", "_obj", "_loaded")
+
+    def __init__(self, kind: str, name: str, target: Any, source: str):
+        self.kind = kind
+        self.name = name
+        # Import path, importlib EntryPoint, or the object itself
+        self.target = target
+        self.source = source
+        self._loaded = not isinstance(target, (str, EntryPoint))
+        self._obj = target if self._loaded else None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> Any:
+        if not self._loaded:
+            if isinstance(self.target, str):
+                self._obj = import_object(self.target)
+            else:
+                self._obj = self.target.load()
+            self._loaded = True
+        return self._obj
+
+
+class PluginRegistry:
+    """Agent classes and LLM clients by name, from built-ins, entry points or ``register``.
+
+    Only names are collected up front: installed packages are scanned for entry
+    points (metadata only) the first time a name is looked up, and a plugin's
+    module is imported when that plugin is first used. Import and startup cost
+    therefore do not grow with the number of installed plugins.
+
+    Third-party packages publish plugins in their packaging metadata::
+
+        [project.entry-points."multiprodigy.agents"]
+        summarizer = "my_package.agents:SummarizerAgent"
+    """
+
+    def __init__(
+        self,
+        groups: Optional[Dict[str, str]] = None,
+        builtins: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.groups = dict(ENTRY_POINT_GROUPS if groups is None else groups)
+        self._plugins: Dict[str, Dict[str, Plugin]] = {kind: {} for kind in self.groups}
+        for kind, entries in (BUILTIN_PLUGINS if builtins is None else builtins).items():
+            for name, target in entries.items():
+                self._plugins.setdefault(kind, {})[name] = Plugin(kind, name, target, "builtin")
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, name: str, target: Any) -> None:
+        """Add a plugin: an object, or an import path loaded on first use."""
+        with self._lock:
+            self._plugins.setdefault(kind, {})[name] = Plugin(kind, name, target, "register")
+
+    def discover(self, refresh: bool = False) -> None:
+        """Collect entry points of installed packages (without importing them)."""
+        with self._lock:
+            if self._discovered and not refresh:
+                return
+            found = entry_points()
+            for kind, group in self.groups.items():
+                if hasattr(found, "select"):
+                    group_entries = found.select(group=group)
+                else:  # Python < 3.10
+                    group_entries = found.get(group, ())  # type: ignore[arg-type]
+                plugins = self._plugins.setdefault(kind, {})
+                for ep in group_entries:
+                    # Explicit registrations and built-ins win over installed packages
+                    if ep.name not in plugins or plugins[ep.name].source == "entry_point":
+                        plugins[ep.name] = Plugin(kind, ep.name, ep, "entry_point")
+            self._discovered = True
+
+    def plugin(self, kind: str, name: str) -> Plugin:
+        plugin = self._plugins.get(kind, {}).get(name)
+        if plugin is None:
+            self.discover()
+            plugin = self._plugins.get(kind, {}).get(name)
+        if plugin is None:
+            raise KeyError(f"No {kind} plugin named '{name}'")
+        return plugin
+
+    def get(self, kind: str, name: str) -> Any:
+        """Load (importing on first use) and return a plugin."""
+        return self.plugin(kind, name).load()
+
+    def __contains__(self, key) -> bool:
+        kind, name = key
+        try:
+            self.plugin(kind, name)
+        except KeyError:
+            return False
+        return True
+
+    def names(self, kind: str) -> List[str]:
+        """Names of all plugins of ``kind``; nothing is imported."""
+        self.discover()
+        return sorted(self._plugins.get(kind, {}))
+
+
+# Process-wide registry used by Runtime and LLMFactory
+plugins = PluginRegistry()
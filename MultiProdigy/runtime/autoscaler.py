@@ -0,0 +1,159 @@
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Autoscaler:
+    """Grows and shrinks the replica pool behind one logical agent name.
+
+    Every ``interval`` seconds it reads the pool's outstanding messages (in-flight
+    plus queued behind ``max_tasks``) and the mean handler latency since the last
+    check. Load above ``scale_up_depth`` per replica (or latency above
+    ``target_latency``) for ``sustain`` consecutive checks adds replicas; load below
+    ``scale_down_depth`` retires one. The gap between the two thresholds and the
+    ``cooldown`` after every change keep the pool from oscillating.
+
+    ``factory(name, bus)`` builds a replica, e.g. an agent class.
+    """
+
+    def __init__(
+        self,
+        bus,
+        group: str,
+        factory: Callable,
+        min_replicas: int = 1,
+        max_replicas: int = 8,
+        scale_up_depth: float = 4.0,
+        scale_down_depth: float = 1.0,
+        target_latency: Optional[float] = None,
+        sustain: int = 2,
+        cooldown: float = 10.0,
+        interval: float = 1.0,
+        strategy: str = "least_outstanding",
+    ):
+        if not 0 < min_replicas <= max_replicas:
+            raise ValueError("Need 0 < min_replicas <= max_replicas")
+        if scale_down_depth >= scale_up_depth:
+            raise ValueError("scale_down_depth must be below scale_up_depth")
+        self.bus = bus
+        self.group = group
+        self.factory = factory
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+        self.scale_up_depth = scale_up_depth
+        self.scale_down_depth = scale_down_depth
+        self.target_latency = target_latency
+        self.sustain = sustain
+        self.cooldown = cooldown
+        self.interval = interval
+        self.strategy = strategy
+        # (timestamp, replicas before, replicas after, reason)
+        self.events: List[Tuple[float, int, int, str]] = []
+        self._names = itertools.count(1)
+        self._last_change = float("-inf")
+        self._pressure = 0  # consecutive checks over (+) or under (-) the thresholds
+        self._totals: Dict[str, Tuple[int, float]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        while self.replicas < min_replicas:
+            self._spawn()
+
+    @property
+    def replicas(self) -> int:
+        pool = self.bus.replica_groups.get(self.group)
+        return 0 if pool is None else len(pool)
+
+    def _spawn(self) -> None:
+        pool = self.bus.replica_groups.get(self.group)
+        while True:
+            name = f"{self.group}-{next(self._names)}"
+            if name not in self.bus.agents:
+                break
+        agent = self.factory(name, self.bus)
+        self.bus.register_replica(agent, self.group, strategy=None if pool else self.strategy)
+
+    def _retire(self) -> None:
+        metrics = self.bus.replica_metrics(self.group)
+        # Messages already routed to it (or queued for it) still complete
+        name = min(metrics, key=lambda n: metrics[n]["outstanding"])
+        self.bus.unregister(name)
+        self._totals.pop(name, None)
+
+    def _recent_latency(self, metrics: Dict[str, Dict]) -> Optional[float]:
+        """Mean handler latency of the messages completed since the previous check."""
+        completed = busy = 0.0
+        for name, m in metrics.items():
+            total_busy = m["avg_latency"] * m["completed"]
+            prev_completed, prev_busy = self._totals.get(name, (0, 0.0))
+            completed += m["completed"] - prev_completed
+            busy += total_busy - prev_busy
+            self._totals[name] = (m["completed"], total_busy)
+        return busy / completed if completed else None
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Evaluate load once and scale if warranted; returns the replica count."""
+        now = time.monotonic() if now is None else now
+        metrics = self.bus.replica_metrics(self.group) if self.replicas else {}
+        replicas = max(len(metrics), 1)
+        outstanding = sum(m["outstanding"] for m in metrics.values())
+        depth = outstanding / replicas
+        latency = self._recent_latency(metrics)
+        target = self.target_latency
+        slow = target is not None and latency is not None and latency > target
+        over = depth > self.scale_up_depth or slow
+        under = depth < self.scale_down_depth and not slow
+
+        if over:
+            self._pressure = max(self._pressure, 0) + 1
+        elif under:
+            self._pressure = min(self._pressure, 0) - 1
+        else:
+            self._pressure = 0
+
+        before = self.replicas
+        if now - self._last_change < self.cooldown or abs(self._pressure) < self.sustain:
+            return before
+        if self._pressure > 0 and before < self.max_replicas:
+            # Jump straight to the size that brings depth back under the threshold
+            wanted = max(before + 1, math.ceil(outstanding / self.scale_up_depth))
+            for _ in range(min(wanted, self.max_replicas) - before):
+                self._spawn()
+            reason = f"depth {depth:.1f}/replica" + (f", latency {latency:.3f}s" if slow else "")
+        elif self._pressure < 0 and before > self.min_replicas:
+            self._retire()
+            reason = f"depth {depth:.1f}/replica"
+        else:
+            return before
+
+        after = self.replicas
+        self.events.append((now, before, after, reason))
+        self._last_change = now
+        self._pressure = 0
+        print(f"[Autoscaler] {self.group}: {before} -> {after} replicas ({reason})")
+        return after
+
+    def start(self) -> None:
+        """Run ``tick`` every ``interval`` seconds on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"autoscaler-{self.group}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"[Autoscaler] {self.group}: check failed: {e}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background checks (replicas are left in place)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from MultiProdigy.storage.checkpoint import CheckpointStore
+
+
+class Checkpointer:
+    """Periodically checkpoints every stateful agent on a bus and restores them.
+
+    Agents opt in by overriding ``BaseAgent.snapshot``/``restore``. Call
+    ``restore_all`` once the agents are registered (before traffic starts) and
+    ``start`` to checkpoint every ``interval`` seconds; ``stop`` takes a final one.
+    """
+
+    def __init__(self, bus, store: Optional[CheckpointStore] = None, interval: float = 30.0):
+        self.bus = bus
+        self.store = store if store is not None else CheckpointStore()
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _agents(self, agents: Optional[Iterable] = None):
+        agents = list(self.bus.agents.values()) if agents is None else agents
+        return [agent for agent in agents if hasattr(agent, "snapshot")]
+
+    def checkpoint_all(self, agents: Optional[Iterable] = None) -> Dict[str, str]:
+        """Checkpoint agents now; returns agent name -> "full"/"delta"/"unchanged"."""
+        results = {}
+        for agent in self._agents(agents):
+            try:
+                state = agent.snapshot()
+                if state is not None:
+                    results[agent.name] = self.store.save(agent.name, state)
+            except Exception as e:
+                print(f"[Checkpointer] Failed to checkpoint {agent.name}: {e}")
+        return results
+
+    def restore_all(self, agents: Optional[Iterable] = None) -> Dict[str, float]:
+        """Reload every agent that has a checkpoint, then ``start`` them.
+
+        Returns the seconds spent restoring each agent.
+        """
+        timings = {}
+        restored = []
+        for agent in self._agents(agents):
+            started = time.perf_counter()
+            state = self.store.load(agent.name)
+            if state is None:
+                continue
+            agent.restore(state)
+            restored.append(agent)
+            timings[agent.name] = time.perf_counter() - started
+            print(f"[Checkpointer] Restored {agent.name} in {timings[agent.name]:.3f}s")
+        # Every agent is restored before any of them resumes sending
+        for agent in restored:
+            start = getattr(agent, "start", None)
+            if start is not None:
+                start()
+        return timings
+
+    def start(self) -> None:
+        """Checkpoint every ``interval`` seconds on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="checkpointer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.checkpoint_all()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the periodic checkpoints and take a final one."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.checkpoint_all()
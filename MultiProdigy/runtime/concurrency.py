@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class ConcurrencyLimiter:
+    """Caps the number of in-flight messages for one agent and queues the excess.
+
+    A handler's slot is held until it returns or, for coroutine handlers, until the
+    returned task/future completes. Queued messages are delivered in arrival order
+    as slots free up. When a slot frees on an event loop (an async handler
+    finished), the queue is drained on the limiter's own thread instead, since the
+    next queued handler may be synchronous and would otherwise block the loop.
+    """
+
+    def __init__(self, max_tasks: int):
+        if max_tasks <= 0:
+            raise ValueError("max_tasks must be positive")
+        self.max_tasks = max_tasks
+        self.in_flight = 0
+        self.queue: Deque[Tuple[Callable[[Any], Any], Any]] = deque()
+        self.completed = 0
+        self.peak_queued = 0
+        self.busy_seconds = 0.0
+        # Futures of async handlers still running, so shutdown can cancel them
+        self._running: Set[Any] = set()
+        self._created = time.perf_counter()
+        self._lock = threading.Lock()
+        # Drains the queue off the event loop; started the first time it is needed
+        self._drainer: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, handler: Callable[[Any], Any], message: Any) -> None:
+        """Deliver ``message`` to ``handler`` now, or queue it if the agent is saturated.
+
+        If the handler raises while delivering this message synchronously, the error
+        propagates here (after the queue is drained), as it would without a cap.
+        """
+        # The handler travels with its message: the bus wraps it per delivery
+        entry = (handler, message)
+        with self._lock:
+            self.queue.append(entry)
+            if len(self.queue) > self.peak_queued:
+                self.peak_queued = len(self.queue)
+        self._drain(entry)
+
+    def _drain(self, own=None) -> None:
+        error = None
+        while True:
+            with self._lock:
+                if not self.queue or self.in_flight >= self.max_tasks:
+                    break
+                entry = self.queue.popleft()
+                self.in_flight += 1
+            try:
+                self._start(*entry)
+            except Exception as e:
+                # One failing handler must not strand the messages queued behind it
+                if entry is own:
+                    error = e
+                else:
+                    receiver = getattr(entry[1], "receiver", "agent")
+                    print(f"[Limiter] Handler for {receiver} failed: {e}")
+        if error is not None:
+            raise error
+
+    def _start(self, handler: Callable[[Any], Any], message: Any) -> None:
+        started = time.perf_counter()
+        try:
+            result = handler(message)
+        except Exception:
+            self._finish(started)
+            raise
+        if hasattr(result, "add_done_callback"):
+            with self._lock:
+                self._running.add(result)
+            result.add_done_callback(lambda done: self._on_done(started, done))
+        else:
+            self._finish(started)
+
+    def _on_done(self, started: float, done=None) -> None:
+        with self._lock:
+            self._running.discard(done)
+        self._finish(started)
+        if self.queue and _on_event_loop():
+            with self._lock:
+                if self._drainer is None:
+                    self._drainer = ThreadPoolExecutor(1, thread_name_prefix="limiter")
+            self._drainer.submit(self._drain)
+        else:
+            self._drain()
+
+    def cancel(self, on_drop: Optional[Callable[[Any], Any]] = None) -> int:
+        """Drop queued messages and cancel running async handlers; returns how many.
+
+        Coroutines see ``CancelledError`` at their next ``await``. ``on_drop`` is
+        called with each queued message that is dropped.
+        """
+        with self._lock:
+            dropped = [message for _, message in self.queue]
+            self.queue.clear()
+            running = list(self._running)
+        if on_drop is not None:
+            for message in dropped:
+                on_drop(message)
+        for future in running:
+            if isinstance(future, asyncio.Future):
+                future.get_loop().call_soon_threadsafe(future.cancel)
+            else:
+                future.cancel()
+        return len(dropped) + len(running)
+
+    def _finish(self, started: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.busy_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load: in-flight, queued and how busy the agent's slots have been."""
+        with self._lock:
+            capacity_seconds = (time.perf_counter() - self._created) * self.max_tasks
+            return {
+                "max_tasks": self.max_tasks,
+                "in_flight": self.in_flight,
+                "queued": len(self.queue),
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "utilisation": self.in_flight / self.max_tasks,
+                "avg_utilisation": self.busy_seconds / capacity_seconds if capacity_seconds else 0.0,
+            }
@@ -1,13 +1,19 @@
-from MultiProdigy.agents.echo_agent import EchoAgent
-from MultiProdigy.agents.ollama_agent import OllamaAgent
+from typing import Optional
+
 from MultiProdigy.bus.message_bus import MessageBus
+from MultiProdigy.runtime.runtime import Runtime
 
+DEFAULT_SPEC = {
+    "agents": [
+        {"name": "echo_agent", "type": "echo"},
+        # Built on first use so startup does not wait for the model server
+        {"name": "ollama_agent", "type": "ollama", "lazy": True},
+    ]
+}
 
-class RuntimeEngine:
-    def __init__(self):
-        self.bus = MessageBus()
 
-        self.agents = {"ollama_agent": OllamaAgent(), "echo_agent": EchoAgent()}
+class RuntimeEngine(Runtime):
+    """Runtime with the default echo + Ollama topology."""
 
-        for name, agent in self.agents.items():
-            self.bus.subscribe(name, agent.handle_message)
+    def __init__(self, spec=None, bus: Optional[MessageBus] = None):
+        super().__init__(spec if spec is not None else DEFAULT_SPEC, bus)
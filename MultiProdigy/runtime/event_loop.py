@@ -0,0 +1,76 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Coroutine, Optional
+
+
+class RuntimeLoop:
+    """Background asyncio event loop that runs coroutine agent handlers.
+
+    The loop thread is started on first use, so purely synchronous agent graphs
+    never pay for it. Coroutines can be submitted from any thread.
+    """
+
+    def __init__(self, name: str = "multiprodigy-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running event loop, started on first access."""
+        loop = self._loop
+        if loop is None:
+            self.start()
+            loop = self._loop
+            if loop is None:
+                raise RuntimeError(f"{self.name} was stopped while starting")
+        return loop
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the loop thread if it is not running yet."""
+        with self._lock:
+            if self.is_running:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+
+    def in_loop_thread(self) -> bool:
+        """True when called from the loop's own thread."""
+        return self._thread is threading.current_thread()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop and return a thread-safe future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        with self._lock:
+            if self._loop is None or self._thread is None:
+                return
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+# Global runtime loop shared by agents unless a runtime assigns its own
+runtime_loop = RuntimeLoop()
@@ -0,0 +1,223 @@
+import inspect
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from MultiProdigy.runtime.event_loop import runtime_loop
+from MultiProdigy.schemas.message import Message
+
+
+class LazyAgent:
+    """Stand-in registered on the bus that builds the real agent on first delivery.
+
+    ``factory(name, bus)`` runs on a background thread (or inline with
+    ``background=False``); messages that arrive meanwhile are buffered and handed
+    over in order once it is ready. Each buffered delivery returns a Future that
+    completes when the real agent has handled the message, so concurrency caps
+    and replica metrics still see it as outstanding.
+
+    With ``idle_timeout`` the agent is dropped after that many idle seconds and
+    rebuilt on the next message. Its ``snapshot`` is taken on eviction (saved to
+    ``store`` if given, else kept in memory) and restored on rebuild, and its
+    ``close`` (sync or async) has finished before it is dropped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bus,
+        factory: Callable[[str, Any], Any],
+        idle_timeout: Optional[float] = None,
+        config=None,
+        store=None,
+        background: bool = True,
+    ):
+        self.name = name
+        self.bus = bus
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self.config = config
+        self.store = store
+        self.background = background
+        self.agent: Any = None
+        self.state = "cold"  # cold -> building -> ready -> evicting -> cold
+        self.builds = 0
+        self.evictions = 0
+        self.build_seconds = 0.0
+        self.last_used = time.monotonic()
+        self._buffer: List[Tuple[Message, Future]] = []
+        self._in_flight = 0
+        self._pending_state = None
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def handle_message(self, message: Message):
+        """Deliver to the real agent, building it first if necessary."""
+        start = False
+        with self._lock:
+            self.last_used = time.monotonic()
+            agent = self.agent if self.state == "ready" else None
+            if agent is not None:
+                self._in_flight += 1
+            else:
+                future: Future = Future()
+                self._buffer.append((message, future))
+                if self.state == "cold":
+                    self.state = "building"
+                    start = True
+        if agent is not None:
+            return self._deliver(agent, message)
+        if start:
+            self._start_build()
+        return future
+
+    def _start_build(self) -> None:
+        if self.background:
+            threading.Thread(target=self._build, name=f"build-{self.name}", daemon=True).start()
+        else:
+            self._build()
+
+    def _build(self) -> None:
+        started = time.perf_counter()
+        try:
+            agent = self.factory(self.name, self.bus)
+            agent.name = self.name
+            state = self._pending_state
+            if state is None and self.store is not None:
+                state = self.store.load(self.name)
+            if state is not None:
+                agent.restore(state)
+            self._pending_state = None
+            start = getattr(agent, "start", None)
+            if start is not None:
+                start()
+        except Exception as e:
+            print(f"[LazyAgent] Failed to build {self.name}: {e}")
+            with self._lock:
+                buffered, self._buffer = self._buffer, []
+                self.state = "cold"
+            for _, future in buffered:
+                future.set_exception(e)
+            return
+
+        self.builds += 1
+        self.build_seconds += time.perf_counter() - started
+        print(f"[LazyAgent] Built {self.name} in {time.perf_counter() - started:.3f}s")
+        # Flush until the buffer stays empty so arrival order is preserved
+        while True:
+            with self._lock:
+                if not self._buffer:
+                    self.agent = agent
+                    self.state = "ready"
+                    break
+                batch, self._buffer = self._buffer, []
+                self._in_flight += len(batch)
+            for message, future in batch:
+                try:
+                    self._deliver(agent, message, future)
+                except Exception as e:
+                    print(f"[LazyAgent] {self.name} failed on buffered message: {e}")
+        if self.idle_timeout is not None and not (self._reaper and self._reaper.is_alive()):
+            self._reaper = threading.Thread(
+                target=self._reap, name=f"reap-{self.name}", daemon=True
+            )
+            self._reaper.start()
+
+    def _deliver(self, agent, message: Message, future: Optional[Future] = None):
+        try:
+            result = agent.handle_message(message)
+        except Exception as e:
+            self._settle(future, error=e)
+            raise
+        if hasattr(result, "add_done_callback"):
+            result.add_done_callback(lambda done: self._settle(future, done=done))
+        else:
+            self._settle(future, result=result)
+        return result
+
+    def _settle(self, future: Optional[Future], result=None, error=None, done=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.last_used = time.monotonic()
+        if future is None:
+            return
+        if done is not None:
+            if done.cancelled():
+                future.cancel()
+                return
+            error = done.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def evict_if_idle(self, now: Optional[float] = None) -> bool:
+        """Drop the real agent if it has been idle for ``idle_timeout`` seconds."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if (
+                self.state != "ready"
+                or self._in_flight
+                or self.idle_timeout is None
+                or now - self.last_used < self.idle_timeout
+            ):
+                return False
+            # Messages arriving while the snapshot is taken are buffered for the rebuild
+            agent, self.agent, self.state = self.agent, None, "evicting"
+            self.evictions += 1
+        try:
+            state = agent.snapshot() if hasattr(agent, "snapshot") else None
+            if state is not None and self.store is not None:
+                self.store.save(self.name, state)
+            else:
+                # Keep just the snapshot; models, sessions and caches are released
+                self._pending_state = state
+        except Exception as e:
+            print(f"[LazyAgent] Failed to checkpoint {self.name} on eviction: {e}")
+        try:
+            # Sessions and pools must be released before the agent is dropped
+            result = agent.close() if hasattr(agent, "close") else None
+            if inspect.iscoroutine(result):
+                getattr(agent, "loop", runtime_loop).submit(result).result()
+        except Exception as e:
+            print(f"[LazyAgent] Failed to close {self.name} on eviction: {e}")
+        print(f"[LazyAgent] Evicted idle agent {self.name}")
+        with self._lock:
+            rebuild = bool(self._buffer)
+            self.state = "building" if rebuild else "cold"
+        if rebuild:
+            self._start_build()
+        return True
+
+    def _reap(self) -> None:
+        if self.idle_timeout is None:
+            return
+        interval = max(self.idle_timeout / 2, 0.01)
+        while self.state == "ready":
+            time.sleep(interval)
+            if self.evict_if_idle():
+                return
+
+    def pending_work(self) -> int:
+        """Messages buffered for construction or still being handled."""
+        with self._lock:
+            return len(self._buffer) + self._in_flight
+
+    def close(self):
+        """Close the real agent if it is loaded (returns its coroutine if async)."""
+        close = getattr(self.agent, "close", None)
+        return close() if close is not None else None
+
+    def snapshot(self):
+        """Checkpoint hook: the real agent's state while it is loaded."""
+        agent = self.agent
+        return agent.snapshot() if agent is not None else None
+
+    def restore(self, state) -> None:
+        """Restore hook: applied now if built, otherwise when the agent is built."""
+        agent = self.agent
+        if agent is not None:
+            agent.restore(state)
+        else:
+            self._pending_state = state
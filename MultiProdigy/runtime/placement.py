@@ -0,0 +1,300 @@
+import inspect
+import multiprocessing
+import queue
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Set
+
+from MultiProdigy.bus.codec import MessageDecoder, MessageEncoder
+from MultiProdigy.runtime.event_loop import RuntimeLoop, runtime_loop
+from MultiProdigy.schemas.message import Message
+
+PLACEMENTS = ("inline", "asyncio", "thread", "process")
+
+# Pipe frames between a ProcessHost and its child: u8 kind, u32 sequence, body
+_MESSAGE = 0  # body: codec frame (parent -> child: deliver, child -> parent: publish)
+_DONE = 1  # child finished handling a delivered message
+_ERROR = 2  # body: UTF-8 error text
+_STOP = 3
+_PIPE_HEADER = struct.Struct("<BI")
+
+
+class _Host:
+    """Wraps an agent instance; unknown attributes are read from the agent."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.name = agent.name
+        self.config = getattr(agent, "config", None)
+
+    def __getattr__(self, item):
+        return getattr(self.agent, item)
+
+    def close(self):
+        """Close the hosted agent (returns its coroutine if ``close`` is async)."""
+        close = getattr(self.agent, "close", None)
+        return close() if close is not None else None
+
+
+class AsyncioHost(_Host):
+    """Runs every handler on an event loop thread, off the caller's thread.
+
+    Suited to I/O-bound agents: coroutine handlers interleave on the loop.
+    """
+
+    def __init__(self, agent, loop: RuntimeLoop = runtime_loop):
+        super().__init__(agent)
+        self.loop = loop
+
+    async def _handle(self, message: Message):
+        result = self.agent.handle_message(message)
+        if inspect.isawaitable(result):
+            await result
+
+    def handle_message(self, message: Message) -> Future:
+        return self.loop.submit(self._handle(message))
+
+
+class ThreadHost(_Host):
+    """Runs handlers on the agent's own thread pool (``max_workers`` at once).
+
+    Suited to agents that block in C extensions or synchronous I/O.
+    """
+
+    def __init__(self, agent, max_workers: int = 4):
+        super().__init__(agent)
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix=f"agent-{agent.name}")
+        self._futures: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def _handle(self, message: Message):
+        result = self.agent.handle_message(message)
+        # Coroutine handlers were scheduled on the runtime loop; hold the slot until done
+        if hasattr(result, "result"):
+            result.result()
+
+    def handle_message(self, message: Message) -> Future:
+        future = self.executor.submit(self._handle, message)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the pool, waiting up to ``timeout`` seconds for running handlers."""
+        self.executor.shutdown(wait=False)
+        with self._lock:
+            running = list(self._futures)
+        _, not_done = wait(running, timeout)
+        if not_done:
+            print(f"[ThreadHost] {len(not_done)} handlers of {self.name} still running at close")
+        return super().close()
+
+
+class _PipeBus:
+    """Bus stand-in inside a hosted process: publishes go back to the parent."""
+
+    def __init__(self, conn, lock: threading.Lock):
+        self.conn = conn
+        self.encoder = MessageEncoder()
+        self.lock = lock
+        self.agents: Dict[str, Any] = {}
+
+    def publish(self, message: Message, internal: bool = False) -> None:
+        with self.lock:
+            frame = self.encoder.encode(message)
+            self.conn.send_bytes(_PIPE_HEADER.pack(_MESSAGE, 0) + frame)
+
+    def send(self, message: Message) -> None:
+        self.publish(message)
+
+    def has_route(self, name: str) -> bool:
+        # Routing is decided by the parent bus
+        return True
+
+
+def _process_main(conn, name: str, factory: Callable, args: tuple, kwargs: dict) -> None:
+    lock = threading.Lock()
+    bus = _PipeBus(conn, lock)
+    agent = factory(name, bus, *args, **kwargs)
+    decoder = MessageDecoder()
+
+    def reply(kind: int, seq: int, body: bytes = b"") -> None:
+        with lock:
+            conn.send_bytes(_PIPE_HEADER.pack(kind, seq) + body)
+
+    def settle(seq: int, done) -> None:
+        error = None if done.cancelled() else done.exception()
+        if error is None:
+            reply(_DONE, seq)
+        else:
+            reply(_ERROR, seq, str(error).encode("utf-8"))
+
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except EOFError:
+            break
+        kind, seq = _PIPE_HEADER.unpack_from(data, 0)
+        if kind == _STOP:
+            break
+        message = decoder.decode(memoryview(data)[_PIPE_HEADER.size :]).to_message()
+        try:
+            result = agent.handle_message(message)
+        except Exception as e:
+            reply(_ERROR, seq, str(e).encode("utf-8"))
+            continue
+        if hasattr(result, "add_done_callback"):
+            result.add_done_callback(lambda done, seq=seq: settle(seq, done))
+        else:
+            reply(_DONE, seq)
+    conn.close()
+
+
+class ProcessHost:
+    """Runs an agent in a dedicated process, for CPU-bound work that needs its own GIL.
+
+    The child builds the agent with ``factory(name, bus, *args, **kwargs)``; the
+    factory and its arguments must be picklable (e.g. an agent class). Messages
+    cross a pipe in the binary wire codec, and whatever the agent publishes in the
+    child is republished on the parent's bus, so callers address it like any other
+    agent. Each delivery returns a Future that completes when the child is done.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable,
+        bus,
+        config=None,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        start_method: str = "spawn",
+    ):
+        self.name = name
+        self.bus = bus
+        self.config = config
+        self._encoder = MessageEncoder()
+        self._decoder = MessageDecoder()
+        self._pending: Dict[int, Future] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        # Frames for the child, sent by the writer thread so the reader never blocks
+        # on a full pipe while republishing (that could deliver back to this host)
+        self._outbox: queue.SimpleQueue = queue.SimpleQueue()
+        context: Any = multiprocessing.get_context(start_method)
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_process_main,
+            args=(child_conn, name, factory, args, kwargs or {}),
+            name=f"agent-{name}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self._reader = threading.Thread(target=self._read, name=f"pipe-{name}", daemon=True)
+        self._reader.start()
+        self._writer = threading.Thread(target=self._write, name=f"pipe-{name}-w", daemon=True)
+        self._writer.start()
+
+    def handle_message(self, message: Message) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self._seq += 1
+            self._pending[self._seq] = future
+            frame = self._encoder.encode(message)
+            self._outbox.put(_PIPE_HEADER.pack(_MESSAGE, self._seq) + frame)
+        return future
+
+    def _write(self) -> None:
+        while True:
+            data = self._outbox.get()
+            if data is None:
+                break
+            try:
+                self._conn.send_bytes(data)
+            except (BrokenPipeError, OSError):
+                break  # the reader sees the child exit and fails pending messages
+
+    def pending_work(self) -> int:
+        """Messages delivered to the child and not yet handled."""
+        with self._lock:
+            return len(self._pending)
+
+    def _read(self) -> None:
+        while True:
+            try:
+                data = self._conn.recv_bytes()
+            except (EOFError, OSError):
+                break
+            kind, seq = _PIPE_HEADER.unpack_from(data, 0)
+            body = memoryview(data)[_PIPE_HEADER.size :]
+            if kind == _MESSAGE:
+                try:
+                    # Published by the hosted agent, so it counts as internal traffic
+                    self.bus.publish(self._decoder.decode(body).to_message(), internal=True)
+                except Exception as e:
+                    # A failing receiver must not stop this thread reading the pipe
+                    print(f"[ProcessHost] {self.name} failed to publish a message: {e}")
+                continue
+            with self._lock:
+                future = self._pending.pop(seq, None)
+            if future is None:
+                continue
+            if kind == _DONE:
+                future.set_result(None)
+            else:
+                future.set_exception(RuntimeError(bytes(body).decode("utf-8")))
+        # The child is gone: nothing still pending can complete
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(f"Agent process {self.name} exited"))
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Ask the child to exit (after the frames already queued) and wait for it."""
+        ends = None if timeout is None else time.monotonic() + timeout
+        self._outbox.put(_PIPE_HEADER.pack(_STOP, 0))
+        self._outbox.put(None)
+        self._writer.join(timeout)
+        self.process.join(None if ends is None else max(ends - time.monotonic(), 0))
+        if self.process.is_alive():
+            self.process.terminate()
+        self._conn.close()
+
+
+def host_agent(
+    config,
+    bus,
+    factory: Optional[Callable] = None,
+    agent=None,
+    loop: RuntimeLoop = runtime_loop,
+):
+    """Place an agent according to ``config.placement``; returns what to register.
+
+    ``inline`` returns the agent itself. ``asyncio`` and ``thread`` wrap an instance
+    (built with ``factory(config.name, bus)`` if not given). ``process`` needs the
+    factory, since the agent is constructed inside the child process.
+    """
+    placement = getattr(config, "placement", "inline")
+    if placement not in PLACEMENTS:
+        raise ValueError(f"Unknown placement: {placement}")
+    if placement == "process":
+        if factory is None:
+            raise ValueError("Process placement needs a picklable agent factory")
+        return ProcessHost(config.name, factory, bus, config=config)
+    if agent is None:
+        if factory is None:
+            raise ValueError(f"{placement} placement needs an agent or a factory")
+        agent = factory(config.name, bus)
+    if placement == "asyncio":
+        return AsyncioHost(agent, loop)
+    if placement == "thread":
+        return ThreadHost(agent, max_workers=config.max_tasks)
+    return agent
@@ -1,8 +1,18 @@
-# prodigal_agent/runtime/registry.py
+from typing import Any, Dict
+
+# Agent types are looked up through the plugin registry; kept for old import paths.
+from MultiProdigy.plugins.registry import Plugin, PluginRegistry, plugins
+
+__all__ = ["AgentRegistry", "Plugin", "PluginRegistry", "plugins"]
 
 
 class AgentRegistry:
-    agents = {}
+    """Name -> agent instance map, kept for code written against the old registry.
+
+    Agent types are resolved through ``plugins``; this only stores instances.
+    """
+
+    agents: Dict[str, Any] = {}
 
     @staticmethod
     def register(agent):
@@ -1,14 +1,283 @@
-from MultiProdigy.agents.ollama_agent import OllamaAgent
-from MultiProdigy.agents.task_manager_agent import TaskManagerAgent
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from MultiProdigy.bus.cluster import ClusterNode
 from MultiProdigy.bus.message_bus import MessageBus
+from MultiProdigy.observability.tracer import tracer
+from MultiProdigy.plugins.registry import import_object, plugins
+from MultiProdigy.runtime.checkpointer import Checkpointer
+from MultiProdigy.runtime.event_loop import runtime_loop
+from MultiProdigy.runtime.placement import host_agent
+from MultiProdigy.runtime.scheduler import AgentScheduler
+from MultiProdigy.schemas.runtime_spec import AgentSpec, RuntimeSpec
+from MultiProdigy.storage.checkpoint import CheckpointStore
+
+
+def resolve_agent_class(type_name: str):
+    """Agent class for a registered plugin name or a ``module:Class`` import path."""
+    if ("agents", type_name) in plugins:
+        return plugins.get("agents", type_name)
+    return import_object(type_name)
+
+
+def _construct(spec: AgentSpec, name: str, bus):
+    # Module-level so process placement can pickle the factory
+    cls = resolve_agent_class(spec.type)
+    return cls.from_config(spec, bus, **spec.params)
 
 
 class Runtime:
-    def __init__(self):
-        self.bus = MessageBus()
-        # Create agents
-        self.ollama_agent = OllamaAgent()
-        self.task_manager_agent = TaskManagerAgent(runtime=self)
-        # Register agents with the bus
-        self.bus.register_agent("OllamaAgent", self.ollama_agent)
-        self.bus.register_agent("TaskManagerAgent", self.task_manager_agent)
+    """Builds and runs an agent topology described by a RuntimeSpec.
+
+    ``start`` constructs and warms up all eager agents concurrently on a thread
+    pool, so cold start is bounded by the slowest agent rather than the sum of all
+    of them; ``startup_timings`` records the seconds each agent took. Agents are
+    registered on the bus, in spec order, only once every one of them is up; then
+    their checkpoints are restored and their ``start`` hooks run. Lazy agents are
+    registered at once and built on their first message.
+
+    ``stop(deadline)`` shuts down without dropping work: see its docstring.
+    Periodic jobs belong on ``scheduler`` so that shutdown stops them too.
+    """
+
+    def __init__(
+        self,
+        spec: Union[RuntimeSpec, Dict[str, Any], str, Path, None] = None,
+        bus: Optional[MessageBus] = None,
+    ):
+        if spec is None:
+            spec = RuntimeSpec()
+        elif isinstance(spec, (str, Path)):
+            spec = RuntimeSpec.from_yaml(spec)
+        elif isinstance(spec, dict):
+            spec = RuntimeSpec.model_validate(spec)
+        self.spec = spec
+        self.bus = bus if bus is not None else MessageBus()
+        self.agents: Dict[str, Any] = {}
+        self.startup_timings: Dict[str, float] = {}
+        self.startup_seconds = 0.0
+        self.checkpointer: Optional[Checkpointer] = None
+        if spec.checkpoint_dir is not None:
+            self.checkpointer = Checkpointer(
+                self.bus, CheckpointStore(spec.checkpoint_dir), spec.checkpoint_interval
+            )
+        self.scheduler = AgentScheduler()
+        self.node: Optional[ClusterNode] = None
+        self.running = False
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path], bus: Optional[MessageBus] = None) -> "Runtime":
+        return cls(RuntimeSpec.from_yaml(path), bus)
+
+    def start(self) -> Dict[str, float]:
+        """Build every agent and register it; returns per-agent startup seconds."""
+        if self.running:
+            return self.startup_timings
+        started = time.perf_counter()
+        store = self.checkpointer.store if self.checkpointer is not None else None
+        eager = [spec for spec in self.spec.agents if not spec.lazy]
+
+        built: Dict[str, Any] = {}
+        errors: Dict[str, BaseException] = {}
+        if eager:
+            workers = self.spec.startup_workers or len(eager)
+            executor = ThreadPoolExecutor(workers, thread_name_prefix="runtime-startup")
+            futures = {executor.submit(self._start_agent, spec): spec for spec in eager}
+            done, not_done = wait(futures, timeout=self.spec.startup_timeout)
+            executor.shutdown(wait=False, cancel_futures=True)
+            for future in done:
+                spec = futures[future]
+                try:
+                    built[spec.name], self.startup_timings[spec.name] = future.result()
+                except Exception as e:
+                    errors[spec.name] = e
+            for future in not_done:
+                errors[futures[future].name] = TimeoutError("startup timed out")
+                # A build still running is closed as soon as it finishes
+                future.add_done_callback(self._close_late_build)
+        if errors:
+            for agent in built.values():
+                self._close(agent)
+            details = ", ".join(f"{name}: {error}" for name, error in errors.items())
+            raise RuntimeError(f"Failed to start agents: {details}")
+
+        # Nothing from outside reaches the agents until they are restored and started
+        self.bus.close_ingress()
+        for spec in self.spec.agents:
+            if spec.lazy:
+                agent = self.bus.register_lazy(
+                    spec.name,
+                    partial(_construct, spec),
+                    idle_timeout=spec.idle_timeout,
+                    config=spec,
+                    store=store,
+                )
+            else:
+                agent = built[spec.name]
+                self.bus.register(agent)
+            self.agents[spec.name] = agent
+        # Restore only once every agent is registered, then let them resume their work
+        try:
+            if store is not None:
+                for spec in eager:
+                    self._restore(spec, store)
+            for spec in eager:
+                self._start_hook(self.agents[spec.name])
+        except Exception as e:
+            for name, agent in self.agents.items():
+                self._close(agent)
+                self.bus.unregister(name)
+            self.agents.clear()
+            self.bus.open_ingress()
+            raise RuntimeError(f"Failed to start agents: {spec.name}: {e}") from e
+
+        if self.checkpointer is not None:
+            self.checkpointer.start()
+        if self.spec.cluster is not None:
+            cluster = self.spec.cluster
+            self.node = ClusterNode(
+                self.bus,
+                cluster.node_id,
+                cluster.host,
+                cluster.port,
+                cluster.seeds,
+                token=cluster.token,
+            )
+            self.node.start()
+        self.bus.open_ingress()
+        self.running = True
+        self.startup_seconds = time.perf_counter() - started
+        slowest = max(self.startup_timings.items(), key=lambda item: item[1], default=None)
+        print(
+            f"[Runtime] Started {len(self.agents)} agents in {self.startup_seconds:.3f}s"
+            + (f" (slowest: {slowest[0]} {slowest[1]:.3f}s)" if slowest else "")
+        )
+        return self.startup_timings
+
+    def _start_agent(self, spec: AgentSpec):
+        started = time.perf_counter()
+        factory = partial(_construct, spec)
+        if spec.placement == "process":
+            # Built inside the child; its state is not checkpointed by this runtime
+            return host_agent(spec, self.bus, factory=factory), time.perf_counter() - started
+        agent = factory(spec.name, self.bus)
+        warm_up = getattr(agent, "warm_up", None)
+        result = warm_up() if warm_up is not None else None
+        if inspect.iscoroutine(result):
+            result = agent.loop.submit(result)
+        if result is not None and hasattr(result, "result"):
+            result.result()
+        host = host_agent(spec, self.bus, agent=agent)
+        return host, time.perf_counter() - started
+
+    def _restore(self, spec: AgentSpec, store: CheckpointStore) -> None:
+        if spec.placement == "process":
+            return
+        started = time.perf_counter()
+        state = store.load(spec.name)
+        if state is not None:
+            self.agents[spec.name].restore(state)
+        self.startup_timings[spec.name] += time.perf_counter() - started
+
+    def _close_late_build(self, future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self._close(future.result()[0])
+
+    @staticmethod
+    def _start_hook(agent) -> None:
+        start = getattr(agent, "start", None)
+        if start is not None:
+            start()
+
+    @staticmethod
+    def _close(agent, timeout: Optional[float] = None) -> None:
+        close = getattr(agent, "close", None)
+        if close is None:
+            return
+        try:
+            # Hosts that wait for running handlers (threads, processes) take the deadline
+            if "timeout" in inspect.signature(close).parameters:
+                result = close(timeout=timeout)
+            else:
+                result = close()
+            if inspect.iscoroutine(result):
+                getattr(agent, "loop", runtime_loop).submit(result).result(timeout)
+        except Exception as e:
+            print(f"[Runtime] Failed to close {agent.name}: {e}")
+
+    def pending(self) -> int:
+        """Work still queued or in flight: bus inboxes, agent backlogs, scheduled runs."""
+        total = self.bus.pending() + self.scheduler.active
+        for agent in self.agents.values():
+            pending_work = getattr(agent, "pending_work", None)
+            if pending_work is not None:
+                total += pending_work()
+        return total
+
+    def stop(self, deadline: Optional[float] = 30.0) -> Dict[str, Any]:
+        """Shut down gracefully within ``deadline`` seconds (None waits indefinitely).
+
+        1. Stop ingress: messages from senders outside the runtime are refused
+           with IngressClosedError, periodic jobs stop and cluster peers are told
+           this node hosts no agents; agents (local or remote) can still message
+           each other so in-flight work completes.
+        2. Drain inboxes and backlogs until nothing is pending or the deadline passes.
+        3. Cancel what is left: queued messages are dropped and async handlers
+           are cancelled (they see ``CancelledError`` at their next ``await``).
+        4. Take a final checkpoint, so unfinished TaskManagerAgent tasks survive
+           a restart, then close agents (LLM HTTP sessions) and flush the tracer.
+
+        Returns whether the runtime drained, how much was cancelled and how long it took.
+        """
+        report = {"drained": True, "cancelled": 0, "seconds": 0.0}
+        if not self.running:
+            return report
+        started = time.monotonic()
+        ends = None if deadline is None else started + deadline
+        self.running = False
+        if self.node is not None:
+            self.node.withdraw()
+        self.bus.close_ingress()
+        self.scheduler.stop(wait=False)
+
+        while self.pending():
+            if ends is not None and time.monotonic() >= ends:
+                report["drained"] = False
+                break
+            time.sleep(0.01)
+        if not report["drained"]:
+            report["cancelled"] = self.bus.cancel_pending()
+            print(
+                f"[Runtime] Deadline reached; cancelled {report['cancelled']} queued or"
+                " running messages"
+            )
+
+        if self.node is not None:
+            self.node.stop()
+            self.node = None
+        if self.checkpointer is not None:
+            self.checkpointer.stop()
+        for name, agent in self.agents.items():
+            # Sessions get a moment to close even once the deadline has passed
+            remaining = None if ends is None else max(ends - time.monotonic(), 1.0)
+            self._close(agent, remaining)
+            self.bus.unregister(name)
+        self.agents.clear()
+        interrupted = tracer.flush("runtime stopped")
+        report["seconds"] = time.monotonic() - started
+        print(
+            f"[Runtime] Stopped in {report['seconds']:.3f}s"
+            + (f" ({interrupted} open traces closed)" if interrupted else "")
+        )
+        return report
+
+    def __enter__(self) -> "Runtime":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -1,20 +1,255 @@
+import heapq
+import inspect
+import itertools
+import math
+import random
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from MultiProdigy.runtime.event_loop import RuntimeLoop, runtime_loop
+
+MISSED_POLICIES = ("coalesce", "skip", "catch_up")
+
+
+class ScheduledTask:
+    """Handle for a scheduled task; ``cancel()`` stops future runs.
+
+    ``interval`` is None for one-shot tasks.
+    """
+
+    __slots__ = (
+        "name",
+        "fn",
+        "args",
+        "kwargs",
+        "interval",
+        "jitter",
+        "missed_policy",
+        "nominal",
+        "cancelled",
+        "running",
+        "runs",
+        "missed",
+        "errors",
+        "_scheduler",
+    )
+
+    def __init__(self, scheduler, name, fn, args, kwargs, interval, jitter, missed_policy, first):
+        self._scheduler = scheduler
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.jitter = jitter
+        self.missed_policy = missed_policy
+        # Slot the next run belongs to; slots are start + k * interval, so they never drift
+        self.nominal = first
+        self.cancelled = False
+        self.running = False
+        self.runs = 0
+        self.missed = 0
+        self.errors = 0
+
+    def cancel(self) -> None:
+        self._scheduler.cancel(self)
 
 
 class AgentScheduler:
-    def __init__(self):
-        self.tasks = []
-
-    def add_task(self, interval, task_fn, args=None):
-        if args is None:
-            args = ()
-        task = threading.Thread(target=self._run_task, args=(interval, task_fn, args))
-        task.daemon = True  # Terminates with main program
-        self.tasks.append(task)
-        task.start()
-
-    def _run_task(self, interval, task_fn, args):
-        while True:
-            task_fn(*args)
-            time.sleep(interval)
+    """Runs periodic tasks from a timer heap on one thread, on a bounded worker pool.
+
+    Runs are fixed-rate: the n-th run is due at ``start + n * interval`` however
+    long earlier runs took, plus an optional random ``jitter`` (seconds) so many
+    tasks with the same interval do not fire together. A task never overlaps
+    itself. When runs fall behind (a slow run, a busy pool), ``missed`` decides:
+
+    - ``coalesce`` (default): run once now, then continue on the regular slots.
+    - ``skip``: drop the missed runs and wait for the next slot.
+    - ``catch_up``: run every missed slot back to back.
+
+    Coroutine functions run on the runtime event loop instead of a pool thread.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        loop: RuntimeLoop = runtime_loop,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_workers = max_workers
+        self.loop = loop
+        self.clock = clock
+        self.tasks: List[ScheduledTask] = []
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        # Runs dispatched and not yet finished (including ones outliving stop())
+        self.active = 0
+
+    def add_task(
+        self,
+        interval: float,
+        task_fn: Callable,
+        args=None,
+        kwargs=None,
+        delay: Optional[float] = None,
+        jitter: float = 0.0,
+        missed: str = "coalesce",
+        name: Optional[str] = None,
+    ) -> ScheduledTask:
+        """Run ``task_fn(*args, **kwargs)`` every ``interval`` seconds.
+
+        The first run is after ``delay`` (default: immediately). Starts the
+        scheduler if it is not running.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if jitter < 0:
+            raise ValueError("jitter must not be negative")
+        if missed not in MISSED_POLICIES:
+            raise ValueError(f"Unknown missed-run policy: {missed}")
+        task = ScheduledTask(
+            self,
+            name or getattr(task_fn, "__name__", "task"),
+            task_fn,
+            tuple(args or ()),
+            dict(kwargs or {}),
+            interval,
+            jitter,
+            missed,
+            self.clock() + (delay or 0.0),
+        )
+        with self._cond:
+            self.tasks.append(task)
+            self._push(task)
+        self.start()
+        return task
+
+    def call_later(
+        self, delay: float, task_fn: Callable, args=None, kwargs=None, name: Optional[str] = None
+    ) -> ScheduledTask:
+        """Run ``task_fn(*args, **kwargs)`` once, ``delay`` seconds from now."""
+        task = ScheduledTask(
+            self,
+            name or getattr(task_fn, "__name__", "task"),
+            task_fn,
+            tuple(args or ()),
+            dict(kwargs or {}),
+            None,
+            0.0,
+            "skip",
+            self.clock() + delay,
+        )
+        with self._cond:
+            self.tasks.append(task)
+            self._push(task)
+        self.start()
+        return task
+
+    def cancel(self, task: ScheduledTask) -> None:
+        """Stop a task; a run already in progress finishes."""
+        with self._cond:
+            task.cancelled = True
+            if task in self.tasks:
+                self.tasks.remove(task)
+            # Its heap entry is dropped when it surfaces
+            self._cond.notify()
+
+    def _push(self, task: ScheduledTask) -> None:
+        fire_at = task.nominal + (random.uniform(0, task.jitter) if task.jitter else 0.0)
+        heapq.heappush(self._heap, (fire_at, next(self._seq), task))
+        self._cond.notify()
+
+    def start(self) -> None:
+        """Start the timer thread (and worker pool) if not running."""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="scheduled")
+            self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Cancel all tasks and stop the timer thread; ``wait`` joins running tasks."""
+        with self._cond:
+            self._stopping = True
+            for task in self.tasks:
+                task.cancelled = True
+            self.tasks.clear()
+            self._heap.clear()
+            self._cond.notify()
+            thread, executor = self._thread, self._executor
+            self._thread = self._executor = None
+        if thread is not None:
+            thread.join()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _run(self) -> None:
+        with self._cond:
+            # Set by start() before this thread exists; a restart starts a new thread
+            executor = self._executor
+            if executor is None:
+                return
+            while not self._stopping:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                fire_at, _, task = self._heap[0]
+                if task.cancelled:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = fire_at - self.clock()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                task.running = True
+                self.active += 1
+                executor.submit(self._execute, task)
+
+    def _execute(self, task: ScheduledTask) -> None:
+        try:
+            result = task.fn(*task.args, **task.kwargs)
+            if inspect.iscoroutine(result):
+                future = self.loop.submit(result)
+                future.add_done_callback(
+                    lambda done: self._finish(task, None if done.cancelled() else done.exception())
+                )
+                return
+        except Exception as e:
+            self._finish(task, e)
+            return
+        self._finish(task, None)
+
+    def _finish(self, task: ScheduledTask, error: Optional[BaseException]) -> None:
+        if error is not None:
+            task.errors += 1
+            print(f"[Scheduler] Task {task.name} failed: {error}")
+        with self._cond:
+            task.running = False
+            task.runs += 1
+            self.active -= 1
+            if task.cancelled or self._stopping:
+                return
+            if task.interval is None:
+                self.tasks.remove(task)  # one-shot (call_later)
+                return
+            task.nominal += task.interval
+            now = self.clock()
+            if task.nominal <= now and task.missed_policy != "catch_up":
+                # Slots that passed while this run was in progress (or queued)
+                behind = math.floor((now - task.nominal) / task.interval)
+                if task.missed_policy == "coalesce":
+                    task.nominal += behind * task.interval
+                    task.missed += behind
+                else:
+                    task.nominal += (behind + 1) * task.interval
+                    task.missed += behind + 1
+            self._push(task)
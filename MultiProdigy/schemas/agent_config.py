@@ -1,12 +1,17 @@
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AgentConfig(BaseModel):
     name: str
     role: str = "default"
     goal: str = "default goal"
+    # Most messages the agent handles at once; the bus queues the rest (None: no cap)
+    max_tasks: Optional[int] = Field(default=None, gt=0)
+    retry_delay: float = Field(default=2, ge=0)
+    # Where handlers run: the publisher's thread, the event loop, a thread pool or a process
+    placement: Literal["inline", "asyncio", "thread", "process"] = "inline"
 
 
 class Settings(BaseModel):
@@ -1,16 +1,144 @@
+import os
+from pathlib import Path
+from typing import Any, Mapping, Optional, Tuple, Union
+
 from pydantic import BaseModel, Field
 
+from MultiProdigy.schemas.metadata import Metadata
+from MultiProdigy.storage.blob_store import BlobData, BlobStore, default_blob_store
+
+_FIELDS = frozenset(("sender", "receiver", "content", "metadata"))
+_FIELDS_WITH_ATTACHMENTS = _FIELDS | {"attachments"}
+# Metadata is immutable, so messages without any can share one instance
+_EMPTY_METADATA = Metadata()
+_new_message = object.__new__
+_set_attr = object.__setattr__
+
+
+class Attachment(BaseModel):
+    """Reference to a blob in a BlobStore; only the digest travels with the message."""
+
+    model_config = {"frozen": True}
+
+    digest: str
+    size: int
+    media_type: str = "application/octet-stream"
+    name: Optional[str] = None
+
 
 class Message(BaseModel):
     sender: str
     receiver: str
     content: str
-    metadata: dict = Field(default_factory=dict)
+    metadata: Metadata = Field(default_factory=Metadata)
+    attachments: Tuple[Attachment, ...] = ()
+
+    @classmethod
+    def trusted(
+        cls,
+        sender: str,
+        receiver: str,
+        content: str,
+        metadata: Optional[Mapping] = None,
+        attachments: Tuple[Attachment, ...] = (),
+    ) -> "Message":
+        """Build a Message from already-validated fields without running validation.
+
+        For internal hops only (agent sends and replies). Data arriving from outside
+        the process (HTTP, other nodes) must go through ``Message(...)`` or
+        ``Message.model_validate`` so it is validated at the edge.
+        """
+        if metadata is None:
+            metadata = _EMPTY_METADATA
+        elif type(metadata) is not Metadata:
+            metadata = Metadata(metadata)
+        # Fill the instance directly: model_construct re-applies defaults per field
+        msg = _new_message(cls)
+        _set_attr(
+            msg,
+            "__dict__",
+            {
+                "sender": sender,
+                "receiver": receiver,
+                "content": content,
+                "metadata": metadata,
+                "attachments": attachments,
+            },
+        )
+        _set_attr(
+            msg,
+            "__pydantic_fields_set__",
+            set(_FIELDS_WITH_ATTACHMENTS if attachments else _FIELDS),
+        )
+        _set_attr(msg, "__pydantic_extra__", None)
+        _set_attr(msg, "__pydantic_private__", None)
+        return msg
 
     def copy_with_new_content(self, new_content: str):
-        return Message(
+        # Metadata is immutable, so the copy shares it instead of duplicating it
+        return Message.trusted(
             sender=self.sender,
             receiver=self.receiver,
             content=new_content,
-            metadata=self.metadata.copy(),
+            metadata=self.metadata,
+            attachments=self.attachments,
         )
+
+    def with_metadata(self, **updates: Any) -> "Message":
+        """Return a copy of this message with the given metadata keys set."""
+        return Message.trusted(
+            sender=self.sender,
+            receiver=self.receiver,
+            content=self.content,
+            metadata=self.metadata.merge(updates),
+            attachments=self.attachments,
+        )
+
+    def attach(
+        self,
+        data: BlobData,
+        media_type: str = "application/octet-stream",
+        name: Optional[str] = None,
+        store: Optional[BlobStore] = None,
+    ) -> "Message":
+        """Return a copy of this message carrying ``data`` as a stored attachment."""
+        digest = (store or default_blob_store()).put(data)
+        size = memoryview(data).nbytes
+        return self._with_attachment(
+            Attachment(digest=digest, size=size, media_type=media_type, name=name)
+        )
+
+    def attach_file(
+        self,
+        path: Union[str, Path],
+        media_type: str = "application/octet-stream",
+        store: Optional[BlobStore] = None,
+    ) -> "Message":
+        """Return a copy of this message carrying a file as a stored attachment."""
+        digest = (store or default_blob_store()).put_file(path)
+        return self._with_attachment(
+            Attachment(
+                digest=digest,
+                size=os.path.getsize(path),
+                media_type=media_type,
+                name=os.path.basename(path),
+            )
+        )
+
+    def _with_attachment(self, attachment: Attachment) -> "Message":
+        return Message.trusted(
+            sender=self.sender,
+            receiver=self.receiver,
+            content=self.content,
+            metadata=self.metadata,
+            attachments=self.attachments + (attachment,),
+        )
+
+    def open_attachment(self, index: int = 0, store: Optional[BlobStore] = None) -> memoryview:
+        """Return a memory-mapped view of an attachment's bytes."""
+        return (store or default_blob_store()).open(self.attachments[index].digest)
+
+    def release_attachments(self, store: Optional[BlobStore] = None) -> None:
+        """Drop this message's references so unused blobs can be garbage collected."""
+        for attachment in self.attachments:
+            (store or default_blob_store()).release(attachment.digest)
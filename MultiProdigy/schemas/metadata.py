@@ -0,0 +1,140 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+from pydantic_core import core_schema
+
+# Layers stacked before a derived mapping is flattened again
+_MAX_DEPTH = 8
+_DELETED = object()
+
+
+class Metadata(Mapping):
+    """Immutable message metadata with structural sharing.
+
+    Deriving a new mapping (``set``, ``merge``, ``discard``) adds a small layer on top
+    of the existing one instead of copying it, so reply chains and fan-out can share
+    one instance safely. Chains are flattened every few layers to keep lookups cheap.
+    """
+
+    __slots__ = ("_layer", "_parent", "_depth", "_flat")
+
+    def __init__(self, data: Optional[Mapping] = None, **kwargs: Any):
+        layer = dict(data) if data else {}
+        if kwargs:
+            layer.update(kwargs)
+        self._layer = layer
+        self._parent: Optional["Metadata"] = None
+        self._depth = 0
+        self._flat: Optional[Dict[str, Any]] = layer
+
+    def _derive(self, layer: Dict[str, Any]) -> "Metadata":
+        child = object.__new__(Metadata)
+        if self._depth + 1 >= _MAX_DEPTH:
+            flat = dict(self._resolve())
+            for key, value in layer.items():
+                if value is _DELETED:
+                    flat.pop(key, None)
+                else:
+                    flat[key] = value
+            child._layer = flat
+            child._parent = None
+            child._depth = 0
+            child._flat = flat
+        else:
+            child._layer = layer
+            child._parent = self
+            child._depth = self._depth + 1
+            child._flat = None
+        return child
+
+    def _resolve(self) -> Dict[str, Any]:
+        """Return the flattened contents, computing them once per instance."""
+        flat = self._flat
+        if flat is None:
+            # Only derived mappings are unflattened, and they always have a parent
+            flat = dict(self._parent._resolve()) if self._parent is not None else {}
+            for key, value in self._layer.items():
+                if value is _DELETED:
+                    flat.pop(key, None)
+                else:
+                    flat[key] = value
+            self._flat = flat
+        return flat
+
+    def set(self, key: str, value: Any) -> "Metadata":
+        """Return a new mapping with ``key`` set to ``value``."""
+        return self._derive({key: value})
+
+    def merge(self, data: Optional[Mapping] = None, **kwargs: Any) -> "Metadata":
+        """Return a new mapping with all given keys set."""
+        layer = dict(data) if data else {}
+        layer.update(kwargs)
+        if not layer:
+            return self
+        return self._derive(layer)
+
+    def discard(self, key: str) -> "Metadata":
+        """Return a new mapping without ``key``."""
+        if key not in self:
+            return self
+        return self._derive({key: _DELETED})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a mutable copy as a plain dict."""
+        return dict(self._resolve())
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._flat is not None:
+            return self._flat[key]
+        node: Optional[Metadata] = self
+        while node is not None:
+            if key in node._layer:
+                value = node._layer[key]
+                if value is _DELETED:
+                    break
+                return value
+            node = node._parent
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resolve())
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __repr__(self) -> str:
+        return f"Metadata({self._resolve()!r})"
+
+    def __reduce__(self):
+        return (Metadata, (self.to_dict(),))
+
+    @classmethod
+    def validate(cls, value: Any) -> "Metadata":
+        """Coerce a mapping into Metadata, keeping existing instances shared."""
+        if isinstance(value, Metadata):
+            return value
+        if isinstance(value, Mapping):
+            return cls(value)
+        # ValueError, so pydantic reports it as a ValidationError
+        raise ValueError(f"metadata must be a mapping, got {type(value).__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda value: value.to_dict()
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        # Validated by a plain function, so describe the accepted input: a JSON object
+        return handler(core_schema.dict_schema(core_schema.str_schema(), core_schema.any_schema()))
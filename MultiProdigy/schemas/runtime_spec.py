@@ -0,0 +1,63 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+from MultiProdigy.schemas.agent_config import AgentConfig
+
+
+class AgentSpec(AgentConfig):
+    """One agent of a runtime topology.
+
+    ``type`` is a built-in alias (``echo``, ``memory``, ``llm``, ``ollama``,
+    ``task_manager``, ``user``) or an import path such as ``package.module:Class``.
+    ``params`` are passed to the agent's ``from_config``. Lazy agents are built on
+    their first message instead of at startup.
+    """
+
+    type: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    lazy: bool = False
+    idle_timeout: Optional[float] = Field(default=None, gt=0)
+
+
+class ClusterSpec(BaseModel):
+    """Joins the runtime's bus to other nodes over TCP (see ClusterNode)."""
+
+    node_id: str
+    host: str = "127.0.0.1"
+    port: int = Field(default=0, ge=0)  # 0 picks a free port
+    seeds: List[str] = Field(default_factory=list)  # "host:port" of other nodes
+    # Shared secret every node must present; required unless host is a loopback address
+    token: Optional[str] = None
+
+
+class RuntimeSpec(BaseModel):
+    """Declarative description of the agents a Runtime builds and runs."""
+
+    agents: List[AgentSpec] = Field(default_factory=list)
+    # Threads constructing agents at startup (None: one per agent)
+    startup_workers: Optional[int] = Field(default=None, gt=0)
+    startup_timeout: Optional[float] = Field(default=None, gt=0)
+    # Periodic checkpoints of stateful agents; disabled without a directory
+    checkpoint_dir: Optional[str] = None
+    checkpoint_interval: float = Field(default=30.0, gt=0)
+    cluster: Optional[ClusterSpec] = None
+
+    @model_validator(mode="after")
+    def _check_names(self) -> "RuntimeSpec":
+        seen = set()
+        for agent in self.agents:
+            if agent.name in seen:
+                raise ValueError(f"Duplicate agent name: {agent.name}")
+            seen.add(agent.name)
+        return self
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> "RuntimeSpec":
+        """Load a spec from a YAML file."""
+        import yaml
+
+        with open(path, "r") as f:
+            data = yaml.safe_load(f) or {}
+        return cls.model_validate(data)
@@ -0,0 +1,70 @@
+import re
+from string import Template
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# Ids must be usable as $placeholders in node content
+_ID_RE = re.compile(Template.idpattern, Template.flags)
+
+
+class TaskNode(BaseModel):
+    """One step of a task graph.
+
+    ``content`` may reference upstream results as ``$node_id`` (``string.Template``
+    syntax), so ids must be identifiers such as ``fetch_data``. Without ``agent`` the node runs on the TaskManagerAgent's worker pool.
+    """
+
+    id: str
+    content: str
+    agent: Optional[str] = None
+    depends_on: List[str] = Field(default_factory=list)
+
+    @field_validator("id")
+    @classmethod
+    def _check_id(cls, value: str) -> str:
+        if not _ID_RE.fullmatch(value):
+            raise ValueError(
+                f"Task node id '{value}' must be a valid identifier (letters, digits, _)"
+                " so other nodes can reference it as $id"
+            )
+        return value
+
+
+class TaskGraph(BaseModel):
+    """A DAG of TaskNodes; validated for unknown dependencies and cycles."""
+
+    nodes: List[TaskNode]
+
+    @model_validator(mode="after")
+    def _check_acyclic(self) -> "TaskGraph":
+        self.order()
+        return self
+
+    def order(self) -> List[str]:
+        """Node ids in a topological order (dependencies first)."""
+        by_id: Dict[str, TaskNode] = {}
+        for node in self.nodes:
+            if node.id in by_id:
+                raise ValueError(f"Duplicate task node id: {node.id}")
+            by_id[node.id] = node
+        pending = {node.id: len(set(node.depends_on)) for node in self.nodes}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in by_id}
+        for node in self.nodes:
+            for dep in set(node.depends_on):
+                if dep not in by_id:
+                    raise ValueError(f"Task node '{node.id}' depends on unknown node '{dep}'")
+                dependents[dep].append(node.id)
+
+        ready = [node_id for node_id, count in pending.items() if count == 0]
+        order = []
+        while ready:
+            node_id = ready.pop()
+            order.append(node_id)
+            for child in dependents[node_id]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+        if len(order) != len(by_id):
+            raise ValueError("Task graph contains a cycle")
+        return order
@@ -0,0 +1,9 @@
+from .blob_store import BlobStore, default_blob_store
+from .checkpoint import CheckpointStore
+
+
+def __getattr__(name):
+    # The default store is created on first use, not when the package is imported
+    if name == "blob_store":
+        return default_blob_store()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
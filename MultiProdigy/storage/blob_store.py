@@ -0,0 +1,183 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Union
+
+BlobData = Union[bytes, bytearray, memoryview]
+
+_CHUNK_SIZE = 1 << 20
+
+
+class BlobStore:
+    """Local content-addressed store for large message attachments.
+
+    Blobs are keyed by their SHA-256 digest, so the same bytes are stored once no
+    matter how many messages carry them. Reads are memory-mapped. Each ``put`` or
+    ``retain`` takes a reference and ``release`` drops one; ``gc`` deletes blobs whose
+    references were all released, and blobs no reference was ever recorded for.
+
+    Reference counts are appended to ``refcounts.log`` in ``root`` as they change and
+    replayed on startup, so they survive restarts; ``gc`` compacts the log.
+    """
+
+    def __init__(self, root: Union[str, Path] = ".multiprodigy/blobs"):
+        # Absolute, so a later chdir does not move the store
+        self.root = Path(root).absolute()
+        self.refcounts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._log: Optional[TextIO] = None
+        self._load_refcounts()
+
+    @property
+    def _log_path(self) -> Path:
+        return self.root / "refcounts.log"
+
+    def _load_refcounts(self) -> None:
+        if not self._log_path.exists():
+            return
+        with open(self._log_path, "r") as f:
+            for line in f:
+                digest, _, count = line.partition(" ")
+                try:
+                    self.refcounts[digest] = int(count)
+                except ValueError:
+                    continue  # torn last line after a crash
+
+    def _record(self, digest: str, count: int) -> None:
+        # Caller holds the lock; one short append per change, replayed by _load_refcounts
+        self.refcounts[digest] = count
+        if self._log is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._log = open(self._log_path, "a", buffering=1)
+        self._log.write(f"{digest} {count}\n")
+
+    def path_for(self, digest: str) -> Path:
+        """Return the on-disk location of a blob."""
+        return self.root / digest[:2] / digest[2:]
+
+    def put(self, data: BlobData) -> str:
+        """Store bytes and return their digest, taking one reference."""
+        digest = hashlib.sha256(data).hexdigest()
+        self._store(digest, lambda: [data])
+        return digest
+
+    def put_file(self, source: Union[str, Path]) -> str:
+        """Store a file's contents (streamed, never fully in memory) and return the digest."""
+        hasher = hashlib.sha256()
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        def chunks():
+            with open(source, "rb") as f:
+                yield from iter(lambda: f.read(_CHUNK_SIZE), b"")
+
+        self._store(digest, chunks)
+        return digest
+
+    def _store(self, digest: str, chunks) -> None:
+        # Take the reference first so gc keeps the blob, then write without the lock
+        with self._lock:
+            self._record(digest, self.refcounts.get(digest, 0) + 1)
+        path = self.path_for(digest)
+        if path.exists():
+            return
+        try:
+            self._write_atomic(path, chunks())
+        except BaseException:
+            self.release(digest)
+            raise
+
+    def _write_atomic(self, path: Path, chunks) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def open(self, digest: str) -> memoryview:
+        """Return a read-only memory-mapped view of a blob."""
+        path = self.path_for(digest)
+        if not path.exists():
+            raise KeyError(f"Blob not found: {digest}")
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def read(self, digest: str) -> bytes:
+        """Return a blob's contents as bytes."""
+        return bytes(self.open(digest))
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def retain(self, digest: str) -> None:
+        """Take another reference to a stored blob."""
+        with self._lock:
+            self._record(digest, self.refcounts.get(digest, 0) + 1)
+
+    def release(self, digest: str) -> None:
+        """Drop a reference; the blob becomes collectable once none remain."""
+        with self._lock:
+            count = self.refcounts.get(digest, 0)
+            if count > 0:
+                self._record(digest, count - 1)
+
+    def gc(self) -> int:
+        """Delete unreferenced blobs and compact the refcount log; return how many."""
+        with self._lock:
+            dead = {digest for digest, count in self.refcounts.items() if count == 0}
+            # Blobs on disk with no recorded reference (e.g. written by a crashed put)
+            for path in self.root.glob("??/*"):
+                digest = path.parent.name + path.name
+                if not path.name.startswith(".tmp-") and digest not in self.refcounts:
+                    dead.add(digest)
+            for digest in dead:
+                self.refcounts.pop(digest, None)
+                self.path_for(digest).unlink(missing_ok=True)
+            self._compact()
+        return len(dead)
+
+    def _compact(self) -> None:
+        if self._log is None and not self._log_path.exists():
+            return
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        lines = [f"{digest} {count}\n" for digest, count in self.refcounts.items()]
+        self._write_atomic(self._log_path, [("".join(lines)).encode("utf-8")])
+
+
+_default_store: Optional[BlobStore] = None
+_default_lock = threading.Lock()
+
+
+def default_blob_store() -> BlobStore:
+    """The process-wide store, created (and its refcount log read) on first use.
+
+    It lives in ``MULTIPRODIGY_BLOB_DIR``, by default under the user's home directory.
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = BlobStore(
+                os.environ.get("MULTIPRODIGY_BLOB_DIR", Path.home() / ".multiprodigy" / "blobs")
+            )
+        return _default_store
+
+
+def __getattr__(name: str) -> Any:
+    # ``blob_store`` is kept for old imports; importing this module stays side-effect free
+    if name == "blob_store":
+        return default_blob_store()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,155 @@
+import os
+import pickle  # nosec B403 - checkpoints are written and read by the same trusted runtime
+import struct
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+# File layout: MAGIC, u8 version, then frames of (u8 kind, u32 length, u32 crc32, payload).
+# Payloads are zlib-compressed pickles: a FULL frame holds the whole state, a DELTA
+# frame holds (changed entries, removed keys) relative to the state before it.
+MAGIC = b"MPCK"
+VERSION = 1
+FULL = 0
+DELTA = 1
+
+_FILE_HEADER = struct.Struct("<4sB")
+_FRAME = struct.Struct("<BII")
+
+
+def _encode(obj: Any) -> bytes:
+    return zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _decode(payload: bytes) -> Any:
+    return pickle.loads(zlib.decompress(payload))  # nosec B301
+
+
+def _entries(state: Any) -> Optional[Dict[Any, bytes]]:
+    # Entries are compared pickled: agents may mutate a snapshot's values in place later
+    if not isinstance(state, dict):
+        return None
+    return {
+        key: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for key, value in state.items()
+    }
+
+
+class CheckpointStore:
+    """Per-agent checkpoint files with incremental (delta) snapshots.
+
+    States that are dicts are diffed against the last checkpoint and only changed
+    or removed entries are appended; other states are always written in full.
+    After ``compact_every`` deltas the file is rewritten as a single full frame
+    (atomically). A frame cut short by a crash is ignored on load, so a restore
+    returns the last complete checkpoint.
+    """
+
+    def __init__(
+        self, root: Union[str, Path] = ".multiprodigy/checkpoints", compact_every: int = 20
+    ):
+        self.root = Path(root)
+        self.compact_every = compact_every
+        # Pickled entries of each agent's last dict checkpoint (None for other states)
+        self._last: Dict[str, Optional[Dict[Any, bytes]]] = {}
+        self._deltas: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, name: str) -> Path:
+        """Return the checkpoint file of an agent."""
+        return self.root / f"{name}.ckpt"
+
+    def save(self, name: str, state: Any) -> str:
+        """Checkpoint ``state``; returns ``"full"``, ``"delta"`` or ``"unchanged"``."""
+        with self._lock:
+            previous = self._last.get(name)
+            entries = _entries(state)
+            if (
+                entries is not None
+                and previous is not None
+                and self._deltas.get(name, 0) < self.compact_every
+            ):
+                changed = {
+                    key: state[key] for key, blob in entries.items() if previous.get(key) != blob
+                }
+                removed = [key for key in previous if key not in entries]
+                if not changed and not removed:
+                    return "unchanged"
+                self._append(name, DELTA, _encode((changed, removed)))
+                self._deltas[name] = self._deltas.get(name, 0) + 1
+                kind = "delta"
+            else:
+                self._write_full(name, _encode(state))
+                self._deltas[name] = 0
+                kind = "full"
+            self._last[name] = entries
+            return kind
+
+    def load(self, name: str) -> Optional[Any]:
+        """Return the last checkpointed state of ``name``, or None if there is none."""
+        path = self.path_for(name)
+        if not path.exists():
+            return None
+        data = path.read_bytes()
+        state, deltas, end = self._replay(data)
+        with self._lock:
+            if end < len(data):
+                # Drop a torn tail so later deltas are appended after valid frames
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+            self._last[name] = _entries(state)
+            self._deltas[name] = deltas
+        return state
+
+    def delete(self, name: str) -> None:
+        """Remove an agent's checkpoint."""
+        with self._lock:
+            self._last.pop(name, None)
+            self._deltas.pop(name, None)
+            self.path_for(name).unlink(missing_ok=True)
+
+    def _write_full(self, name: str, payload: bytes) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        frame = _FRAME.pack(FULL, len(payload), zlib.crc32(payload)) + payload
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(_FILE_HEADER.pack(MAGIC, VERSION) + frame)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, self.path_for(name))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _append(self, name: str, kind: int, payload: bytes) -> None:
+        with open(self.path_for(name), "ab") as f:
+            f.write(_FRAME.pack(kind, len(payload), zlib.crc32(payload)) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _replay(data: bytes) -> Tuple[Any, int, int]:
+        magic, version = _FILE_HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a MultiProdigy checkpoint file")
+        offset = _FILE_HEADER.size
+        state: Any = None
+        deltas = 0
+        while offset + _FRAME.size <= len(data):
+            kind, length, crc = _FRAME.unpack_from(data, offset)
+            start = offset + _FRAME.size
+            payload = data[start : start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break  # torn write at the tail
+            offset = start + length
+            if kind == FULL:
+                state, deltas = _decode(payload), 0
+            else:
+                changed, removed = _decode(payload)
+                for key in removed:
+                    state.pop(key, None)
+                state.update(changed)
+                deltas += 1
+        return state, deltas, offset
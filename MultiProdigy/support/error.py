@@ -14,3 +14,9 @@ class AgentNotFoundError(AgentError):
     """Raised when an agent is not registered in the system."""
 
     pass
+
+
+class IngressClosedError(AgentError):
+    """Raised when a message from outside the runtime arrives while it shuts down."""
+
+    pass
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Message wire codec benchmark
+
+Compares the binary codec in MultiProdigy.bus.codec with the pydantic JSON baseline
+(``model_dump_json`` / ``model_validate_json``) for size and throughput.
+
+Run with:
+    python benchmarks/bench_codec.py
+"""
+
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from MultiProdigy.bus.codec import MessageDecoder, MessageEncoder  # noqa: E402
+from MultiProdigy.schemas.message import Message  # noqa: E402
+
+N = 50_000
+
+
+def make_messages(content_size: int):
+    body = ("lorem ipsum dolor sit amet " * (content_size // 27 + 1))[:content_size]
+    return [
+        Message(
+            sender="ResearchAgent",
+            receiver="AnalysisAgent",
+            content=body,
+            metadata={"message_id": f"msg-{i}", "conversation_id": "c-1"},
+        )
+        for i in range(N)
+    ]
+
+
+def run(label: str, messages):
+    start = time.perf_counter()
+    json_frames = [m.model_dump_json().encode() for m in messages]
+    json_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for frame in json_frames:
+        Message.model_validate_json(frame)
+    json_decode = time.perf_counter() - start
+
+    encoder, decoder = MessageEncoder(), MessageDecoder()
+    start = time.perf_counter()
+    bin_frames = [encoder.encode(m) for m in messages]
+    bin_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for frame in bin_frames:
+        decoder.decode(frame)
+    bin_decode = time.perf_counter() - start
+
+    json_bytes = sum(map(len, json_frames)) / N
+    bin_bytes = sum(map(len, bin_frames)) / N
+    print(f"{label}")
+    print(f"  pydantic JSON  {json_bytes:9.0f} B/msg  enc {N / json_encode:10,.0f}/s  "
+          f"dec {N / json_decode:10,.0f}/s")
+    print(f"  binary codec   {bin_bytes:9.0f} B/msg  enc {N / bin_encode:10,.0f}/s  "
+          f"dec {N / bin_decode:10,.0f}/s (content left as memoryview)")
+
+
+def main():
+    run("small content (64 B)", make_messages(64))
+    run("large content (16 KiB, compressed)", make_messages(16 * 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+MemoryStore search benchmark
+
+Times ``MemoryStore.search`` (scope postings plus MaxScore pruning) against
+exhaustive BM25 scoring of every posting followed by a scope filter, on the same
+store, and checks both return the same top ``k``.
+
+Run with:
+    python benchmarks/bench_memory_search.py
+"""
+
+import heapq
+import itertools
+import math
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from MultiProdigy.memory.store import MemoryStore, tokenize  # noqa: E402
+
+N = 200_000
+QUERIES = 200
+K = 5
+
+
+def build_store(rng: random.Random) -> MemoryStore:
+    # Zipf-like vocabulary: a few very common words, a long tail of rare ones
+    vocabulary = [f"w{i}" for i in range(20_000)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    store = MemoryStore(capacity=N)
+    for i in range(N):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(8, 24))
+        store.add(
+            " ".join(words),
+            agent=f"agent-{i % 50}",
+            conversation_id=f"conv-{i % 2_000}",
+        )
+    return store
+
+
+def exhaustive(store: MemoryStore, query, k=K, conversation_id=None, agent=None):
+    """Score every posting of every query term, then filter by scope."""
+    n_docs = len(store.records)
+    avg_length = store.total_length / n_docs
+    k1, b = store.k1, store.b
+    base, scale = k1 * (1 - b), k1 * b / avg_length
+    scores = {}
+    for term in set(tokenize(query)):
+        postings = store.postings.get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+        weight = idf * (k1 + 1)
+        for record_id, tf in postings.items():
+            partial = weight * tf / (tf + base + scale * store.doc_lengths[record_id])
+            scores[record_id] = scores.get(record_id, 0.0) + partial
+    records = store.records
+    scores = {
+        record_id: score
+        for record_id, score in scores.items()
+        if conversation_id in (None, records[record_id].conversation_id)
+        and agent in (None, records[record_id].agent)
+    }
+    return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def timed(search, queries, **scope):
+    start = time.perf_counter()
+    results = [search(query, **scope) for query in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+def main():
+    rng = random.Random(7)
+    start = time.perf_counter()
+    store = build_store(rng)
+    print(f"built {N:,} records in {time.perf_counter() - start:.1f}s")
+    # Queries mix common and rare words, like real recall prompts
+    queries = [
+        " ".join(f"w{rng.choice([rng.randint(0, 20), rng.randint(20, 5_000)])}" for _ in range(4))
+        for _ in range(QUERIES)
+    ]
+    scopes = [
+        ("unscoped", {}),
+        ("agent", {"agent": "agent-7"}),
+        ("conversation", {"conversation_id": "conv-42"}),
+        ("agent + conversation", {"conversation_id": "conv-42", "agent": "agent-42"}),
+    ]
+    for label, scope in scopes:
+        baseline_ms, expected = timed(lambda q, **s: exhaustive(store, q, **s), queries, **scope)
+        search_ms, found = timed(lambda q, **s: store.search(q, k=K, **s), queries, **scope)
+        for want, got in zip(expected, found):
+            assert [round(s, 9) for _, s in want] == [round(s, 9) for _, s in got]
+        print(f"{label:22} exhaustive {baseline_ms:7.2f} ms  search {search_ms:7.2f} ms  "
+              f"({baseline_ms / search_ms:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Message construction micro-benchmark
+
+Compares validated ``Message(...)`` construction (used at ingress edges) with the
+trusted ``Message.trusted(...)`` path used for internal agent hops.
+
+Run with:
+    python benchmarks/bench_message.py
+"""
+
+import os
+import sys
+import timeit
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from MultiProdigy.schemas.message import Message  # noqa: E402
+
+N = 200_000
+METADATA = {"message_id": "4f1c2a7e-0000-0000-0000-000000000000", "conversation_id": "c-42"}
+
+
+def bench(label: str, fn) -> float:
+    per_op_ns = min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e9
+    print(f"{label:<28} {per_op_ns:8.0f} ns/op")
+    return per_op_ns
+
+
+def main():
+    print(f"Message construction ({N:,} ops, best of 5)")
+    validated = bench(
+        "Message(...) validated",
+        lambda: Message(sender="user", receiver="echo", content="hello", metadata=METADATA),
+    )
+    trusted = bench(
+        "Message.trusted(...)",
+        lambda: Message.trusted(sender="user", receiver="echo", content="hello", metadata=METADATA),
+    )
+    bare_validated = bench(
+        "Message(...) no metadata",
+        lambda: Message(sender="user", receiver="echo", content="hello"),
+    )
+    bare_trusted = bench(
+        "Message.trusted no metadata",
+        lambda: Message.trusted(sender="user", receiver="echo", content="hello"),
+    )
+    msg = Message(sender="user", receiver="echo", content="hello", metadata=METADATA)
+    bench("copy_with_new_content", lambda: msg.copy_with_new_content("reply"))
+    print(f"per-hop saving: {validated - trusted:.0f} ns ({validated / trusted:.2f}x)")
+    print(f"without metadata: {bare_validated / bare_trusted:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
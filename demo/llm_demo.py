@@ -16,6 +16,7 @@ sys.path.insert(0, project_root)
 
 from MultiProdigy.llm.factory import LLMFactory
 from MultiProdigy.llm.base import LLMConfig, LLMProvider
+from MultiProdigy.llm.context import ContextManager
 
 async def demo_provider(provider_name: str, model: str, api_key: str = None):
     """Demo a specific LLM provider"""
@@ -141,6 +142,7 @@ async def demo_agent_integration():
                 model=model,
                 temperature=0.7
             )
+            self.context = ContextManager(max_tokens=2000, summarizer=self.llm)
         
         async def analyze_task(self, task: str) -> str:
             """Analyze a task using LLM"""
@@ -149,11 +151,12 @@ async def demo_agent_integration():
             return response.content
         
         async def chat_with_user(self, user_message: str, context: list = None) -> str:
-            """Chat with user using conversation context"""
-            messages = context or []
-            messages.append({"role": "user", "content": user_message})
-            
-            response = await self.llm.chat(messages)
+            """Chat with user using token-bounded conversation context"""
+            # Earlier turns are only seeded once; afterwards the manager keeps the history
+            if not self.context.history("user"):
+                for turn in context or []:
+                    self.context.add("user", turn["role"], turn["content"])
+            response = await self.context.chat(self.llm, "user", user_message)
             return response.content
     
     # Create intelligent agent
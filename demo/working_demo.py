@@ -21,6 +21,7 @@ from MultiProdigy.bus.message_bus import MessageBus
 from MultiProdigy.schemas.message import Message
 from MultiProdigy.observability.dashboard import ObservabilityDashboard
 from MultiProdigy.llm.factory import LLMFactory
+from MultiProdigy.llm.context import ContextManager
 
 class SyncLLMAgent(BaseAgent):
     """Agent that uses LLM with proper sync handling"""
@@ -30,6 +31,8 @@ class SyncLLMAgent(BaseAgent):
         self.api_keys = api_keys or {}
         self.llm_client = None
         self.provider_name = "none"
+        # Per-sender history, trimmed so every request stays within the token budget
+        self.context = ContextManager(max_tokens=2000)
         self._initialize_best_llm()
     
     def _initialize_best_llm(self):
@@ -82,11 +85,10 @@ class SyncLLMAgent(BaseAgent):
             # Use asyncio.run to handle async LLM call in sync context
             import asyncio
             
-            # Create a simple prompt
-            prompt = f"Please provide a helpful response to: {message.content}"
-            
-            # Run the async LLM call
-            response = asyncio.run(self.llm_client.generate(prompt))
+            # Run the async LLM call with this sender's bounded conversation history
+            response = asyncio.run(
+                self.context.chat(self.llm_client, message.sender, message.content)
+            )
             
             if response.content and not response.content.startswith("❌"):
                 result = f"🤖 {self.provider_name} Response:\n\n{response.content}"
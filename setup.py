@@ -24,6 +24,7 @@ setup(
             "python-multipart>=0.0.6",
             "structlog>=23.1.0",
             "pyyaml>=6.0",
+            "numpy>=1.24.0",
             "python-dotenv>=1.0.0",
         ],
         "dev": [
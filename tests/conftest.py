@@ -0,0 +1,51 @@
+import pytest
+
+
+def _task_pool(strategy="least_loaded", retry_delay=0, max_tasks=2, worker_cls=None, **params):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.agents.task_manager_agent import TaskManagerAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.agent_config import AgentConfig
+
+    class Collector(BaseAgent):
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.results = []
+
+        def on_message(self, message):
+            self.results.append(message)
+
+    class HeldWorker(BaseAgent):
+        """Holds tasks until the test releases them."""
+
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.held = []
+
+        def on_message(self, message):
+            self.held.append(message)
+
+        def finish(self, status=None):
+            message = self.held.pop(0)
+            extra = {"task_status": status} if status else {}
+            self.reply(message, f"done: {message.content}", **extra)
+
+    bus = MessageBus()
+    config = AgentConfig(name="manager", max_tasks=max_tasks, retry_delay=retry_delay)
+    manager = TaskManagerAgent(config, bus, workers=["w1", "w2"], strategy=strategy, **params)
+    workers = [(worker_cls or HeldWorker)(name, bus) for name in ("w1", "w2")]
+    client = Collector("client", bus)
+    for agent in (manager, client, *workers):
+        bus.register(agent)
+    return bus, manager, workers, client
+
+
+@pytest.fixture
+def task_pool():
+    """Factory for a TaskManagerAgent with workers w1 and w2 and a collecting client.
+
+    Returns ``(bus, manager, workers, client)``. By default workers hold tasks
+    until the test calls ``finish(status=None)`` on them. Extra keyword arguments
+    go to the TaskManagerAgent.
+    """
+    return _task_pool
@@ -0,0 +1,88 @@
+import asyncio
+import gc
+from unittest.mock import patch
+
+
+def _make_slow_agent(bus):
+    from MultiProdigy.agents.agent_base import BaseAgent
+
+    class SlowLLMAgent(BaseAgent):
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.done = []
+
+        async def on_message(self, message):
+            await asyncio.sleep(0.05)
+            self.done.append(message.content)
+
+    return SlowLLMAgent("llm", bus)
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_async_handler_runs_on_runtime_loop(mock_tracer):
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    mock_tracer.start_trace.side_effect = (
+        lambda **kwargs: f"trace-{kwargs['metadata']['content_length']}"
+    )
+    bus = MessageBus()
+    agent = _make_slow_agent(bus)
+
+    futures = [
+        agent.handle_message(Message(sender="user", receiver="llm", content="x" * i))
+        for i in range(1, 21)
+    ]
+    # Handlers overlap: 20 x 50 ms finishes well under the sequential 1 s
+    for future in futures:
+        future.result(timeout=0.8)
+
+    assert len(agent.done) == 20
+    assert mock_tracer.end_trace.call_count == 20
+    mock_tracer.end_trace.assert_any_call("trace-1", result={"status": "processed"})
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_async_handler_inside_running_loop(mock_tracer):
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    bus = MessageBus()
+    agent = _make_slow_agent(bus)
+
+    async def main():
+        task = agent.handle_message(Message(sender="user", receiver="llm", content="hi"))
+        assert isinstance(task, asyncio.Task)
+        await task
+
+    asyncio.run(main())
+    assert agent.done == ["hi"]
+    mock_tracer.end_trace.assert_called_once()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_failed_fire_and_forget_handler_is_not_reported_unretrieved(mock_tracer):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    class FailingAgent(BaseAgent):
+        async def on_message(self, message):
+            raise ValueError("boom")
+
+    unhandled = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: unhandled.append(ctx))
+        agent = FailingAgent("bad", MessageBus())
+        task = agent.handle_message(Message(sender="user", receiver="bad", content="hi"))
+        await asyncio.sleep(0.01)
+        assert task.done()
+        del task  # never awaited: asyncio reports unretrieved errors when it is collected
+        gc.collect()
+
+    asyncio.run(main())
+    assert unhandled == []
+    mock_tracer.end_trace.assert_called_once_with(
+        mock_tracer.start_trace.return_value, error="boom"
+    )
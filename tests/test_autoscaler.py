@@ -0,0 +1,85 @@
+from concurrent.futures import Future
+
+import pytest
+
+
+class HeldReplica:
+    def __init__(self, name, bus):
+        self.name = name
+        self.pending = []
+
+    def handle_message(self, message):
+        future = Future()
+        self.pending.append(future)
+        return future
+
+
+def _publish(bus, count):
+    from MultiProdigy.schemas.message import Message
+
+    for i in range(count):
+        bus.publish(Message(sender="user", receiver="worker", content=str(i)))
+
+
+def test_autoscaler_scales_with_hysteresis_and_cooldown():
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.autoscaler import Autoscaler
+
+    bus = MessageBus()
+    scaler = Autoscaler(
+        bus,
+        "worker",
+        HeldReplica,
+        min_replicas=1,
+        max_replicas=4,
+        scale_up_depth=4,
+        scale_down_depth=1,
+        sustain=2,
+        cooldown=10,
+    )
+    assert scaler.replicas == 1
+
+    _publish(bus, 12)
+    assert scaler.tick(now=0) == 1  # one hot reading is not enough
+    assert scaler.tick(now=1) == 3  # sustained: jump to ceil(12 / 4) replicas
+    _publish(bus, 40)
+    assert scaler.tick(now=2) == 3 and scaler.tick(now=3) == 3  # cooling down
+    assert scaler.tick(now=12) == 4  # capped at max_replicas
+
+    for agent in list(bus.agents.values()):
+        for future in agent.pending:
+            future.set_result(None)
+    # An idle pool shrinks one replica per sustained reading, after the cooldown
+    assert scaler.tick(now=30) == 4
+    assert scaler.tick(now=31) == 3
+    assert scaler.tick(now=32) == 3
+    for now in range(50, 200, 5):
+        scaler.tick(now=now)
+    assert scaler.replicas == 1
+    assert [after for _, _, after, _ in scaler.events] == [3, 4, 3, 2, 1]
+
+
+def test_autoscaler_reacts_to_latency_and_validates_bounds():
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.autoscaler import Autoscaler
+
+    with pytest.raises(ValueError):
+        Autoscaler(MessageBus(), "worker", HeldReplica, min_replicas=3, max_replicas=2)
+
+    bus = MessageBus()
+    scaler = Autoscaler(
+        bus,
+        "worker",
+        HeldReplica,
+        min_replicas=2,
+        max_replicas=3,
+        target_latency=0.0,
+        sustain=1,
+        cooldown=0,
+    )
+    assert scaler.replicas == 2
+    _publish(bus, 2)
+    for agent in list(bus.agents.values()):
+        for future in agent.pending:
+            future.set_result(None)
+    assert scaler.tick(now=0) == 3
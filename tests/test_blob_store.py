@@ -0,0 +1,135 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+
+def test_blob_store_dedup_and_gc():
+    from MultiProdigy.storage.blob_store import BlobStore
+
+    with tempfile.TemporaryDirectory() as root:
+        store = BlobStore(root)
+        image = b"\x89PNG" + b"\x00" * 4096
+
+        first = store.put(image)
+        second = store.put(image)
+        assert first == second
+        assert len(list(Path(root).glob("??/*"))) == 1  # stored once
+        assert bytes(store.open(first)) == image
+
+        store.release(first)
+        assert store.gc() == 0
+        store.release(first)
+        assert store.gc() == 1
+        assert first not in store
+
+
+def test_blob_refcounts_survive_restart_and_pin_deliveries():
+    import threading
+
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.agent_config import AgentConfig
+    from MultiProdigy.schemas.message import Message
+    from MultiProdigy.storage.blob_store import BlobStore
+
+    with tempfile.TemporaryDirectory() as root:
+        store = BlobStore(root)
+        kept = store.put(b"kept")
+        orphan = store.put(b"orphan")
+        # A blob whose reference was never recorded, e.g. left by an older version
+        stray = store.path_for("ab" * 32)
+        stray.parent.mkdir(parents=True, exist_ok=True)
+        stray.write_bytes(b"stray")
+        store.release(orphan)
+
+        restarted = BlobStore(root)
+        assert restarted.refcounts == {kept: 1, orphan: 0}
+        assert restarted.gc() == 2
+        assert kept in restarted and orphan not in restarted
+
+        # The bus holds a reference while a delivery is queued or running
+        started, finish = threading.Event(), threading.Event()
+
+        class Blocking:
+            name = "slow"
+            config = AgentConfig(name="slow", max_tasks=1)
+
+            def handle_message(self, message):
+                started.set()
+                finish.wait(5)
+
+        bus = MessageBus()
+        bus.blob_store = restarted
+        bus.register(Blocking())
+        msg = Message(sender="u", receiver="slow", content="x").attach(b"photo", store=restarted)
+        restarted.release(msg.attachments[0].digest)  # the sender lets go right away
+        threading.Thread(target=bus.publish, args=(msg,)).start()
+        assert started.wait(5)
+        bus.publish(msg)  # queued behind the first delivery
+        assert restarted.refcounts[msg.attachments[0].digest] == 2
+        assert restarted.gc() == 0
+        assert bus.cancel_pending() == 1
+        finish.set()
+        for _ in range(100):
+            if restarted.refcounts[msg.attachments[0].digest] == 0:
+                break
+            time.sleep(0.01)
+        assert restarted.gc() == 1
+
+
+def test_message_attachments_traced_by_digest():
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.bus.codec import MessageDecoder, encode_message
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.observability.tracer import AgentTracer
+    from MultiProdigy.schemas.message import Message
+    from MultiProdigy.storage.blob_store import BlobStore
+
+    class Receiver(BaseAgent):
+        def on_message(self, message):
+            self.data = bytes(message.open_attachment(store=store))
+
+    with tempfile.TemporaryDirectory() as root:
+        store = BlobStore(Path(root) / "blobs")
+        video = bytes(range(256)) * 4096
+        msg = Message(sender="a", receiver="b", content="see video").attach(
+            video, media_type="video/mp4", store=store
+        )
+        assert msg.attachments[0].size == len(video)
+
+        # Attachments survive the wire codec as references only
+        frame = encode_message(msg)
+        assert len(frame) < 1024
+        assert MessageDecoder().decode(frame).to_message() == msg
+
+        tracer = AgentTracer(log_file=str(Path(root) / "traces.jsonl"))
+        bus = MessageBus()
+        bus.blob_store = store
+        sender = Receiver("sender", bus)
+        receiver = Receiver("receiver", bus)
+        bus.register(receiver)
+        with patch("MultiProdigy.agents.agent_base.tracer", tracer):
+            sender.send("see video", "receiver", attachments=msg.attachments)
+
+        assert receiver.data == video
+        log = (Path(root) / "traces.jsonl").read_text()
+        assert len(log) < 2048
+        sent = json.loads(log.splitlines()[0])
+        assert sent["attachments"] == [msg.attachments[0].digest]
+
+
+def test_importing_the_bus_creates_no_blob_store(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import MultiProdigy.bus.message_bus, MultiProdigy.schemas.message\n"
+        "from MultiProdigy.storage import blob_store as module\n"
+        "assert module._default_store is None\n"
+    )
+    env = {**os.environ, "HOME": str(tmp_path)}
+    env.pop("MULTIPRODIGY_BLOB_DIR", None)
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+    assert not (tmp_path / ".multiprodigy").exists()
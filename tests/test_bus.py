@@ -17,3 +17,40 @@ def test_message_bus_register_and_send():
 
     bus.publish(msg)
     assert agent.received[0].content == "hello"
+
+
+def test_message_bus_assigns_integer_ids():
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    class DummyAgent:
+        def __init__(self, name):
+            self.name = name
+            self.received = []
+
+        def handle_message(self, message):
+            self.received.append(message)
+
+    bus = MessageBus()
+    alpha, beta = DummyAgent("".join(["al", "pha"])), DummyAgent("beta")
+    bus.register(alpha)
+    bus.register(beta)
+
+    assert bus.agent_id("alpha") == 0 and bus.agent_id("beta") == 1
+    assert bus.agent_name(1) == "beta"
+    assert alpha.name is bus.agent_name(0)
+
+    bus.publish(Message(sender="beta", receiver="alpha", content="hi"))
+    assert alpha.received[0].content == "hi"
+
+    # Unregistered agents stop reporting; ids come back on re-register
+    bus.set_concurrency_limit("alpha", 2)
+    bus.unregister("alpha")
+    assert bus.agent_id("alpha") is None and "alpha" not in bus.utilisation()
+    assert bus.resolve(Message(sender="beta", receiver="alpha", content="?")) is None
+    bus.publish(Message(sender="beta", receiver="alpha", content="lost"))
+    replacement = DummyAgent("alpha")
+    bus.register(replacement)
+    assert bus.agent_id("alpha") == 0
+    bus.publish(Message(sender="beta", receiver="alpha", content="again"))
+    assert [m.content for m in replacement.received] == ["again"]
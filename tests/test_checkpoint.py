@@ -0,0 +1,96 @@
+from unittest.mock import patch
+
+
+def test_checkpoint_store_deltas_compaction_and_torn_tail(tmp_path):
+    from MultiProdigy.storage.checkpoint import CheckpointStore
+
+    store = CheckpointStore(tmp_path, compact_every=2)
+    assert store.save("agent", {"a": 1, "b": 2}) == "full"
+    size = store.path_for("agent").stat().st_size
+    assert store.save("agent", {"a": 1, "b": 2}) == "unchanged"
+    assert store.save("agent", {"a": 1, "b": 3, "c": 4}) == "delta"
+    assert store.save("agent", {"a": 1, "c": 4}) == "delta"
+    assert store.path_for("agent").stat().st_size > size
+    assert CheckpointStore(tmp_path).load("agent") == {"a": 1, "c": 4}
+    assert store.save("agent", {"a": 5, "c": 4}) == "full"  # compacted
+
+    # A crash mid-append leaves a partial frame; the last good state survives
+    store.save("agent", {"a": 6, "c": 4})
+    with open(store.path_for("agent"), "ab") as f:
+        f.write(b"\x01\xff\x00\x00\x00garbage")
+    reloaded = CheckpointStore(tmp_path)
+    assert reloaded.load("agent") == {"a": 6, "c": 4}
+    assert reloaded.save("agent", {"a": 7, "c": 4}) == "delta"
+    assert CheckpointStore(tmp_path).load("agent") == {"a": 7, "c": 4}
+    assert store.load("missing") is None
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_memory_and_task_manager_warm_restart(mock_tracer, tmp_path):
+    from MultiProdigy.agents.echo_agent import EchoAgent
+    from MultiProdigy.agents.memory_agent import MemoryAgent
+    from MultiProdigy.agents.task_manager_agent import TaskManagerAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.checkpointer import Checkpointer
+    from MultiProdigy.schemas.agent_config import AgentConfig
+    from MultiProdigy.storage.checkpoint import CheckpointStore
+
+    bus = MessageBus()
+    memory = MemoryAgent("memory", bus)
+    manager = TaskManagerAgent(AgentConfig(name="manager"), bus)  # no workers yet
+    for agent in (memory, manager):
+        bus.register(agent)
+    memory.memory.add("the launch is on friday", conversation_id="c1")
+    memory.memory.add("budget approved")
+    manager.submit("pending job", requester="memory")
+
+    checkpointer = Checkpointer(bus, CheckpointStore(tmp_path))
+    assert checkpointer.checkpoint_all() == {"memory": "full", "manager": "full"}
+    memory.memory.add("a third memory")
+    assert checkpointer.checkpoint_all() == {"memory": "delta", "manager": "unchanged"}
+
+    # Fresh process: same agents, empty state
+    bus = MessageBus()
+    memory = MemoryAgent("memory", bus)
+    manager = TaskManagerAgent(AgentConfig(name="manager"), bus)
+    echo = EchoAgent("worker", bus)
+    for agent in (memory, manager, echo):
+        bus.register(agent)
+    timings = Checkpointer(bus, CheckpointStore(tmp_path)).restore_all()
+    assert set(timings) == {"memory", "manager"}
+
+    assert len(memory.memory) == 3
+    assert memory.memory.search("launch", conversation_id="c1")[0][0].text.startswith("the launch")
+    assert memory.memory.add("new").id == 3
+    assert manager.stats()["queued"] == 1
+    manager.add_worker("worker")
+    assert manager.stats()["completed"] == 1
+    assert manager.submit("next") == "manager-2"
+
+
+def test_checkpoint_store_sees_values_mutated_in_place(tmp_path):
+    from MultiProdigy.storage.checkpoint import CheckpointStore
+
+    store = CheckpointStore(tmp_path)
+    state = {"task": {"attempts": 1}, "other": [1]}
+    store.save("agent", state)
+    state["task"]["attempts"] = 2
+    assert store.save("agent", state) == "delta"
+    assert CheckpointStore(tmp_path).load("agent") == {"task": {"attempts": 2}, "other": [1]}
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_restore_waits_for_start(mock_tracer, task_pool):
+    _, manager, _, _ = task_pool()
+    manager.submit("pool job")
+    manager.submit("targeted job", agent="w2")
+    state = manager.snapshot()
+
+    _, manager, (w1, w2), _ = task_pool()
+    manager.restore(state)
+    assert not w1.held and not w2.held  # restore never sends
+    manager.start()
+    assert [m.content for m in w2.held].count("targeted job") == 1
+    assert sorted(m.content for m in w1.held + w2.held) == ["pool job", "targeted job"]
+    manager.start()  # nothing left to dispatch
+    assert len(w1.held) + len(w2.held) == 2
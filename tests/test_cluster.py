@@ -0,0 +1,242 @@
+import threading
+from unittest.mock import patch
+
+
+def _collector(name, bus, expected):
+    from MultiProdigy.agents.agent_base import BaseAgent
+
+    class Collector(BaseAgent):
+        def __init__(self):
+            super().__init__(name, bus)
+            self.received = []
+            self.done = threading.Event()
+
+        def on_message(self, message):
+            self.received.append(message)
+            if len(self.received) == expected:
+                self.done.set()
+
+    return Collector()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_cluster_routes_messages_between_nodes_by_name(mock_tracer):
+    from MultiProdigy.agents.echo_agent import EchoAgent
+    from MultiProdigy.bus.cluster import ClusterNode
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    bus_a, bus_b, bus_c = MessageBus(), MessageBus(), MessageBus()
+    bus_a.register(EchoAgent("echo", bus_a))
+    collector = _collector("collector", bus_b, expected=200)
+    bus_b.register(collector)
+
+    node_a = ClusterNode(bus_a, "a", advertise_interval=0.05)
+    seed = node_a.start()
+    node_b = ClusterNode(bus_b, "b", seeds=[seed], advertise_interval=0.05)
+    node_b.start()
+    # c only knows b, and meets a through b's peer list
+    node_c = ClusterNode(bus_c, "c", seeds=[node_b.address], advertise_interval=0.05)
+    node_c.start()
+    try:
+        assert node_b.wait_for_agent("echo", 5)
+        # b -> a (echo) -> b (collector): many messages pipelined on one connection
+        for i in range(200):
+            bus_b.publish(Message(sender="collector", receiver="echo", content=f"m{i}"))
+        assert collector.done.wait(5)
+        assert [m.content for m in collector.received] == [f"Echo: m{i}" for i in range(200)]
+        assert node_b.forwarded == 200 and node_a.received == 200
+
+        # Agents registered later are advertised; c reaches both nodes by name
+        late = _collector("late", bus_c, expected=1)
+        bus_c.register(late)
+        assert node_a.wait_for_agent("late", 5) and node_c.wait_for_agent("echo", 5)
+        bus_c.publish(Message(sender="late", receiver="echo", content="hi"))
+        assert late.done.wait(5)
+        assert late.received[0].content == "Echo: hi" and late.received[0].sender == "echo"
+        assert set(node_a.peers) == {"b", "c"} and set(node_c.peers) == {"a", "b"}
+    finally:
+        for node in (node_c, node_b, node_a):
+            node.stop()
+    assert bus_b.remote is None
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_cluster_forgets_routes_of_a_stopped_node(mock_tracer):
+    from MultiProdigy.agents.echo_agent import EchoAgent
+    from MultiProdigy.bus.cluster import ClusterNode
+    from MultiProdigy.bus.message_bus import MessageBus
+
+    bus_a, bus_b = MessageBus(), MessageBus()
+    bus_a.register(EchoAgent("echo", bus_a))
+    node_a = ClusterNode(bus_a, "a")
+    node_b = ClusterNode(bus_b, "b", seeds=[node_a.start()])
+    node_b.start()
+    try:
+        assert node_b.wait_for_agent("echo", 5)
+        node_a.withdraw()
+        with node_b._routes_changed:
+            assert node_b._routes_changed.wait_for(lambda: "echo" not in node_b.routes, 5)
+        node_a.stop()
+        with node_b._routes_changed:
+            assert node_b._routes_changed.wait_for(lambda: not node_b.peers, 5)
+    finally:
+        node_b.stop()
+        node_a.stop()
+
+
+@patch("MultiProdigy.runtime.runtime.tracer")
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_runtimes_form_a_cluster_from_their_specs(mock_tracer, runtime_tracer):
+    from MultiProdigy.runtime.runtime import Runtime
+    from MultiProdigy.schemas.message import Message
+
+    first = Runtime(
+        {"cluster": {"node_id": "first"}, "agents": [{"name": "memory", "type": "memory"}]}
+    )
+    first.start()
+    second = Runtime(
+        {
+            "cluster": {"node_id": "second", "seeds": [first.node.address]},
+            "agents": [{"name": "asker", "type": "user"}],
+        }
+    )
+    second.start()
+    try:
+        assert second.node.wait_for_agent("memory", 5)
+        second.bus.publish(Message(sender="asker", receiver="memory", content="remember me"))
+        memory = first.agents["memory"]
+        for _ in range(100):
+            if len(memory.memory):
+                break
+            threading.Event().wait(0.02)
+        assert list(memory.memory) == ["remember me"]
+    finally:
+        assert second.stop(deadline=2)["drained"]
+        assert first.stop(deadline=2)["drained"]
+
+
+def _wait_until(condition, timeout=5):
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return True
+        threading.Event().wait(0.02)
+    return condition()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_cluster_drops_messages_bouncing_between_stale_routes(mock_tracer):
+    from MultiProdigy.bus.cluster import ClusterNode
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    bus_a, bus_b = MessageBus(), MessageBus()
+    node_a = ClusterNode(bus_a, "a", advertise_interval=60, max_hops=4)
+    node_b = ClusterNode(bus_b, "b", seeds=[node_a.start()], advertise_interval=60, max_hops=4)
+    node_b.start()
+    try:
+        assert _wait_until(lambda: "b" in node_a.peers and "a" in node_b.peers)
+        # Each node believes the other hosts "ghost"
+        node_a.routes["ghost"], node_b.routes["ghost"] = "b", "a"
+        bus_a.publish(Message(sender="user", receiver="ghost", content="lost"))
+        assert _wait_until(lambda: node_a.dropped + node_b.dropped == 1)
+        assert node_a.forwarded + node_b.forwarded == 4
+    finally:
+        node_b.stop()
+        node_a.stop()
+
+
+def test_cluster_requires_a_matching_token():
+    import pytest
+
+    from MultiProdigy.bus.cluster import ClusterNode
+    from MultiProdigy.bus.message_bus import MessageBus
+
+    with pytest.raises(ValueError, match="token"):
+        ClusterNode(MessageBus(), "open", host="0.0.0.0")
+
+    node_a = ClusterNode(MessageBus(), "a", token="secret")
+    seed = node_a.start()
+    intruder = ClusterNode(MessageBus(), "x", seeds=[seed], token="guess", reconnect_interval=60)
+    member = ClusterNode(MessageBus(), "b", seeds=[seed], token="secret")
+    intruder.start()
+    member.start()
+    try:
+        assert _wait_until(lambda: "b" in node_a.peers)
+        assert "x" not in node_a.peers
+    finally:
+        for node in (member, intruder, node_a):
+            node.stop()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_cluster_never_sends_the_token_or_agents_before_authentication(mock_tracer):
+    import json
+    import socket
+
+    from MultiProdigy.agents.echo_agent import EchoAgent
+    from MultiProdigy.bus.cluster import _U32, CONTROL, ClusterNode, parse_address
+    from MultiProdigy.bus.message_bus import MessageBus
+
+    bus = MessageBus()
+    bus.register(EchoAgent("echo", bus))
+    node = ClusterNode(bus, "a", token="secret")
+    address = parse_address(node.start())
+    try:
+        # An unauthenticated client only ever sees a nonce
+        with socket.create_connection(address, timeout=2) as sock:
+            sock.settimeout(0.3)
+            received = b""
+            try:
+                while chunk := sock.recv(4096):
+                    received += chunk
+            except socket.timeout:
+                pass
+            assert b"secret" not in received and b"echo" not in received
+            (length,) = _U32.unpack_from(received)
+            assert received[4] == CONTROL and len(received) == 4 + length
+            assert json.loads(received[5:])["type"] == "challenge"
+
+            # Even the right token sent in a plain HELLO is refused
+            body = json.dumps({"type": "hello", "node": "x", "token": "secret", "agents": []})
+            sock.sendall(_U32.pack(len(body) + 1) + bytes((CONTROL,)) + body.encode())
+            sock.settimeout(2)
+            assert sock.recv(4096) == b""
+        assert "x" not in node.peers
+    finally:
+        node.stop()
+
+
+def test_duplicate_connection_hands_queued_messages_to_the_survivor():
+    import asyncio
+
+    from MultiProdigy.bus.cluster import _U32, _Peer
+    from MultiProdigy.bus.codec import MessageDecoder
+    from MultiProdigy.schemas.message import Message
+
+    class Writer:
+        def __init__(self):
+            self.data = b""
+
+        def write(self, data):
+            self.data += data
+
+        def close(self):
+            pass
+
+    async def main():
+        closing, surviving = _Peer(None, Writer(), True), _Peer(None, Writer(), False)
+        closing.queue(Message(sender="a", receiver="b", content="queued"))
+        closing.hand_over(surviving)
+        closing.queue(Message(sender="a", receiver="b", content="late"))
+        await asyncio.sleep(0)
+        return closing.writer.data, surviving.writer.data
+
+    closed_data, data = asyncio.run(main())
+    assert closed_data == b""
+    decoder, contents = MessageDecoder(), []
+    while data:
+        (length,) = _U32.unpack_from(data)
+        contents.append(decoder.decode(data[: _U32.size + length]).to_message().content)
+        data = data[_U32.size + length :]
+    assert contents == ["queued", "late"]
@@ -0,0 +1,80 @@
+import pytest
+
+
+def test_codec_round_trip_and_interning():
+    from MultiProdigy.bus.codec import MessageDecoder, MessageEncoder
+    from MultiProdigy.schemas.message import Message
+
+    encoder = MessageEncoder(compress_threshold=None)
+    decoder = MessageDecoder()
+    messages = [
+        Message(sender="user", receiver="echo", content=f"hello {i} ✓", metadata={"i": i})
+        for i in range(3)
+    ]
+
+    frames = [encoder.encode(msg) for msg in messages]
+    decoded = [decoder.decode(frame).to_message() for frame in frames]
+
+    assert decoded == messages
+    # Names are sent once, later frames only carry table references
+    assert len(frames[1]) < len(frames[0])
+    assert len(frames[1]) < len(messages[1].model_dump_json())
+
+
+def test_codec_compression_and_zero_copy():
+    from MultiProdigy.bus.codec import FLAG_COMPRESSED, MessageDecoder, encode_message
+    from MultiProdigy.schemas.message import Message
+
+    big = Message(sender="a", receiver="b", content="payload " * 2000)
+    frame = encode_message(big, compress_threshold=1024)
+    assert frame[5] & FLAG_COMPRESSED
+    assert len(frame) < len(big.content) // 10
+    assert MessageDecoder().decode(frame).text() == big.content
+
+    small = encode_message(Message(sender="a", receiver="b", content="hi"))
+    content = MessageDecoder().decode(small).content
+    assert isinstance(content, memoryview)
+    assert content.obj is not None and bytes(content) == b"hi"
+
+
+def test_codec_stream_feed_and_errors():
+    from MultiProdigy.bus.codec import MessageDecoder, MessageEncoder
+    from MultiProdigy.schemas.message import Message
+    from MultiProdigy.support.error import MessageValidationError
+
+    encoder = MessageEncoder()
+    stream = b"".join(
+        encoder.encode(Message(sender="s", receiver="r", content=str(i))) for i in range(5)
+    )
+    decoder = MessageDecoder()
+    first = decoder.feed(stream[:7])
+    rest = decoder.feed(stream[7:])
+    assert first == []
+    assert [d.text() for d in rest] == ["0", "1", "2", "3", "4"]
+
+    bad = bytearray(encoder.encode(Message(sender="s", receiver="r", content="x")))
+    bad[4] = 99
+    with pytest.raises(MessageValidationError):
+        MessageDecoder().decode(bytes(bad))
+
+
+def test_codec_wraps_malformed_fields_and_bounds_decompression():
+    from MultiProdigy.bus.codec import MessageDecoder, MessageEncoder
+    from MultiProdigy.schemas.message import Message
+    from MultiProdigy.support.error import MessageValidationError
+
+    frame = MessageEncoder().encode(
+        Message(sender="s", receiver="r", content="café", metadata={"k": "v"})
+    )
+    bad_json = frame.replace(b'{"k":"v"}', b'{"k":"v"!')
+    with pytest.raises(MessageValidationError, match="Malformed"):
+        MessageDecoder().decode(bad_json)
+    bad_utf8 = frame.replace(b"\xc3\xa9", b"\xc3\x28")
+    with pytest.raises(MessageValidationError, match="UTF-8"):
+        MessageDecoder().decode(bad_utf8).to_message()
+
+    bomb = MessageEncoder().encode(Message(sender="s", receiver="r", content="a" * 1_000_000))
+    assert len(bomb) < 10_000
+    with pytest.raises(MessageValidationError, match="exceeds 1000 bytes"):
+        MessageDecoder(max_content_size=1000).decode(bomb)
+    assert len(MessageDecoder().decode(bomb).text()) == 1_000_000
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_bus_caps_in_flight_async_messages(mock_tracer):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.agent_config import AgentConfig
+    from MultiProdigy.schemas.message import Message
+
+    class RateLimitedLLMAgent(BaseAgent):
+        def __init__(self, config, bus):
+            super().__init__(config.name, bus)
+            self.config = config
+            self.active = 0
+            self.peak = 0
+            self.done = threading.Event()
+            self.count = 0
+
+        async def on_message(self, message):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.02)
+            self.active -= 1
+            self.count += 1
+            if self.count == 12:
+                self.done.set()
+
+    bus = MessageBus()
+    agent = RateLimitedLLMAgent(AgentConfig(name="llm", max_tasks=3), bus)
+    bus.register(agent)
+
+    for i in range(12):
+        bus.publish(Message(sender="user", receiver="llm", content=str(i)))
+
+    stats = bus.utilisation()["llm"]
+    assert stats["in_flight"] == 3 and stats["queued"] == 9
+
+    assert agent.done.wait(2)
+    time.sleep(0.05)
+    assert agent.peak == 3
+    stats = bus.utilisation()["llm"]
+    assert stats["completed"] == 12 and stats["queued"] == 0 and stats["in_flight"] == 0
+
+
+def test_limiter_queues_reentrant_sync_messages_in_order():
+    from MultiProdigy.runtime.concurrency import ConcurrencyLimiter
+
+    limiter = ConcurrencyLimiter(max_tasks=1)
+    seen = []
+
+    def handler(message):
+        seen.append(message)
+        if message == "first":
+            # Re-entrant delivery while the only slot is held gets queued
+            limiter.submit(handler, "second")
+            assert seen == ["first"]
+
+    limiter.submit(handler, "first")
+    assert seen == ["first", "second"]
+    assert limiter.stats()["peak_queued"] == 1
+
+
+def test_limiter_keeps_draining_after_a_handler_raises():
+    import pytest
+
+    from MultiProdigy.runtime.concurrency import ConcurrencyLimiter
+
+    limiter = ConcurrencyLimiter(max_tasks=1)
+    seen = []
+
+    def handler(message):
+        seen.append(message)
+        if message == "first":
+            limiter.submit(handler, "bad")
+            limiter.submit(handler, "after")
+        if message == "bad":
+            raise ValueError("boom")
+
+    limiter.submit(handler, "first")
+    assert seen == ["first", "bad", "after"]
+    assert limiter.in_flight == 0 and not limiter.queue
+
+    # The caller whose own delivery failed still sees the error
+    with pytest.raises(ValueError):
+        limiter.submit(handler, "bad")
+    assert limiter.in_flight == 0
+
+
+def test_limiter_drains_sync_handlers_off_the_event_loop():
+    from MultiProdigy.runtime.concurrency import ConcurrencyLimiter
+    from MultiProdigy.runtime.event_loop import RuntimeLoop
+
+    loop = RuntimeLoop("limiter-test")
+    limiter = ConcurrencyLimiter(max_tasks=1)
+    threads = {}
+    done = threading.Event()
+
+    async def work():
+        await asyncio.sleep(0.01)
+
+    def async_handler(message):
+        return loop.submit(work())
+
+    def sync_handler(message):
+        threads[message] = threading.current_thread()
+        done.set()
+
+    try:
+        limiter.submit(async_handler, "async")
+        limiter.submit(sync_handler, "sync")
+        assert done.wait(2)
+        assert threads["sync"] is not loop._thread
+    finally:
+        loop.stop()
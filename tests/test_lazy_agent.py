@@ -0,0 +1,108 @@
+import threading
+import time
+from unittest.mock import patch
+
+
+def _memory_factory(built, gate=None):
+    from MultiProdigy.agents.memory_agent import MemoryAgent
+
+    def factory(name, bus):
+        if gate is not None:
+            gate.wait(1)
+        built.append(name)
+        return MemoryAgent(name, bus)
+
+    return factory
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_lazy_agent_builds_on_first_message_and_buffers(mock_tracer):
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    bus = MessageBus()
+    built, gate = [], threading.Event()
+    lazy = bus.register_lazy("memory", _memory_factory(built, gate))
+    assert built == [] and lazy.state == "cold"
+
+    futures = [
+        lazy.handle_message(Message(sender="user", receiver="memory", content=f"note {i}"))
+        for i in range(3)
+    ]
+    assert lazy.state == "building" and not any(f.done() for f in futures)
+    gate.set()
+    for future in futures:
+        future.result(timeout=1)
+
+    assert built == ["memory"] and lazy.state == "ready"
+    assert list(lazy.agent.memory) == ["note 0", "note 1", "note 2"]
+    bus.publish(Message(sender="user", receiver="memory", content="note 3"))
+    assert len(lazy.agent.memory) == 4 and lazy.builds == 1
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_lazy_agent_idle_eviction_keeps_state(mock_tracer, tmp_path):
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.lazy import LazyAgent
+    from MultiProdigy.schemas.message import Message
+    from MultiProdigy.storage.checkpoint import CheckpointStore
+
+    bus = MessageBus()
+    built = []
+    store = CheckpointStore(tmp_path)
+    lazy = LazyAgent(
+        "memory", bus, _memory_factory(built), idle_timeout=0.05, store=store, background=False
+    )
+    bus.register(lazy)
+
+    bus.publish(Message(sender="user", receiver="memory", content="remember the milk"))
+    assert lazy.state == "ready"
+    deadline = time.monotonic() + 2
+    while lazy.state != "cold" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert lazy.state == "cold" and lazy.agent is None and lazy.evictions == 1
+
+    bus.publish(Message(sender="user", receiver="memory", content="and the eggs"))
+    assert built == ["memory", "memory"]
+    assert list(lazy.agent.memory) == ["remember the milk", "and the eggs"]
+
+
+def test_lazy_agent_build_failure_fails_buffered_messages():
+    import pytest
+
+    from MultiProdigy.runtime.lazy import LazyAgent
+    from MultiProdigy.schemas.message import Message
+
+    def broken(name, bus):
+        raise RuntimeError("model not found")
+
+    lazy = LazyAgent("llm", None, broken, background=False)
+    future = lazy.handle_message(Message(sender="user", receiver="llm", content="hi"))
+    with pytest.raises(RuntimeError):
+        future.result(timeout=1)
+    assert lazy.state == "cold"
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_lazy_agent_eviction_awaits_close(mock_tracer):
+    import asyncio
+
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    closed = []
+
+    class SessionAgent(BaseAgent):
+        def on_message(self, message):
+            pass
+
+        async def close(self):
+            await asyncio.sleep(0.05)
+            closed.append(self.name)
+
+    bus = MessageBus()
+    lazy = bus.register_lazy("session", SessionAgent, idle_timeout=60)
+    lazy.handle_message(Message(sender="user", receiver="session", content="hi")).result(1)
+    assert lazy.evict_if_idle(now=time.monotonic() + 61)
+    assert closed == ["session"] and lazy.agent is None
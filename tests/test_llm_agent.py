@@ -0,0 +1,150 @@
+import asyncio
+from unittest.mock import patch
+
+from MultiProdigy.llm.base import BaseLLMClient, LLMConfig, LLMResponse
+
+
+class CountingClient(BaseLLMClient):
+    """Fake client that records peak concurrency."""
+
+    def __init__(self, fail=False):
+        super().__init__(LLMConfig(provider="mock", model="fake"))
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self.fail = fail
+        self.closed = False
+
+    async def generate(self, prompt, **kwargs):
+        return await self.chat([{"role": "user", "content": prompt}])
+
+    async def chat(self, messages, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.calls.append(messages)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        metadata = {"error": True} if self.fail else {}
+        return LLMResponse(
+            content=f"answer to {messages[-1]['content']}",
+            provider="mock",
+            model="fake",
+            metadata=metadata,
+        )
+
+    async def close(self):
+        self.closed = True
+
+
+def _setup(**kwargs):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.agents.llm_agent import LLMAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+
+    class Collector(BaseAgent):
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.received = []
+
+        def on_message(self, message):
+            self.received.append(message)
+
+    bus = MessageBus()
+    agent = LLMAgent("llm", bus, **kwargs)
+    user = Collector("user", bus)
+    bus.register(agent)
+    bus.register(user)
+    return bus, agent, user
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_llm_agent_bounds_concurrency_and_replies(mock_tracer):
+    client = CountingClient()
+    bus, agent, user = _setup(client=client, max_concurrency=3, system_prompt="Be brief.")
+
+    futures = [agent.handle_message(_message(f"q{i}")) for i in range(10)]
+    for future in futures:
+        future.result(timeout=2)
+
+    assert client.peak == 3
+    assert client.calls[0][0] == {"role": "system", "content": "Be brief."}
+    assert sorted(m.content for m in user.received) == sorted(f"answer to q{i}" for i in range(10))
+    agent.loop.submit(agent.close()).result(timeout=1)
+    assert client.closed
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_llm_agent_marks_errors_failed_and_uses_context(mock_tracer):
+    from MultiProdigy.llm.context import ContextManager
+
+    bus, agent, user = _setup(client=CountingClient(fail=True))
+    agent.handle_message(_message("q", task_id="manager-1")).result(timeout=2)
+    (reply,) = user.received
+    assert reply.metadata["task_status"] == "failed"
+    assert reply.metadata["task_id"] == "manager-1"
+
+    client = CountingClient()
+    bus, agent, user = _setup(client=client, context=ContextManager(max_tokens=500))
+    agent.handle_message(_message("first")).result(timeout=2)
+    agent.handle_message(_message("second")).result(timeout=2)
+    assert [m["content"] for m in client.calls[-1]] == ["first", "answer to first", "second"]
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_llm_agent_serialises_turns_per_conversation(mock_tracer):
+    from MultiProdigy.llm.context import ContextManager
+
+    client = CountingClient()
+    bus, agent, user = _setup(client=client, context=ContextManager(max_tokens=500))
+    futures = [agent.handle_message(_message(f"q{i}")) for i in range(3)]
+    futures.append(agent.handle_message(_message("other", conversation_id="c2")))
+    for future in futures:
+        future.result(timeout=2)
+
+    # Same conversation: each call sees every earlier turn, answers in place
+    (last,) = [call for call in client.calls if call[-1]["content"] == "q2"]
+    assert [m["content"] for m in last] == ["q0", "answer to q0", "q1", "answer to q1", "q2"]
+    assert client.peak == 2  # the other conversation still ran alongside
+    assert agent._conversations == {}
+
+
+def test_loop_sessions_are_per_event_loop():
+    from MultiProdigy.llm.base import LoopSessions
+
+    class FakeSession:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    sessions = LoopSessions(FakeSession)
+
+    async def use():
+        return sessions.get(), sessions.get()
+
+    first, again = asyncio.run(use())
+    assert first is again
+    second, _ = asyncio.run(use())
+    assert second is not first  # a new loop never reuses the old loop's session
+
+    async def close():
+        await sessions.close()
+
+    asyncio.run(close())
+    assert sessions._sessions == {}
+
+
+def test_llm_agent_defaults_to_factory_client():
+    from MultiProdigy.agents.llm_agent import LLMAgent
+    from MultiProdigy.agents.ollama_agent import OllamaAgent
+    from MultiProdigy.llm.local_client import MockClient, OllamaClient
+
+    assert isinstance(LLMAgent("llm", bus=None).client, MockClient)
+    agent = OllamaAgent(None, model="tinyllama")
+    assert isinstance(agent.client, OllamaClient) and agent.name == "OllamaAgent"
+
+
+def _message(content, **metadata):
+    from MultiProdigy.schemas.message import Message
+
+    return Message(sender="user", receiver="llm", content=content, metadata=metadata)
@@ -0,0 +1,117 @@
+import asyncio
+
+from MultiProdigy.llm.base import LLMResponse
+from MultiProdigy.llm.context import MESSAGE_OVERHEAD, ContextManager, estimate_tokens
+
+
+class RecordingClient:
+    def __init__(self):
+        self.calls = []
+        self.prompts = []
+
+    async def chat(self, messages, **kwargs):
+        self.calls.append(messages)
+        return LLMResponse(content="ok", provider="mock", model="mock-model")
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return LLMResponse(content=f"summary {len(self.prompts)}", provider="mock", model="m")
+
+
+def payload_tokens(messages):
+    return sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD for m in messages)
+
+
+def test_context_trims_to_budget_keeping_newest_turns():
+    context = ContextManager(max_tokens=60, system_prompt="Be brief.")
+    for i in range(20):
+        context.add("c1", "user", f"message number {i} " + "x" * 40)
+
+    messages = context.build("c1")
+    assert messages[0] == {"role": "system", "content": "Be brief."}
+    assert messages[-1]["content"].startswith("message number 19")
+    assert payload_tokens(messages) <= 60
+    assert context.build("other") == [{"role": "system", "content": "Be brief."}]
+
+
+def test_context_folds_old_turns_into_cached_summary():
+    client = RecordingClient()
+    context = ContextManager(max_tokens=100, summarizer=client)
+
+    async def conversation():
+        for i in range(12):
+            await context.chat(client, "c1", f"turn {i} " + "y" * 60)
+
+    asyncio.run(conversation())
+
+    # Summaries are produced in folds, not on every turn
+    assert 0 < len(client.prompts) < 12
+    last = client.calls[-1]
+    assert last[0]["content"].startswith("Summary of earlier conversation")
+    assert last[-1]["content"].startswith("turn 11")
+    assert all(payload_tokens(call) <= 100 for call in client.calls)
+
+
+def test_oversized_turn_is_truncated_to_budget():
+    context = ContextManager(max_tokens=20)
+    context.add("c1", "user", "z" * 500)
+    (message,) = context.build("c1")
+    assert payload_tokens([message]) <= 20
+
+
+def test_truncation_uses_estimator_and_drops_turns_without_room():
+    # One token per character: the 4-chars-per-token guess would overshoot 4x
+    context = ContextManager(max_tokens=20, estimator=len)
+    context.add("c1", "user", "z" * 500)
+    (message,) = context.build("c1")
+    assert len(message["content"]) + MESSAGE_OVERHEAD <= 20
+
+    # No room beyond the system prompt: the turn is dropped, not sent whole
+    tight = ContextManager(max_tokens=10, system_prompt="Be brief.", estimator=len)
+    tight.add("c1", "user", "hello there")
+    assert tight.build("c1") == [{"role": "system", "content": "Be brief."}]
+
+
+def test_summary_is_capped_below_budget():
+    class VerboseSummarizer(RecordingClient):
+        async def generate(self, prompt, **kwargs):
+            return LLMResponse(content="w" * 4000, provider="mock", model="m")
+
+    client = VerboseSummarizer()
+    context = ContextManager(max_tokens=100, summarizer=client)
+
+    async def conversation():
+        for i in range(8):
+            await context.chat(client, "c1", f"turn {i} " + "y" * 60)
+
+    asyncio.run(conversation())
+    assert client.calls[-1][0]["content"].startswith("Summary of earlier conversation")
+    assert all(payload_tokens(call) <= 100 for call in client.calls)
+    assert client.calls[-1][-1]["content"].startswith("turn 7")
+
+
+def test_failed_summary_keeps_the_turns_it_would_have_folded():
+    class FlakySummarizer(RecordingClient):
+        fail = True
+
+        async def generate(self, prompt, **kwargs):
+            if self.fail:
+                raise RuntimeError("summarizer unavailable")
+            return await super().generate(prompt, **kwargs)
+
+    client = FlakySummarizer()
+    context = ContextManager(max_tokens=100, summarizer=client)
+    for i in range(6):
+        context.add("c1", "user", f"turn {i} " + "y" * 60)
+
+    try:
+        asyncio.run(context.prepare("c1"))
+    except RuntimeError:
+        pass
+    assert [m["content"][:6] for m in context.history("c1")] == [f"turn {i}" for i in range(6)]
+
+    client.fail = False
+    messages = asyncio.run(context.prepare("c1"))
+    assert "turn 0" in client.prompts[0]
+    assert messages[0]["content"].startswith("Summary of earlier conversation")
+    assert messages[-1]["content"].startswith("turn 5")
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_memory_agent_storage():
     from MultiProdigy.agents.memory_agent import MemoryAgent
     from MultiProdigy.schemas.message import Message
@@ -12,4 +15,173 @@ def test_memory_agent_storage():
     msg = Message(sender="user", receiver="MemoryAgent", content="Remember this")
 
     agent.handle_message(msg)
-    assert "Remember this" in agent.memory
\ No newline at end of file
+    assert "Remember this" in agent.memory
+
+
+def test_memory_store_bm25_and_eviction():
+    from MultiProdigy.memory.store import MemoryStore
+
+    store = MemoryStore(capacity=3)
+    store.add("the cat sat on the mat")
+    store.add("dogs chase cats in the park")
+    store.add("quarterly revenue grew in the north region")
+
+    results = store.search("revenue north", k=2)
+    assert results[0][0].text.startswith("quarterly revenue")
+
+    # The oldest untouched memory is evicted, the one just recalled survives
+    store.add("a fourth memory about the weather")
+    assert len(store) == 3
+    assert "the cat sat on the mat" not in store
+    assert "quarterly revenue grew in the north region" in store
+    assert store.search("cat mat") == []
+
+    weighted = MemoryStore(capacity=2, policy="importance")
+    weighted.add("critical fact", importance=5.0)
+    weighted.add("small talk", importance=0.1)
+    weighted.add("another fact", importance=1.0)
+    assert "critical fact" in weighted and "small talk" not in weighted
+
+
+def test_memory_agent_recall(mocker):
+    from MultiProdigy.agents.memory_agent import MemoryAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.schemas.message import Message
+
+    bus = MessageBus()
+    agent = MemoryAgent("MemoryAgent", bus)
+    mock_publish = mocker.patch.object(bus, "publish")
+
+    for text in ("Paris is the capital of France", "Berlin is in Germany"):
+        agent.on_message(
+            Message(
+                sender="user",
+                receiver="MemoryAgent",
+                content=text,
+                metadata={"conversation_id": "c1"},
+            )
+        )
+    agent.on_message(
+        Message(
+            sender="user",
+            receiver="MemoryAgent",
+            content="capital of France",
+            metadata={"memory_action": "recall", "conversation_id": "c1"},
+        )
+    )
+
+    reply = mock_publish.call_args[0][0]
+    assert reply.receiver == "user"
+    assert reply.content.splitlines()[0] == "Paris is the capital of France"
+
+
+def test_sqlite_memory_store_persists_and_scopes(tmp_path):
+    from MultiProdigy.memory.sqlite_store import SQLiteMemoryStore
+
+    path = tmp_path / "memory.db"
+    store = SQLiteMemoryStore(path, agent="alpha")
+    store.add_many(["budget review on friday", "the cat sat on the mat"], conversation_id="c1")
+    store.add("budget for the offsite", conversation_id="c2")
+    store.add("budget notes from another agent", agent="beta")
+    store.close()
+
+    reopened = SQLiteMemoryStore(path, agent="alpha")
+    assert len(reopened) == 3
+    assert "the cat sat on the mat" in reopened
+    results = reopened.search("budget", k=5, conversation_id="c1")
+    assert [record.text for record, _ in results] == ["budget review on friday"]
+    assert len(reopened.search("budget")) == 2
+    assert reopened.search("budget", agent="beta")[0][0].agent == "beta"
+
+    with pytest.raises(RuntimeError):
+        with reopened.batch():
+            reopened.add("rolled back")
+            raise RuntimeError
+    assert "rolled back" not in reopened
+    reopened.close()
+
+
+def test_memory_agent_scopes_shared_sqlite_store(tmp_path, mocker):
+    from MultiProdigy.agents.memory_agent import MemoryAgent
+    from MultiProdigy.memory.sqlite_store import SQLiteMemoryStore
+    from MultiProdigy.schemas.message import Message
+
+    bus = mocker.Mock()
+    store = SQLiteMemoryStore(tmp_path / "memory.db")
+    notes = MemoryAgent("notes", bus, store=store)
+    todo = MemoryAgent("todo", bus, store=store)
+    notes.on_message(Message(sender="user", receiver="notes", content="ship on tuesday"))
+    todo.on_message(Message(sender="user", receiver="todo", content="tuesday standup"))
+    # The shared store is left unscoped; each agent scopes its own calls
+    assert store.agent is None
+    assert sorted(record.agent for record, _ in store.search("tuesday")) == ["notes", "todo"]
+    todo.on_message(
+        Message(
+            sender="user",
+            receiver="todo",
+            content="tuesday",
+            metadata={"memory_action": "recall"},
+        )
+    )
+    assert bus.publish.call_args[0][0].content == "tuesday standup"
+
+
+def test_memory_store_snapshot_keeps_id_counter():
+    from MultiProdigy.memory.store import MemoryStore
+
+    store = MemoryStore(capacity=5)
+    for text in ("one", "two", "three"):
+        store.add(text)
+    store.remove(2)
+
+    restored = MemoryStore(capacity=5)
+    restored.restore(store.snapshot())
+    # The newest id was removed before the checkpoint; it must not be handed out again
+    assert restored.add("four").id == 3
+
+
+def test_memory_store_pruned_search_matches_exhaustive_bm25():
+    import math
+    import random
+
+    from MultiProdigy.memory.store import MemoryStore, tokenize
+
+    rng = random.Random(3)
+    words = [f"w{i}" for i in range(40)]
+    store = MemoryStore(capacity=400)
+    for i in range(500):  # past capacity, so evicted records must leave every index
+        store.add(
+            " ".join(rng.choices(words, weights=range(40, 0, -1), k=rng.randint(3, 12))),
+            agent=f"a{i % 3}",
+            conversation_id=f"c{i % 7}",
+        )
+
+    def exhaustive(query, conversation_id=None, agent=None):
+        n_docs = len(store.records)
+        avg_length = store.total_length / n_docs
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = store.postings.get(term, {})
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for record_id, tf in postings.items():
+                record = store.records[record_id]
+                if conversation_id not in (None, record.conversation_id):
+                    continue
+                if agent not in (None, record.agent):
+                    continue
+                norm = 1 - store.b + store.b * store.doc_lengths[record_id] / avg_length
+                score = idf * tf * (store.k1 + 1) / (tf + store.k1 * norm)
+                scores[record_id] = scores.get(record_id, 0.0) + score
+        return sorted(scores.values(), reverse=True)[:5]
+
+    scopes = (
+        {},
+        {"agent": "a1"},
+        {"conversation_id": "c2"},
+        {"conversation_id": "c2", "agent": "a2"},
+    )
+    for _ in range(50):
+        query = " ".join(rng.sample(words, 3))
+        for scope in scopes:
+            found = [score for _, score in store.search(query, k=5, **scope)]
+            assert found == pytest.approx(exhaustive(query, **scope))
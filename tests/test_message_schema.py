@@ -7,3 +7,60 @@ def test_message_copy_with_new_content():
     assert new_msg.content == "hi"
     assert new_msg.sender == msg.sender
     assert new_msg.metadata == msg.metadata
+
+
+def test_trusted_message_matches_validated():
+    from MultiProdigy.schemas.message import Message
+
+    validated = Message(sender="a", receiver="b", content="hello", metadata={"k": "v"})
+    trusted = Message.trusted(sender="a", receiver="b", content="hello", metadata={"k": "v"})
+
+    assert trusted == validated
+    assert trusted.model_dump() == validated.model_dump()
+    assert trusted.model_fields_set == validated.model_fields_set
+    assert Message.model_validate_json(trusted.model_dump_json()) == validated
+    assert Message.trusted(sender="a", receiver="b", content="x").metadata == {}
+    # Built without model_construct, the instance still behaves like a normal model
+    trusted.content = "edited"
+    assert trusted.content == "edited" and trusted.model_copy().content == "edited"
+    assert trusted.model_fields_set is not validated.model_fields_set
+
+
+def test_metadata_is_shared_and_copy_on_write():
+    import pytest
+
+    from MultiProdigy.schemas.message import Message
+    from MultiProdigy.schemas.metadata import Metadata
+
+    msg = Message(sender="a", receiver="b", content="hello", metadata={"trace_id": "t1"})
+    assert isinstance(msg.metadata, Metadata)
+
+    reply = msg.copy_with_new_content("hi")
+    assert reply.metadata is msg.metadata
+
+    tagged = reply.with_metadata(message_id="m1")
+    assert tagged.metadata == {"trace_id": "t1", "message_id": "m1"}
+    assert "message_id" not in msg.metadata
+    with pytest.raises(TypeError):
+        msg.metadata["trace_id"] = "t2"
+
+    # Long derivation chains stay correct across flattening
+    meta = Metadata()
+    for i in range(50):
+        meta = meta.set(f"k{i}", i).discard(f"k{i - 1}")
+    assert dict(meta) == {"k49": 49}
+
+    assert msg.model_dump()["metadata"] == {"trace_id": "t1"}
+    assert Message.model_validate_json(tagged.model_dump_json()) == tagged
+
+
+def test_invalid_metadata_is_a_validation_error_and_schema_renders():
+    import pytest
+    from pydantic import ValidationError
+
+    from MultiProdigy.schemas.message import Message
+
+    with pytest.raises(ValidationError, match="metadata must be a mapping"):
+        Message(sender="a", receiver="b", content="c", metadata="x")
+    schema = Message.model_json_schema()
+    assert schema["properties"]["metadata"]["type"] == "object"
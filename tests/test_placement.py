@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+
+
+def _fan_out_agent(name, bus):
+    # Module-level so the spawned child can unpickle it
+    from MultiProdigy.agents.agent_base import BaseAgent
+
+    class FanOut(BaseAgent):
+        """Sends itself two pipe-filling messages per message until depth runs out."""
+
+        def on_message(self, message):
+            depth = message.metadata["depth"]
+            if not depth:
+                self.send("leaf", "collector")
+                return
+            for _ in range(2):
+                # Incompressible, so each frame is larger than the pipe's buffer
+                noise = os.urandom(500_000).hex()
+                self.send(noise, self.name, metadata={"depth": depth - 1})
+
+    return FanOut(name, bus)
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_thread_and_asyncio_hosts_run_off_the_publisher_thread(mock_tracer):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.placement import AsyncioHost, ThreadHost, host_agent
+    from MultiProdigy.schemas.agent_config import AgentConfig
+    from MultiProdigy.schemas.message import Message
+
+    class Recorder(BaseAgent):
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.threads = []
+
+        def on_message(self, message):
+            self.threads.append(threading.current_thread().name)
+
+    bus = MessageBus()
+    for placement, host_type in (("thread", ThreadHost), ("asyncio", AsyncioHost)):
+        config = AgentConfig(name=placement, placement=placement, max_tasks=2)
+        host = host_agent(config, bus, factory=Recorder)
+        assert isinstance(host, host_type) and host.name == placement
+        bus.register(host)
+        futures = [
+            host.handle_message(Message(sender="user", receiver=placement, content=str(i)))
+            for i in range(4)
+        ]
+        for future in futures:
+            future.result(timeout=2)
+        assert len(host.threads) == 4
+        assert threading.current_thread().name not in host.threads
+        host.close()
+
+    inline = host_agent(AgentConfig(name="inline"), bus, factory=Recorder)
+    assert isinstance(inline, Recorder)
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_process_host_republishes_replies_on_the_bus(mock_tracer):
+    import pytest
+
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.agents.echo_agent import EchoAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.placement import ProcessHost, host_agent
+    from MultiProdigy.schemas.agent_config import AgentConfig
+    from MultiProdigy.schemas.message import Message
+
+    class Collector(BaseAgent):
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.received = []
+            self.done = threading.Event()
+
+        def on_message(self, message):
+            self.received.append(message)
+            if len(self.received) == 3:
+                self.done.set()
+
+    bus = MessageBus()
+    collector = Collector("collector", bus)
+    bus.register(collector)
+    with pytest.raises(ValueError):
+        host_agent(AgentConfig(name="echo", placement="process"), bus)
+
+    host = host_agent(AgentConfig(name="echo", placement="process"), bus, factory=EchoAgent)
+    assert isinstance(host, ProcessHost)
+    bus.register(host)
+    try:
+        futures = [
+            host.handle_message(
+                Message(sender="collector", receiver="echo", content=f"hi {i}", metadata={"n": i})
+            )
+            for i in range(3)
+        ]
+        for future in futures:
+            future.result(timeout=30)
+        assert collector.done.wait(5)
+        assert [m.content for m in collector.received] == [f"Echo: hi {i}" for i in range(3)]
+        assert [m.metadata["n"] for m in collector.received] == [0, 1, 2]
+        assert {m.sender for m in collector.received} == {"echo"}
+    finally:
+        host.close()
+    assert not host.process.is_alive()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_process_host_keeps_reading_after_a_receiver_raises(mock_tracer):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.agents.echo_agent import EchoAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.placement import ProcessHost
+    from MultiProdigy.schemas.message import Message
+
+    class Picky(BaseAgent):
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.received = []
+
+        def on_message(self, message):
+            if message.content == "Echo: bad":
+                raise ValueError("refused")
+            self.received.append(message.content)
+
+    bus = MessageBus()
+    picky = Picky("picky", bus)
+    bus.register(picky)
+    host = ProcessHost("echo", EchoAgent, bus)
+    bus.register(host)
+    try:
+        for content in ("bad", "good"):
+            future = host.handle_message(Message(sender="picky", receiver="echo", content=content))
+            future.result(timeout=30)
+        assert picky.received == ["Echo: good"]
+    finally:
+        host.close()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_process_host_survives_messages_to_itself(mock_tracer):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.placement import ProcessHost
+    from MultiProdigy.schemas.message import Message
+
+    class Collector(BaseAgent):
+        def __init__(self, name, bus):
+            super().__init__(name, bus)
+            self.leaves = 0
+
+        def on_message(self, message):
+            self.leaves += 1
+
+    bus = MessageBus()
+    collector = Collector("collector", bus)
+    bus.register(collector)
+    host = ProcessHost("fanout", _fan_out_agent, bus)
+    bus.register(host)
+    try:
+        # The child's publishes come back to its own pipe while it is still writing
+        bus.publish(
+            Message(sender="collector", receiver="fanout", content="go", metadata={"depth": 3})
+        )
+        ends = time.monotonic() + 30
+        while collector.leaves < 8 and time.monotonic() < ends:
+            time.sleep(0.01)
+        assert collector.leaves == 8
+    finally:
+        host.close()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_thread_host_close_respects_timeout(mock_tracer):
+    from MultiProdigy.agents.agent_base import BaseAgent
+    from MultiProdigy.bus.message_bus import MessageBus
+    from MultiProdigy.runtime.placement import ThreadHost
+    from MultiProdigy.schemas.message import Message
+
+    release = threading.Event()
+
+    class Blocking(BaseAgent):
+        def on_message(self, message):
+            release.wait(5)
+
+    host = ThreadHost(Blocking("blocking", MessageBus()), max_workers=1)
+    future = host.handle_message(Message(sender="user", receiver="blocking", content="hi"))
+    started = time.monotonic()
+    host.close(timeout=0.1)
+    assert time.monotonic() - started < 1 and not future.done()
+    release.set()
+    future.result(timeout=1)
@@ -0,0 +1,82 @@
+import sys
+
+
+def _install_fake_plugin_package(root, module):
+    """Lay out an importable module plus dist-info metadata declaring entry points."""
+    (root / f"{module}.py").write_text(
+        "from MultiProdigy.agents.echo_agent import EchoAgent\n"
+        "from MultiProdigy.llm.local_client import MockClient\n"
+        "\n"
+        "class ShoutAgent(EchoAgent):\n"
+        "    pass\n"
+        "\n"
+        "class ShoutClient(MockClient):\n"
+        "    pass\n"
+    )
+    dist_info = root / f"{module}-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {module}\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[multiprodigy.agents]\n"
+        f"shout = {module}:ShoutAgent\n"
+        "\n"
+        "[multiprodigy.llm_providers]\n"
+        f"shout = {module}:ShoutClient\n"
+    )
+
+
+def test_entry_point_plugins_are_imported_on_first_use(tmp_path, monkeypatch):
+    from MultiProdigy.plugins.registry import PluginRegistry
+
+    module = "mp_fake_plugin_pkg"
+    _install_fake_plugin_package(tmp_path, module)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    registry = PluginRegistry()
+    assert "shout" in registry.names("agents") and "echo" in registry.names("agents")
+    assert "shout" in registry.names("llm_providers")
+    assert module not in sys.modules  # discovered, not imported
+
+    plugin = registry.plugin("agents", "shout")
+    assert not plugin.loaded
+    agent_cls = registry.get("agents", "shout")
+    assert agent_cls.__name__ == "ShoutAgent" and plugin.loaded
+    assert module in sys.modules
+    assert ("agents", "missing") not in registry
+    sys.modules.pop(module, None)
+
+
+def test_registered_plugins_feed_runtime_and_llm_factory(monkeypatch):
+    import pytest
+
+    from MultiProdigy.llm.factory import LLMFactory
+    from MultiProdigy.llm.local_client import MockClient
+    from MultiProdigy.plugins.registry import PluginRegistry
+    from MultiProdigy.runtime import runtime as runtime_module
+    from MultiProdigy.runtime.runtime import Runtime
+
+    registry = PluginRegistry()
+    registry.register("agents", "greeter", "MultiProdigy.agents.user_agent:UserAgent")
+    registry.register("llm_providers", "canned", MockClient)
+    monkeypatch.setattr(runtime_module, "plugins", registry)
+    monkeypatch.setattr("MultiProdigy.llm.factory.plugins", registry)
+    monkeypatch.setattr("MultiProdigy.plugins.registry.plugins", registry)
+
+    with Runtime({"agents": [{"name": "hello", "type": "greeter"}]}) as runtime:
+        assert type(runtime.agents["hello"]).__name__ == "UserAgent"
+    client = LLMFactory.create_client("canned", "canned-model")
+    assert isinstance(client, MockClient) and client.provider == "canned"
+    with pytest.raises(ValueError, match="Unsupported provider"):
+        LLMFactory.create_client("nobody", "model")
+
+
+def test_llm_config_rejects_unknown_providers_and_old_registry_imports():
+    import pytest
+
+    from MultiProdigy.llm.base import LLMConfig
+    from MultiProdigy.runtime.registry import AgentRegistry
+
+    assert LLMConfig(provider="mock", model="m").provider == "mock"
+    with pytest.raises(ValueError, match="Unsupported provider: opneai"):
+        LLMConfig(provider="opneai", model="m")
+    assert AgentRegistry.get("missing") is None
@@ -0,0 +1,265 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from MultiProdigy.agents.agent_base import BaseAgent
+
+
+class SlowStartAgent(BaseAgent):
+    """Agent whose warm-up stands in for a model load."""
+
+    def __init__(self, name, bus, delay=0.3):
+        super().__init__(name, bus)
+        self.delay = delay
+        self.warm = False
+
+    async def warm_up(self):
+        await asyncio.sleep(self.delay)
+        self.warm = True
+
+    def on_message(self, message):
+        self.reply(message, f"{self.name} ok")
+
+
+class RestoreProbeAgent(BaseAgent):
+    """Records which agents were registered when it was restored and started."""
+
+    def on_message(self, message):
+        pass
+
+    def restore(self, state):
+        self.registered_at_restore = sorted(self.bus.agents)
+
+    def start(self):
+        self.started = True
+
+
+CLOSED = []
+
+
+class SlowClosingAgent(SlowStartAgent):
+    def close(self):
+        CLOSED.append(self.name)
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_runtime_starts_agents_concurrently(mock_tracer):
+    from MultiProdigy.runtime.runtime import Runtime
+
+    slow = f"{__name__}:SlowStartAgent"
+    spec = {"agents": [{"name": f"slow{i}", "type": slow} for i in range(4)]}
+    started = time.perf_counter()
+    with Runtime(spec) as runtime:
+        elapsed = time.perf_counter() - started
+        assert set(runtime.startup_timings) == {"slow0", "slow1", "slow2", "slow3"}
+        assert all(t >= 0.3 for t in runtime.startup_timings.values())
+        # Bounded by the slowest agent, not the 1.2s sum
+        assert elapsed < 0.9
+        assert all(agent.warm for agent in runtime.agents.values())
+        assert set(runtime.bus.agents) == set(runtime.agents)
+    assert runtime.bus.agents == {}
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_runtime_from_yaml_with_lazy_placed_and_checkpointed_agents(mock_tracer, tmp_path):
+    from MultiProdigy.runtime.lazy import LazyAgent
+    from MultiProdigy.runtime.placement import ThreadHost
+    from MultiProdigy.runtime.runtime import Runtime
+    from MultiProdigy.schemas.message import Message
+
+    spec_path = tmp_path / "runtime.yaml"
+    spec_path.write_text(
+        f"""
+checkpoint_dir: {tmp_path / "checkpoints"}
+agents:
+  - name: memory
+    type: memory
+    params: {{top_k: 2}}
+  - name: echo
+    type: echo
+    placement: thread
+    max_tasks: 2
+  - name: notes
+    type: memory
+    lazy: true
+  - name: manager
+    type: task_manager
+    params: {{workers: [echo]}}
+"""
+    )
+    runtime = Runtime.from_yaml(spec_path)
+    runtime.start()
+    assert isinstance(runtime.agents["echo"], ThreadHost)
+    assert isinstance(runtime.agents["notes"], LazyAgent)
+    assert runtime.agents["memory"].top_k == 2
+    assert set(runtime.startup_timings) == {"memory", "echo", "manager"}
+    assert list(runtime.agents["manager"].workers) == ["echo"]
+    runtime.bus.publish(Message(sender="user", receiver="memory", content="ship on friday"))
+    runtime.stop()
+
+    # A new runtime restores the checkpoint written on stop
+    with Runtime(spec_path) as restarted:
+        assert list(restarted.agents["memory"].memory) == ["ship on friday"]
+
+
+def test_runtime_reports_failed_agents():
+    import pytest
+
+    from MultiProdigy.runtime.runtime import Runtime
+    from MultiProdigy.schemas.runtime_spec import RuntimeSpec
+
+    with pytest.raises(ValueError):
+        RuntimeSpec.model_validate(
+            {"agents": [{"name": "a", "type": "echo"}, {"name": "a", "type": "echo"}]}
+        )
+    runtime = Runtime({"agents": [{"name": "ghost", "type": "no.such.module:Agent"}]})
+    with pytest.raises(RuntimeError, match="ghost"):
+        runtime.start()
+    assert runtime.bus.agents == {}
+
+
+class SlowAsyncAgent(BaseAgent):
+    """Async handler that records completions and cancellations."""
+
+    def __init__(self, name, bus, delay=0.1):
+        super().__init__(name, bus)
+        self.delay = delay
+        self.handled = []
+        self.cancelled = 0
+
+    async def on_message(self, message):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.handled.append(message.content)
+
+
+@patch("MultiProdigy.runtime.runtime.tracer")
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_runtime_stop_drains_queued_work_and_refuses_ingress(mock_tracer, runtime_tracer):
+    import pytest
+
+    from MultiProdigy.runtime.runtime import Runtime
+    from MultiProdigy.schemas.message import Message
+    from MultiProdigy.support.error import IngressClosedError
+
+    slow = f"{__name__}:SlowAsyncAgent"
+    runtime = Runtime({"agents": [{"name": "slow", "type": slow, "max_tasks": 1}]})
+    runtime.start()
+    agent = runtime.agents["slow"]
+    for i in range(3):
+        runtime.bus.publish(Message(sender="user", receiver="slow", content=f"job {i}"))
+    assert runtime.pending() == 3
+    ticks = []
+    runtime.scheduler.add_task(0.01, lambda: ticks.append(1))
+
+    runtime.bus.close_ingress()
+    with pytest.raises(IngressClosedError):
+        runtime.bus.publish(Message(sender="user", receiver="slow", content="late"))
+    # A sender name alone is not trusted; agents may still talk to each other
+    with pytest.raises(IngressClosedError):
+        runtime.bus.publish(Message(sender="slow", receiver="slow", content="spoofed"))
+    agent.send("internal", "slow")
+
+    report = runtime.stop(deadline=5)
+    assert report["drained"] and report["cancelled"] == 0
+    assert agent.handled == ["job 0", "job 1", "job 2", "internal"]
+    count = len(ticks)
+    time.sleep(0.05)
+    assert len(ticks) == count  # periodic jobs stopped
+    runtime_tracer.flush.assert_called_once()
+
+
+@patch("MultiProdigy.runtime.runtime.tracer")
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_runtime_stop_cancels_at_deadline_and_keeps_tasks(mock_tracer, runtime_tracer, tmp_path):
+    from unittest.mock import AsyncMock
+
+    from MultiProdigy.runtime.runtime import Runtime
+    from MultiProdigy.schemas.message import Message
+
+    slow = f"{__name__}:SlowAsyncAgent"
+    spec = {
+        "checkpoint_dir": str(tmp_path),
+        "agents": [
+            {"name": "slow", "type": slow, "max_tasks": 1, "params": {"delay": 10}},
+            {"name": "llm", "type": "llm"},
+            {"name": "manager", "type": "task_manager"},  # no workers: task stays queued
+        ],
+    }
+    runtime = Runtime(spec)
+    runtime.start()
+    close = runtime.agents["llm"].client.close = AsyncMock()
+    slow_agent = runtime.agents["slow"]
+    for i in range(2):
+        runtime.bus.publish(Message(sender="user", receiver="slow", content=f"job {i}"))
+    runtime.agents["manager"].submit("unfinished", requester="user")
+
+    started = time.monotonic()
+    report = runtime.stop(deadline=0.2)
+    assert time.monotonic() - started < 2
+    assert not report["drained"] and report["cancelled"] == 2  # one running, one queued
+    close.assert_awaited_once()
+    assert slow_agent.cancelled == 1 and slow_agent.handled == []
+
+    # Rolling restart: the queued task comes back from the final checkpoint
+    spec["agents"] = spec["agents"][2:]
+    restarted = Runtime(spec)
+    restarted.start()
+    tasks = restarted.agents["manager"].tasks
+    assert [task.content for task in tasks.values()] == ["unfinished"]
+    assert not restarted.stop(deadline=0.05)["drained"]
+
+
+def test_tracer_flush_closes_open_traces(tmp_path):
+    import json
+
+    from MultiProdigy.observability.tracer import AgentTracer
+
+    tracer = AgentTracer(tmp_path / "traces.jsonl")
+    tracer.start_trace("agent", "message_received")
+    done = tracer.start_trace("agent", "message_received")
+    tracer.end_trace(done, result={"status": "processed"})
+    assert tracer.flush("shutdown") == 1 and tracer.current_traces == {}
+    events = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    assert events[-1]["status"] == "error" and events[-1]["error"] == "shutdown"
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_runtime_restores_after_every_agent_is_registered(mock_tracer, tmp_path):
+    from MultiProdigy.runtime.runtime import Runtime
+    from MultiProdigy.storage.checkpoint import CheckpointStore
+
+    CheckpointStore(tmp_path).save("probe", {"entry": 1})
+    spec = {
+        "checkpoint_dir": str(tmp_path),
+        "agents": [
+            {"name": "probe", "type": f"{__name__}:RestoreProbeAgent"},
+            {"name": "echo", "type": "echo"},
+        ],
+    }
+    with Runtime(spec) as runtime:
+        probe = runtime.agents["probe"]
+        assert probe.registered_at_restore == ["echo", "probe"] and probe.started
+
+
+def test_runtime_closes_builds_that_time_out():
+    import pytest
+
+    from MultiProdigy.runtime.runtime import Runtime
+
+    spec = {
+        "startup_timeout": 0.05,
+        "agents": [
+            {"name": "late", "type": f"{__name__}:SlowClosingAgent", "params": {"delay": 0.2}}
+        ],
+    }
+    runtime = Runtime(spec)
+    with pytest.raises(RuntimeError, match="late: startup timed out"):
+        runtime.start()
+    ends = time.monotonic() + 2
+    while "late" not in CLOSED and time.monotonic() < ends:
+        time.sleep(0.01)
+    assert "late" in CLOSED and runtime.bus.agents == {}
@@ -0,0 +1,105 @@
+import threading
+import time
+
+
+def test_scheduler_fixed_rate_does_not_drift():
+    from MultiProdigy.runtime.scheduler import AgentScheduler
+
+    scheduler = AgentScheduler(max_workers=2)
+    times, done = [], threading.Event()
+
+    def tick():
+        times.append(time.monotonic())
+        time.sleep(0.02)  # work time must not push later runs back
+        if len(times) == 8:
+            done.set()
+
+    task = scheduler.add_task(0.05, tick)
+    assert done.wait(3)
+    scheduler.stop()
+    start = times[0]
+    assert all(abs(t - (start + i * 0.05)) < 0.03 for i, t in enumerate(times))
+    assert task.runs >= 8 and task.missed == 0 and task.cancelled
+
+
+def test_scheduler_uses_one_timer_thread_and_cancels():
+    from MultiProdigy.runtime.scheduler import AgentScheduler
+
+    before = threading.active_count()
+    scheduler = AgentScheduler(max_workers=2)
+    counts = [0] * 200
+    lock = threading.Lock()
+
+    def bump(i):
+        with lock:
+            counts[i] += 1
+
+    tasks = [scheduler.add_task(0.05, bump, args=(i,), jitter=0.01) for i in range(200)]
+    time.sleep(0.12)
+    assert threading.active_count() <= before + 3  # timer thread + 2 workers
+    for task in tasks[100:]:
+        task.cancel()
+    time.sleep(0.02)  # let runs already dispatched finish
+    with lock:
+        frozen = counts[100:]
+    time.sleep(0.15)
+    scheduler.stop()
+    assert all(c >= 2 for c in counts[:100])
+    assert counts[100:] == frozen
+    assert len(scheduler.tasks) == 0
+
+
+def test_scheduler_missed_run_policies():
+    import pytest
+
+    from MultiProdigy.runtime.scheduler import AgentScheduler
+
+    with pytest.raises(ValueError):
+        AgentScheduler().add_task(1, print, missed="never")
+
+    results = {}
+    for policy in ("skip", "coalesce", "catch_up"):
+        scheduler = AgentScheduler(max_workers=1)
+        times = []
+
+        def slow_first(times=times):
+            times.append(time.monotonic())
+            if len(times) == 1:
+                time.sleep(0.27)  # blocks through five slots
+
+        task = scheduler.add_task(0.05, slow_first, missed=policy)
+        time.sleep(0.45)
+        scheduler.stop()
+        results[policy] = (times, task.missed)
+
+    times, missed = results["skip"]
+    assert missed == 5
+    assert times[1] - times[0] == pytest.approx(0.30, abs=0.03)  # next slot after the block
+    times, missed = results["coalesce"]
+    assert missed == 4
+    assert times[1] - times[0] == pytest.approx(0.27, abs=0.03)  # one late run at once
+    assert times[2] - times[0] == pytest.approx(0.30, abs=0.03)  # then back on the grid
+    times, missed = results["catch_up"]
+    assert missed == 0
+    # Slots 1-5 run back to back, then slots keep their original spacing
+    assert times[5] - times[1] < 0.05
+    assert times[6] - times[0] == pytest.approx(0.30, abs=0.03)
+
+
+def test_scheduler_runs_coroutines_on_the_event_loop():
+    import asyncio
+
+    from MultiProdigy.runtime.scheduler import AgentScheduler
+
+    scheduler = AgentScheduler()
+    done = threading.Event()
+
+    async def beat():
+        await asyncio.sleep(0)
+        done.set()
+
+    task = scheduler.add_task(10, beat)
+    assert done.wait(2)
+    time.sleep(0.05)
+    scheduler.stop()
+    assert task.runs == 1 and task.errors == 0
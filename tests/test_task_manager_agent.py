@@ -1,3 +1,6 @@
+from unittest.mock import patch
+
+
 def test_task_manager_agent_instantiation():
     from MultiProdigy.agents.task_manager_agent import TaskManagerAgent
     from MultiProdigy.schemas.agent_config import AgentConfig
@@ -15,3 +18,251 @@ def test_task_manager_agent_instantiation():
 
     agent = DummyTM()
     assert agent.name == "Manager"
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_least_loaded_respects_max_tasks(mock_tracer, task_pool):
+    bus, manager, (w1, w2), client = task_pool()
+    for i in range(6):
+        client.send(f"job {i}", "manager")
+
+    assert len(w1.held) == 2 and len(w2.held) == 2
+    assert manager.stats()["queued"] == 2
+
+    w1.finish()
+    assert len(w1.held) == 2  # freed slot was refilled from the queue
+    assert client.results[0].content == "done: job 0"
+    assert client.results[0].metadata["task_id"].startswith("manager-")
+
+    while w1.held or w2.held:
+        (w1 if w1.held else w2).finish()
+    stats = manager.stats()
+    assert stats["completed"] == 6 and stats["queued"] == 0 and stats["in_flight"] == 0
+    assert stats["latency_p95"] >= stats["latency_p50"] > 0
+    assert sorted(m.content for m in client.results) == [f"done: job {i}" for i in range(6)]
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_max_tasks_caps_workers_not_its_own_inbox(mock_tracer, task_pool):
+    bus, manager, (w1, w2), client = task_pool(max_tasks=1)
+    assert "manager" not in bus.utilisation()
+
+    for i in range(4):
+        client.send(f"job {i}", "manager")
+    assert len(w1.held) == 1 and len(w2.held) == 1
+    # Both replies reach the manager at once instead of queueing behind each other
+    w1.finish()
+    w2.finish()
+    assert [m.content for m in client.results] == ["done: job 0", "done: job 1"]
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_retries_failed_tasks(mock_tracer, task_pool):
+    bus, manager, (w1, w2), client = task_pool(max_tasks=1)
+    manager.max_retries = 1
+    client.send("flaky", "manager")
+    (holder,) = [w for w in (w1, w2) if w.held]
+
+    holder.finish(status="failed")
+    (holder,) = [w for w in (w1, w2) if w.held]
+    holder.finish(status="failed")
+
+    assert client.results[-1].metadata["task_status"] == "failed"
+    stats = manager.stats()
+    assert stats["retried"] == 1 and stats["failed"] == 1 and stats["completed"] == 0
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_work_stealing_with_synchronous_workers(mock_tracer, task_pool):
+    from MultiProdigy.agents.agent_base import BaseAgent
+
+    class Doubler(BaseAgent):
+        def on_message(self, message):
+            self.reply(message, message.content * 2)
+
+    bus, manager, workers, client = task_pool(strategy="work_stealing", worker_cls=Doubler)
+    manager.remove_worker("w2")
+    for i in range(200):
+        client.send(str(i), "manager")
+
+    assert len(client.results) == 200
+    assert manager.stats()["workers"]["w1"]["completed"] == 200
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_idle_worker_steals_backlog(mock_tracer, task_pool):
+    bus, manager, (w1, w2), client = task_pool(strategy="work_stealing", max_tasks=1)
+    for i in range(6):
+        client.send(f"job {i}", "manager")
+    assert manager.stats()["workers"]["w2"]["queued"] == 2
+
+    for _ in range(4):
+        w1.finish()
+    # w1 drained its own backlog, then took work pinned to the busy w2
+    assert manager.stats()["workers"]["w1"]["completed"] == 4
+    assert manager.stats()["workers"]["w2"]["queued"] == 0
+
+
+def test_task_graph_rejects_cycles_and_unknown_nodes():
+    import pytest
+    from pydantic import ValidationError
+
+    from MultiProdigy.schemas.task_graph import TaskGraph
+
+    with pytest.raises(ValidationError, match="cycle"):
+        TaskGraph(
+            nodes=[
+                {"id": "a", "content": "", "depends_on": ["b"]},
+                {"id": "b", "content": "", "depends_on": ["a"]},
+            ]
+        )
+    with pytest.raises(ValidationError, match="unknown"):
+        TaskGraph.model_validate({"nodes": [{"id": "a", "content": "", "depends_on": ["x"]}]})
+    # "$fetch-data" would substitute $fetch and leave "-data" behind
+    with pytest.raises(ValidationError, match="identifier"):
+        TaskGraph(nodes=[{"id": "fetch-data", "content": ""}])
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_runs_dag_with_parallel_branches(mock_tracer, task_pool):
+    from MultiProdigy.schemas.task_graph import TaskGraph
+
+    bus, manager, (w1, w2), client = task_pool()
+    graph = TaskGraph.model_validate(
+        {
+            "nodes": [
+                {"id": "research", "content": "research topic"},
+                {"id": "market", "content": "size market"},
+                {"id": "analysis", "content": "analyse $research", "depends_on": ["research"]},
+                {
+                    "id": "report",
+                    "content": "report on $analysis and $market",
+                    "depends_on": ["analysis", "market"],
+                },
+            ]
+        }
+    )
+    client.send("run workflow", "manager", metadata={"task_graph": graph.model_dump()})
+
+    # Both independent roots are dispatched at once
+    assert sorted(m.content for m in w1.held + w2.held) == ["research topic", "size market"]
+    (w1 if w1.held[0].content == "research topic" else w2).finish()
+    (analysis,) = [m for m in w1.held + w2.held if m.metadata["node"] == "analysis"]
+    assert analysis.content == "analyse done: research topic"
+
+    while w1.held or w2.held:
+        (w1 if w1.held else w2).finish()
+
+    (result,) = client.results
+    assert result.metadata["graph_status"] == "completed"
+    expected = "done: report on done: analyse done: research topic and done: size market"
+    assert result.content == expected
+    assert list(result.metadata["critical_path"])[-1] == "report"
+    assert not manager.graphs
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_graph_run_timings_and_targeted_nodes(mock_tracer, task_pool):
+    from MultiProdigy.agents.echo_agent import EchoAgent
+    from MultiProdigy.schemas.task_graph import TaskGraph
+
+    bus, manager, (w1, w2), client = task_pool()
+    bus.register(EchoAgent("echo", bus))
+    graph = TaskGraph(
+        nodes=[
+            {"id": "a", "content": "ping", "agent": "echo"},
+            {"id": "b", "content": "$a!", "agent": "echo", "depends_on": ["a"]},
+        ]
+    )
+    run = manager.submit_graph(graph)
+    assert run.wait(1) and run.status == "completed"
+    assert run.results["b"] == "Echo: Echo: ping!"
+    path, length = run.critical_path()
+    assert path == ["a", "b"] and length >= 0
+    timings = run.timings()
+    assert timings["b"]["ready"] >= timings["a"]["finished"] >= timings["a"]["started"]
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_accepts_replies_from_replica_groups(mock_tracer, task_pool):
+    from MultiProdigy.agents.agent_base import BaseAgent
+
+    class Replica(BaseAgent):
+        def on_message(self, message):
+            self.reply(message, f"{self.name}: {message.content}")
+
+    bus, manager, workers, client = task_pool()
+    manager.remove_worker("w1")
+    manager.remove_worker("w2")
+    for name in ("llm-1", "llm-2"):
+        bus.register_replica(Replica(name, bus), "llm", strategy="round_robin")
+    manager.add_worker("llm")
+    for i in range(4):
+        client.send(f"job {i}", "manager")
+
+    # Replies come from the replicas, not from the worker name the task was sent to
+    assert len(client.results) == 4
+    assert {m.content.split(":")[0] for m in client.results} == {"llm-1", "llm-2"}
+    assert manager.stats()["workers"]["llm"]["completed"] == 4
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_delays_retries_on_one_timer(mock_tracer, task_pool):
+    import time
+
+    bus, manager, (w1, w2), client = task_pool(max_tasks=1, retry_delay=0.05)
+    for i in range(2):
+        client.send(f"flaky {i}", "manager")
+    w1.finish(status="failed")
+    w2.finish(status="failed")
+    assert not w1.held and not w2.held
+    assert len(manager.scheduler.tasks) == 2  # both retries wait on the manager's one timer
+
+    deadline = time.monotonic() + 2
+    while len(w1.held) + len(w2.held) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(w1.held) + len(w2.held) == 2
+    assert manager.scheduler.tasks == []
+    manager.close()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_times_out_silent_workers(mock_tracer, task_pool):
+    import time
+
+    bus, manager, (w1, w2), client = task_pool(max_tasks=1, task_timeout=0.05)
+    manager.max_retries = 1
+    client.send("job", "manager")
+    client.send("answered", "manager")
+    w2.finish()  # answered in time: its timer is cancelled, not fired
+    assert client.results[0].content == "done: answered"
+
+    # w1 never answers: the task is retried once, then failed
+    deadline = time.monotonic() + 2
+    while not client.results[1:] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.results[1].content == "Task failed: job"
+    assert client.results[1].metadata["task_status"] == "failed"
+    stats = manager.stats()
+    assert stats["failed"] == 1 and stats["retried"] == 1 and stats["in_flight"] == 0
+    assert len(w1.held) + len(w2.held) == 2
+    assert manager.scheduler.tasks == []
+
+    # A late answer for the failed task is ignored
+    (w1 if w1.held else w2).finish()
+    assert len(client.results) == 2
+    manager.close()
+
+
+@patch("MultiProdigy.agents.agent_base.tracer")
+def test_task_manager_fails_tasks_for_unknown_workers(mock_tracer, task_pool):
+    bus, manager, _, client = task_pool()
+    manager.max_retries = 1
+    manager.add_worker("ghost")  # never registered on the bus
+    manager.remove_worker("w1")
+    manager.remove_worker("w2")
+    client.send("job", "manager")
+
+    stats = manager.stats()
+    assert stats["failed"] == 1 and stats["in_flight"] == 0
+    assert client.results[0].metadata["task_status"] == "failed"
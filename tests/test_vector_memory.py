@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def test_vector_memory_top_k_and_growth():
+    from MultiProdigy.memory.vector import VectorMemory
+
+    memory = VectorMemory(dim=3, initial_capacity=2)
+    memory.add([[1, 0, 0], [0, 1, 0]], texts=["x", "y"])
+    memory.add([[0, 0, 1], [1, 1, 0]], texts=["z", "xy"])
+    assert len(memory) == 4
+
+    (hits,) = memory.search([[1, 0.1, 0]], k=2)
+    assert [memory.texts[i] for i, _ in hits] == ["x", "xy"]
+    assert hits[0][1] >= hits[1][1]
+    assert memory.search([[1, 0, 0], [0, 0, 1]], k=1)[1][0][0] == 2
+
+
+def test_vector_memory_save_load_mmap(tmp_path):
+    from MultiProdigy.memory.vector import VectorMemory
+
+    memory = VectorMemory(dim=2)
+    memory.add([[1, 0], [0, 1]], texts=["east", "north"], metadata=[{"a": 1}, {}])
+    memory.save(tmp_path / "vectors")
+
+    loaded = VectorMemory.load(tmp_path / "vectors")
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.metadata[0] == {"a": 1}
+    assert loaded.search([[0, 2]], k=1)[0][0][0] == 1
+
+    loaded.add([[-1, 0]], texts=["west"])
+    assert loaded.texts[loaded.search([[-1, 0.1]], k=1)[0][0][0]] == "west"
+
+
+def test_semantic_memory_uses_embedder():
+    from MultiProdigy.memory.vector import SemanticMemory
+
+    class FakeEmbedder:
+        async def embed(self, texts):
+            return [[text.count("a"), text.count("b")] for text in texts]
+
+    semantic = SemanticMemory(FakeEmbedder(), dim=2)
+
+    async def scenario():
+        await semantic.add(["aaa", "bbb"])
+        return await semantic.search("aab", k=1)
+
+    assert asyncio.run(scenario())[0][0] == "aaa"